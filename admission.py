@@ -0,0 +1,254 @@
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed instead of being queued.
+
+    Attributes:
+        retry_after (int): Seconds the client should wait before retrying
+        reason (str): Why the request was shed ('queue_full', 'client_limit',
+            'wait_budget' or 'timeout')
+    """
+
+    def __init__(self, message, retry_after, reason):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ('client_key', 'event', 'queued_at')
+
+    def __init__(self, client_key):
+        self.client_key = client_key
+        self.event = threading.Event()
+        self.queued_at = time.monotonic()
+
+
+class Ticket:
+    """An admitted request's slot, released when the work is done.
+
+    Usable as a context manager. release() may be called more than once,
+    and from a different thread than the one that was admitted.
+    """
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._controller._release(time.monotonic() - self._started)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class AdmissionController:
+    """Bounded, fair admission queue in front of the translation endpoints.
+
+    At most max_concurrent requests run at once. Others wait in a queue of
+    at most max_queue requests, and free slots are handed out round-robin
+    across clients so one busy seller cannot starve the rest. A request is
+    shed straight away when the queue is full, when its client already has
+    max_queued_per_client requests waiting, or when its estimated wait
+    (its round-robin position times the moving average service time)
+    exceeds max_wait_seconds. A queued request that is still waiting after
+    max_wait_seconds is shed as well.
+    """
+
+    def __init__(self, max_concurrent=8, max_queue=16, max_wait_seconds=30,
+                 max_queued_per_client=4, initial_service_seconds=30,
+                 smoothing=0.2, max_retry_after=120):
+        """Initialize the controller.
+
+        Args:
+            max_concurrent (int): Requests processed at once
+            max_queue (int): Requests allowed to wait for a slot
+            max_wait_seconds (float): Longest acceptable wait for a slot
+            max_queued_per_client (int): Waiting requests allowed per client
+            initial_service_seconds (float): Service time assumed before any
+                request has finished
+            smoothing (float): Weight of each new sample in the moving
+                average service time
+            max_retry_after (int): Upper bound for Retry-After, in seconds
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.max_queued_per_client = max_queued_per_client
+        self.smoothing = smoothing
+        self.max_retry_after = max_retry_after
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queues = OrderedDict()
+        self._queued = 0
+        self._service_seconds = float(initial_service_seconds)
+
+        self._admitted = 0
+        self._queued_total = 0
+        self._shed = {'queue_full': 0, 'client_limit': 0, 'wait_budget': 0, 'timeout': 0}
+        self._queue_wait_seconds = 0.0
+
+    def check(self, client_key=None):
+        """Shed a request early, before its body is read.
+
+        Applies the same limits as admit() without queueing the request,
+        so an upload can be refused before it is received.
+
+        Raises:
+            OverloadedError: If the request would be shed
+        """
+        with self._lock:
+            self._reject_if_overloaded(client_key)
+
+    def admit(self, client_key):
+        """Wait for a processing slot.
+
+        Args:
+            client_key (str): Identifies the client for fairness
+
+        Returns:
+            Ticket: The slot, to be released when the request finishes
+
+        Raises:
+            OverloadedError: If the request is shed
+        """
+        with self._lock:
+            if self._active < self.max_concurrent and not self._queued:
+                self._active += 1
+                self._admitted += 1
+                return Ticket(self)
+
+            self._reject_if_overloaded(client_key)
+            waiter = _Waiter(client_key)
+            self._queues.setdefault(client_key, deque()).append(waiter)
+            self._queued += 1
+            self._queued_total += 1
+
+        if not waiter.event.wait(self.max_wait_seconds):
+            with self._lock:
+                # The slot may have been granted just as the wait timed out
+                if not waiter.event.is_set():
+                    self._remove(waiter)
+                    self._shed['timeout'] += 1
+                    raise OverloadedError(
+                        'Server is overloaded, timed out waiting for a processing slot',
+                        self._retry_after(self._queued),
+                        'timeout'
+                    )
+
+        with self._lock:
+            self._queue_wait_seconds += time.monotonic() - waiter.queued_at
+        return Ticket(self)
+
+    def stats(self):
+        """Return queue depth, shed counts and timing estimates."""
+        with self._lock:
+            admitted = self._admitted
+            return {
+                'active': self._active,
+                'max_concurrent': self.max_concurrent,
+                'queue_depth': self._queued,
+                'max_queue': self.max_queue,
+                'queued_clients': len(self._queues),
+                'admitted': admitted,
+                'queued': self._queued_total,
+                'shed': dict(self._shed),
+                'shed_total': sum(self._shed.values()),
+                'avg_service_seconds': round(self._service_seconds, 3),
+                'avg_queue_wait_seconds': round(self._queue_wait_seconds / admitted, 3) if admitted else 0,
+                'estimated_wait_seconds': round(self._estimate_wait(self._queued), 3)
+            }
+
+    def _reject_if_overloaded(self, client_key):
+        if self._active < self.max_concurrent and not self._queued:
+            return
+
+        if self._queued >= self.max_queue:
+            self._shed['queue_full'] += 1
+            raise OverloadedError(
+                'Server is overloaded, admission queue is full',
+                self._retry_after(self._queued),
+                'queue_full'
+            )
+
+        own = len(self._queues.get(client_key, ()))
+        if own >= self.max_queued_per_client:
+            self._shed['client_limit'] += 1
+            raise OverloadedError(
+                'Too many requests from this client are already waiting',
+                self._retry_after(self._queued),
+                'client_limit'
+            )
+
+        # Round-robin position: every other client gets up to own + 1 turns first
+        ahead = own + sum(
+            min(len(waiters), own + 1) for key, waiters in self._queues.items() if key != client_key
+        )
+        estimate = self._estimate_wait(ahead)
+        if estimate > self.max_wait_seconds:
+            self._shed['wait_budget'] += 1
+            raise OverloadedError(
+                f'Server is overloaded, estimated wait of {estimate:.1f}s exceeds '
+                f'{self.max_wait_seconds:g}s',
+                self._retry_after(ahead),
+                'wait_budget'
+            )
+
+    def _estimate_wait(self, ahead):
+        if self._active < self.max_concurrent and not ahead:
+            return 0.0
+        # Slots free up every service_seconds / max_concurrent on average
+        return (ahead + 1) * self._service_seconds / max(1, self.max_concurrent)
+
+    def _retry_after(self, ahead):
+        return max(1, min(self.max_retry_after, math.ceil(self._estimate_wait(ahead))))
+
+    def _release(self, service_seconds):
+        with self._lock:
+            self._service_seconds += self.smoothing * (service_seconds - self._service_seconds)
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._active -= 1
+                return
+            # Hand the slot straight to the next waiter
+            self._admitted += 1
+            waiter.event.set()
+
+    def _next_waiter(self):
+        if not self._queues:
+            return None
+        client_key, waiters = next(iter(self._queues.items()))
+        waiter = waiters.popleft()
+        self._queued -= 1
+        # Move the client to the back so others are served first
+        del self._queues[client_key]
+        if waiters:
+            self._queues[client_key] = waiters
+        return waiter
+
+    def _remove(self, waiter):
+        waiters = self._queues.get(waiter.client_key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not waiters:
+            del self._queues[waiter.client_key]
@@ -1,21 +1,405 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, g, request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
-from translation_service import TranslationService
+import json
+import queue
+import tempfile
+import threading
+import time
+from translation_service import TranslationService, AudioTooLargeError
+from job_queue import JobStore, JobQueue, QueueFullError
+from http_pool import HttpPool
+from transcript_cache import LRUCache
+from job_monitor import JobMonitor
+from audio_preprocess import AudioPreprocessor
+from audio_chunking import LongCallChunker
+from download_scheduler import DownloadScheduler
+from metrics import REGISTRY
+from sarvam_clients import SarvamClientPool
+from admission import AdmissionController, OverloadedError
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class AudioUploadRequest(Request):
+    """Request that spools each uploaded file to a named temporary file.
+
+    Werkzeug normally buffers uploads in memory or in an anonymous temporary
+    file, which then has to be copied to a named file for the SDK upload.
+    Writing the multipart data to a named file as it is parsed means the
+    audio touches the disk once and is uploaded from where it landed. The
+    file is deleted when the request is closed.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        suffix = os.path.splitext(filename or '')[1][:10] or '.mp3'
+        return tempfile.NamedTemporaryFile(suffix=suffix)
+
 
 app = Flask(__name__)
+app.request_class = AudioUploadRequest
 
 # Initialize translation service
 API_KEY = os.getenv('SARVAM_API_KEY', 'khemchandwillprovidethekey')
-translation_service = TranslationService(api_key=API_KEY)
+BATCH_WINDOW_SECONDS = float(os.getenv('BATCH_WINDOW_SECONDS', '0'))
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', '8'))
+MAX_AUDIO_BYTES = int(os.getenv('MAX_AUDIO_BYTES', str(200 * 1024 * 1024)))
+
+# Request bodies may carry the audio plus form fields and multipart framing
+MAX_REQUEST_BYTES = MAX_AUDIO_BYTES + 1024 * 1024 if MAX_AUDIO_BYTES else None
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '100'))
+BULK_FILES_PER_JOB = int(os.getenv('BULK_FILES_PER_JOB', '20'))
+BULK_DOWNLOAD_WORKERS = int(os.getenv('BULK_DOWNLOAD_WORKERS', '8'))
+
+# Shared keep-alive connection pool for outbound HTTP calls
+http_pool = HttpPool(
+    pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', '10')),
+    pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', '10')),
+    max_retries=int(os.getenv('HTTP_MAX_RETRIES', '3')),
+    backoff_factor=float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5')),
+    timeouts={
+        'audio_download': float(os.getenv('AUDIO_DOWNLOAD_TIMEOUT', '30')),
+        'output_download': 30
+    }
+)
+
+# Cache of raw STTT results keyed by audio hash
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv('TRANSCRIPT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+transcript_cache = None
+if TRANSCRIPT_CACHE_MAX_BYTES > 0:
+    transcript_cache = LRUCache(
+        max_bytes=TRANSCRIPT_CACHE_MAX_BYTES,
+        cache_dir=os.getenv('TRANSCRIPT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'transcript_cache')) or None,
+        max_disk_bytes=int(os.getenv('TRANSCRIPT_CACHE_MAX_DISK_BYTES', str(1024 * 1024 * 1024)))
+    )
+
+# Cache of formatted responses and HTTP validators keyed by audio URL
+URL_CACHE_MAX_BYTES = int(os.getenv('URL_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+url_cache = None
+if URL_CACHE_MAX_BYTES > 0:
+    url_cache = LRUCache(
+        max_bytes=URL_CACHE_MAX_BYTES,
+        cache_dir=os.getenv('URL_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'url_cache')) or None,
+        max_disk_bytes=int(os.getenv('URL_CACHE_MAX_DISK_BYTES', str(256 * 1024 * 1024)))
+    )
+
+# Audio downloads run on a bounded pool with per-host concurrency and rate limits
+download_scheduler = DownloadScheduler(
+    max_workers=int(os.getenv('DOWNLOAD_WORKERS', '8')),
+    per_host_limit=int(os.getenv('DOWNLOAD_PER_HOST_LIMIT', '8')),
+    per_host_rate=float(os.getenv('DOWNLOAD_PER_HOST_RATE', '0')),
+    size_of=TranslationService.downloaded_bytes
+)
+
+# SarvamAI clients, one per thread, warmed in the background once the worker starts
+client_pool = SarvamClientPool(API_KEY, size=int(os.getenv('SARVAM_CLIENT_POOL_SIZE', '4')))
+
+# Fail STTT jobs fast while SarvamAI is failing, and probe for recovery
+circuit_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5')),
+    failure_rate=float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5')),
+    open_seconds=float(os.getenv('CIRCUIT_OPEN_SECONDS', '30')),
+    max_open_seconds=float(os.getenv('CIRCUIT_MAX_OPEN_SECONDS', '300')),
+    half_open_max_calls=int(os.getenv('CIRCUIT_HALF_OPEN_CALLS', '1'))
+)
+
+translation_service = TranslationService(
+    api_key=API_KEY,
+    client_pool=client_pool,
+    circuit_breaker=circuit_breaker,
+    hedge_quantile=float(os.getenv('STTT_HEDGE_QUANTILE', '0')) or None,
+    hedge_budget=float(os.getenv('STTT_HEDGE_BUDGET', '0.1')),
+    batch_window=BATCH_WINDOW_SECONDS,
+    batch_max_files=BATCH_MAX_FILES,
+    max_audio_bytes=MAX_AUDIO_BYTES or None,
+    http_pool=http_pool,
+    transcript_cache=transcript_cache,
+    url_cache=url_cache,
+    download_scheduler=download_scheduler,
+    max_prefetch=int(os.getenv('DOWNLOAD_PREFETCH_MAX', '16'))
+)
+
+# Optional silence trimming and transcoding before upload
+if os.getenv('AUDIO_PREPROCESS', 'false').lower() == 'true':
+    translation_service.preprocessor = AudioPreprocessor(
+        threshold_db=float(os.getenv('SILENCE_THRESHOLD_DB', '-40')),
+        bitrate=os.getenv('PREPROCESS_BITRATE', '32k'),
+        ffmpeg=os.getenv('FFMPEG_BINARY', 'ffmpeg')
+    )
+
+# Optional splitting of long calls into parallel chunk jobs
+if os.getenv('LONG_CALL_CHUNKING', 'false').lower() == 'true':
+    translation_service.chunker = LongCallChunker(
+        AudioPreprocessor(
+            ffmpeg=os.getenv('FFMPEG_BINARY', 'ffmpeg'),
+            ffprobe=os.getenv('FFPROBE_BINARY', 'ffprobe')
+        ),
+        min_seconds=float(os.getenv('LONG_CALL_SECONDS', '600')),
+        chunk_seconds=float(os.getenv('CHUNK_SECONDS', '180')),
+        overlap_seconds=float(os.getenv('CHUNK_OVERLAP_SECONDS', '5')),
+        parallelism=int(os.getenv('CHUNK_PARALLELISM', '4'))
+    )
+
+# Central poller for outstanding SarvamAI jobs
+translation_service.job_monitor = JobMonitor(
+    translation_service.get_job_status,
+    min_interval=float(os.getenv('POLL_MIN_INTERVAL', '1')),
+    max_interval=float(os.getenv('POLL_MAX_INTERVAL', '15')),
+    timeout=float(os.getenv('STTT_JOB_TIMEOUT', '600'))
+)
+
+# Initialize background job queue
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', os.path.join(tempfile.gettempdir(), 'translation_jobs.db'))
+job_queue = JobQueue(
+    JobStore(JOB_DB_PATH),
+    max_workers=int(os.getenv('JOB_WORKERS', '8')),
+    max_pending=int(os.getenv('JOB_MAX_PENDING', '500')),
+    retention_seconds=int(os.getenv('JOB_RETENTION_SECONDS', '86400'))
+)
+
+# Bounded, per-client fair admission queue for /translate and /translate-file
+admission = AdmissionController(
+    max_concurrent=int(os.getenv('ADMISSION_MAX_CONCURRENT', '8')),
+    max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', '12')),
+    max_wait_seconds=float(os.getenv('ADMISSION_MAX_WAIT_SECONDS', '30')),
+    max_queued_per_client=int(os.getenv('ADMISSION_MAX_QUEUED_PER_CLIENT', '4')),
+    initial_service_seconds=float(os.getenv('ADMISSION_INITIAL_SERVICE_SECONDS', '30'))
+)
+
+
+def _process_age_seconds():
+    """Seconds since this process started (the fork, for a gunicorn worker)."""
+    try:
+        with open('/proc/self/stat') as stat:
+            # Start time is field 22, counted after the parenthesised command name
+            started_ticks = int(stat.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as uptime:
+            uptime_seconds = float(uptime.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(uptime_seconds - started_ticks / os.sysconf('SC_CLK_TCK'), 3)
+
+
+# Worker startup: the SDK import and client creation happen on the warming thread
+client_pool.warm()
+WORKER_READY_SECONDS = _process_age_seconds()
+
+
+# Streaming response formats for /translate, selected by the Accept header
+STREAM_MIMETYPES = ('application/x-ndjson', 'text/event-stream')
+
+
+def _encode_event(event, mimetype):
+    if mimetype == 'text/event-stream':
+        return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    return json.dumps(event) + '\n'
+
+
+def _stream_translation(audio_url, metadata, mimetype, ticket, started):
+    """Run a URL translation in the background and stream its progress.
+
+    Yields progress events as they happen, then a 'result' event with the
+    language and metadata, one 'speaker' event per speaker entry and a
+    final 'done' event. Failures are reported as an 'error' event. The
+    admission ticket is released when the translation finishes, even if
+    the client has gone away, so disconnecting never frees a slot early.
+    started is set once the translation thread has been started.
+    """
+    events = queue.Queue()
+
+    def progress(event, **fields):
+        events.put(dict({'event': event}, **fields))
+
+    def work():
+        try:
+            result = translation_service.translate_from_url(audio_url, progress=progress)
+            events.put({'event': '_result', 'result': result})
+        except AudioTooLargeError as e:
+            events.put({'event': 'error', 'status': 'error', 'code': 413, 'message': str(e)})
+        except CircuitOpenError as e:
+            events.put({'event': 'error', 'status': 'error', 'code': 503, 'message': str(e),
+                        'retry_after': e.retry_after})
+        except Exception as e:
+            events.put({'event': 'error', 'status': 'error', 'code': 500, 'message': str(e)})
+        finally:
+            ticket.release()
+
+    def encode(event):
+        return _encode_event(event, mimetype)
+
+    started.set()
+    threading.Thread(target=work, daemon=True).start()
+    yield encode({'event': 'accepted', 'audio_url': audio_url})
+
+    while True:
+        event = events.get()
+        if event['event'] == 'error':
+            yield encode(event)
+            return
+        if event['event'] != '_result':
+            yield encode(event)
+            continue
+
+        result = event['result']
+        header = {'event': 'result', 'status': 'success', 'language_code': result['language_code']}
+        if 'preprocessing' in result:
+            header['preprocessing'] = result['preprocessing']
+        if metadata:
+            header['seller_buyer_meta_data'] = metadata
+        yield encode(header)
+
+        for index, speaker in enumerate(result['speakers']):
+            yield encode(dict({'event': 'speaker', 'index': index}, **speaker))
+
+        yield encode({'event': 'done', 'status': 'success', 'speaker_count': len(result['speakers'])})
+        return
+
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'Time to produce a response, by route, method and status',
+    ['route', 'method', 'status']
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    'http_requests_in_flight',
+    'Requests currently being handled, by route',
+    ['route']
+)
+DOWNLOAD_QUEUE_DEPTH = REGISTRY.gauge(
+    'translation_download_queue_depth',
+    'Audio downloads waiting for a scheduler worker'
+)
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    'translation_admission_queue_depth',
+    'Requests waiting for an admission slot'
+)
+ADMISSION_SHED = REGISTRY.counter(
+    'translation_admission_shed_total',
+    'Requests rejected with 429 by admission control, by route and reason',
+    ['route', 'reason']
+)
+OUTSTANDING_STTT_JOBS = REGISTRY.gauge(
+    'translation_outstanding_sttt_jobs',
+    'STTT jobs being polled by the job monitor'
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    'translation_circuit_breaker_state',
+    'SarvamAI circuit breaker state (1 for the current state)',
+    ['state']
+)
+WORKER_STARTUP_SECONDS = REGISTRY.gauge(
+    'translation_worker_startup_seconds',
+    'Worker startup time by phase (ready to serve, SDK import, client warm-up)',
+    ['phase']
+)
+
+
+@app.before_request
+def start_request_timer():
+    g.metrics_route = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.metrics_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc(route=g.metrics_route)
+
+
+@app.after_request
+def record_request_metrics(response):
+    # Streaming responses are timed until their headers are ready
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - g.metrics_started,
+        route=g.metrics_route,
+        method=request.method,
+        status=response.status_code
+    )
+    return response
+
+
+@app.teardown_request
+def stop_request_timer(exc):
+    if 'metrics_route' in g:
+        REQUESTS_IN_FLIGHT.dec(route=g.metrics_route)
+
+
+def _request_too_large():
+    return jsonify({
+        'status': 'error',
+        'message': f'Request body exceeds maximum size of {MAX_REQUEST_BYTES} bytes'
+    }), 413
+
+
+def _client_key(metadata=None):
+    """Identify the caller for fair queueing: seller, then API key, then address."""
+    seller = (metadata or {}).get('seller_identifier') if isinstance(metadata, dict) else None
+    if seller:
+        return f'seller:{seller}'
+    api_key = request.headers.get('X-API-Key')
+    if api_key:
+        return f'api_key:{api_key}'
+    return f'addr:{request.remote_addr}'
+
+
+def _overloaded(error):
+    ADMISSION_SHED.inc(route=g.metrics_route, reason=error.reason)
+    response = jsonify({
+        'status': 'error',
+        'message': str(error),
+        'retry_after': error.retry_after
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+
+def _upstream_unavailable(error):
+    response = jsonify({
+        'status': 'error',
+        'message': str(error),
+        'retry_after': error.retry_after
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
+
+@app.before_request
+def reject_oversized_request():
+    """Reject oversized bodies from their Content-Length before reading them."""
+    if MAX_REQUEST_BYTES and request.content_length and request.content_length > MAX_REQUEST_BYTES:
+        return _request_too_large()
+
+
+def _startup_stats():
+    return {
+        'pid': os.getpid(),
+        'worker_ready_seconds': WORKER_READY_SECONDS,
+        'sarvam_clients': client_pool.stats()
+    }
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for monitoring."""
-    return jsonify({
+    health = {
         'status': 'healthy',
         'service': 'audio-translation-api'
-    }), 200
+    }
+    
+    if translation_service.batcher is not None:
+        health['batching'] = translation_service.batcher.stats()
+    
+    health['jobs'] = job_queue.stats()
+    health['http_pool'] = http_pool.stats()
+    health['downloads'] = dict(download_scheduler.stats(), prefetch=translation_service.prefetch_stats())
+    health['job_monitor'] = translation_service.job_monitor.stats()
+    health['admission'] = admission.stats()
+    health['circuit_breaker'] = circuit_breaker.stats()
+    health['hedging'] = translation_service.hedge_stats()
+    health['startup'] = _startup_stats()
+    
+    if transcript_cache is not None:
+        health['transcript_cache'] = transcript_cache.stats()
+    
+    if url_cache is not None:
+        health['url_cache'] = url_cache.stats()
+    
+    return jsonify(health), 200
 
 
 @app.route('/translate', methods=['POST'])
@@ -44,6 +428,11 @@ def translate_audio():
             "speakers": [...],
             "seller_buyer_meta_data": {...}
         }
+    
+    With "Accept: application/x-ndjson" or "Accept: text/event-stream" the
+    response is streamed instead: progress events (downloaded, uploaded,
+    job_running, ...), a "result" event, one "speaker" event per entry and
+    a closing "done" or "error" event.
     """
     try:
         # Validate request
@@ -63,8 +452,26 @@ def translate_audio():
                 'message': 'Missing required field: audio_url'
             }), 400
         
+        # Wait for a processing slot, or shed the request when overloaded
+        ticket = admission.admit(_client_key(metadata))
+        
+        # Stream progress and speakers when the client asks for it
+        mimetype = request.accept_mimetypes.best_match(('application/json',) + STREAM_MIMETYPES)
+        if mimetype in STREAM_MIMETYPES:
+            started = threading.Event()
+            response = Response(
+                _stream_translation(audio_url, metadata, mimetype, ticket, started),
+                mimetype=mimetype,
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+            # The worker holds the slot until the translation finishes; this
+            # only frees it if the stream is closed before the worker started
+            response.call_on_close(lambda: started.is_set() or ticket.release())
+            return response
+        
         # Process audio
-        result = translation_service.translate_from_url(audio_url)
+        with ticket:
+            result = translation_service.translate_from_url(audio_url)
         
         # Add metadata to response if provided
         if metadata:
@@ -72,6 +479,18 @@ def translate_audio():
         
         return jsonify(result), 200
     
+    except OverloadedError as e:
+        return _overloaded(e)
+    
+    except CircuitOpenError as e:
+        return _upstream_unavailable(e)
+    
+    except AudioTooLargeError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+    
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -97,6 +516,9 @@ def translate_audio_file():
         }
     """
     try:
+        # Shed load before the upload is read
+        admission.check(_client_key())
+        
         # Check if file is present
         if 'audio_file' not in request.files:
             return jsonify({
@@ -124,8 +546,9 @@ def translate_audio_file():
                     'message': 'Invalid JSON in seller_buyer_meta_data'
                 }), 400
         
-        # Process uploaded file
-        result = translation_service.translate_from_file(audio_file)
+        # Process uploaded file once a processing slot is free
+        with admission.admit(_client_key(metadata)):
+            result = translation_service.translate_from_file(audio_file)
         
         # Add metadata to response if provided
         if metadata:
@@ -133,6 +556,22 @@ def translate_audio_file():
         
         return jsonify(result), 200
     
+    except RequestEntityTooLarge:
+        # Bodies without a Content-Length hit the limit while being parsed
+        return _request_too_large()
+    
+    except OverloadedError as e:
+        return _overloaded(e)
+    
+    except CircuitOpenError as e:
+        return _upstream_unavailable(e)
+    
+    except AudioTooLargeError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+    
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -140,6 +579,259 @@ def translate_audio_file():
         }), 500
 
 
+def _error_code(error):
+    if isinstance(error, AudioTooLargeError):
+        return 413
+    if isinstance(error, CircuitOpenError):
+        return 503
+    return 500
+
+
+def _batch_results(items):
+    """Translate batch items and yield one result dict per item as it completes."""
+    valid = [index for index, item in enumerate(items) if item.get('audio_url')]
+    
+    for index, item in enumerate(items):
+        if not item.get('audio_url'):
+            yield {'index': index, 'status': 'error', 'code': 400, 'message': 'Missing required field: audio_url'}
+    
+    results = translation_service.translate_batch(
+        [items[index]['audio_url'] for index in valid],
+        max_files_per_job=BULK_FILES_PER_JOB,
+        download_workers=BULK_DOWNLOAD_WORKERS
+    )
+    for position, result in results:
+        index = valid[position]
+        item = items[index]
+        
+        if isinstance(result, Exception):
+            entry = {
+                'index': index,
+                'audio_url': item['audio_url'],
+                'status': 'error',
+                'code': _error_code(result),
+                'message': str(result)
+            }
+        else:
+            entry = dict({'index': index, 'audio_url': item['audio_url']}, **result)
+            if item.get('seller_buyer_meta_data'):
+                entry['seller_buyer_meta_data'] = item['seller_buyer_meta_data']
+        yield entry
+
+
+@app.route('/translate/batch', methods=['POST'])
+def translate_batch():
+    """
+    Translate many audio URLs in one request.
+    
+    Request JSON:
+        {
+            "items": [
+                {"audio_url": "https://example.com/a.mp3", "seller_buyer_meta_data": {...}},
+                {"audio_url": "https://example.com/b.mp3"}
+            ]
+        }
+    
+    Files are downloaded concurrently and submitted together in as few
+    STTT jobs as possible. Results are streamed as NDJSON (or SSE with
+    "Accept: text/event-stream"), one "item" event per entry in completion
+    order, followed by a "done" event with counts. Each item carries its
+    "index" in the request and either the /translate response fields or
+    "status": "error" with a message. With "Accept: application/json" the
+    results are returned together, in request order, once all are done.
+    """
+    try:
+        # Validate request
+        if not request.is_json:
+            return jsonify({
+                'status': 'error',
+                'message': 'Request must be JSON'
+            }), 400
+        
+        data = request.get_json()
+        items = data.get('items') if isinstance(data, dict) else None
+        
+        if not isinstance(items, list) or not items or not all(isinstance(i, dict) for i in items):
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required field: items (non-empty list of objects)'
+            }), 400
+        
+        if len(items) > BULK_MAX_ITEMS:
+            return jsonify({
+                'status': 'error',
+                'message': f'Too many items: maximum is {BULK_MAX_ITEMS}'
+            }), 400
+        
+        mimetype = request.accept_mimetypes.best_match(
+            STREAM_MIMETYPES + ('application/json',),
+            default=STREAM_MIMETYPES[0]
+        )
+        
+        if mimetype == 'application/json':
+            results = sorted(_batch_results(items), key=lambda entry: entry['index'])
+            return jsonify({
+                'status': 'success',
+                'succeeded': sum(1 for entry in results if entry['status'] == 'success'),
+                'failed': sum(1 for entry in results if entry['status'] != 'success'),
+                'results': results
+            }), 200
+        
+        def generate():
+            succeeded = 0
+            for entry in _batch_results(items):
+                succeeded += entry['status'] == 'success'
+                yield _encode_event(dict({'event': 'item'}, **entry), mimetype)
+            yield _encode_event({
+                'event': 'done',
+                'status': 'success',
+                'succeeded': succeeded,
+                'failed': len(items) - succeeded
+            }, mimetype)
+        
+        return Response(
+            generate(),
+            mimetype=mimetype,
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue an audio URL for translation and return a job ID immediately.
+    
+    Request JSON: Same as POST /translate
+    
+    Response JSON (202):
+        {
+            "status": "success",
+            "job_id": "4f1c...",
+            "job_status": "queued",
+            "status_url": "/jobs/4f1c..."
+        }
+    """
+    try:
+        # Validate request
+        if not request.is_json:
+            return jsonify({
+                'status': 'error',
+                'message': 'Request must be JSON'
+            }), 400
+        
+        data = request.get_json()
+        audio_url = data.get('audio_url')
+        metadata = data.get('seller_buyer_meta_data', {})
+        
+        if not audio_url:
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required field: audio_url'
+            }), 400
+        
+        def work():
+            result = translation_service.translate_from_url(audio_url)
+            if metadata:
+                result['seller_buyer_meta_data'] = metadata
+            return result
+        
+        # Download while earlier jobs are still in STTT processing. The
+        # prefetch starts before the job is queued, so its worker always finds
+        # and joins it, and only when the job will actually have to wait.
+        prefetching = job_queue.backlogged() and translation_service.prefetch(audio_url)
+        try:
+            job_id = job_queue.submit(work, {
+                'audio_url': audio_url,
+                'seller_buyer_meta_data': metadata
+            })
+        except QueueFullError:
+            if prefetching:
+                translation_service.cancel_prefetch(audio_url)
+            raise
+        
+        return jsonify({
+            'status': 'success',
+            'job_id': job_id,
+            'job_status': 'queued',
+            'status_url': f'/jobs/{job_id}'
+        }), 202
+    
+    except QueueFullError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 503
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get the status of a queued translation job.
+    
+    Response JSON:
+        {
+            "status": "success",
+            "job_id": "4f1c...",
+            "job_status": "queued|running|completed|failed",
+            "result": {...},     # when completed, same as POST /translate
+            "error": "..."       # when failed
+        }
+    """
+    job = job_queue.store.get(job_id)
+    
+    if job is None:
+        return jsonify({
+            'status': 'error',
+            'message': f'Job not found: {job_id}'
+        }), 404
+    
+    response = {
+        'status': 'success',
+        'job_id': job_id,
+        'job_status': job['status'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at']
+    }
+    
+    if job['status'] == 'completed':
+        response['result'] = job['result']
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    
+    return jsonify(response), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this worker process in text exposition format."""
+    DOWNLOAD_QUEUE_DEPTH.set(download_scheduler.stats()['queue_depth'])
+    ADMISSION_QUEUE_DEPTH.set(admission.stats()['queue_depth'])
+    state = circuit_breaker.state
+    for name in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN):
+        CIRCUIT_STATE.set(1 if name == state else 0, state=name)
+    OUTSTANDING_STTT_JOBS.set(translation_service.job_monitor.stats()['outstanding_jobs'])
+    clients = client_pool.stats()
+    for phase, seconds in (('ready', WORKER_READY_SECONDS),
+                           ('sdk_import', clients['sdk_import_seconds']),
+                           ('clients_warm', clients['warm_seconds'])):
+        if seconds is not None:
+            WORKER_STARTUP_SECONDS.set(seconds, phase=phase)
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/', methods=['GET'])
 def index():
     """API documentation endpoint."""
@@ -173,6 +865,32 @@ def index():
                     'seller_buyer_meta_data': 'Metadata passed from request (if provided)'
                 }
             },
+            'POST /translate/batch': {
+                'description': 'Translate many audio URLs with as few STTT jobs as possible',
+                'request': {
+                    'items': 'List of {audio_url, seller_buyer_meta_data} objects (required)'
+                },
+                'response': 'NDJSON stream of item events (index plus the POST /translate response or an error), then a done event'
+            },
+            'POST /jobs': {
+                'description': 'Queue audio URL translation and return a job ID immediately',
+                'request': 'Same as POST /translate',
+                'response': {
+                    'job_id': 'ID to poll with GET /jobs/<job_id>',
+                    'job_status': 'queued'
+                }
+            },
+            'GET /jobs/<job_id>': {
+                'description': 'Get status and result of a queued translation job',
+                'response': {
+                    'job_status': 'queued/running/completed/failed',
+                    'result': 'Same as POST /translate response (when completed)',
+                    'error': 'Error message (when failed)'
+                }
+            },
+            'GET /metrics': {
+                'description': 'Prometheus metrics: per-stage latency histograms, stage outcomes, bytes and audio seconds processed, in-flight requests'
+            },
             'GET /health': {
                 'description': 'Health check endpoint',
                 'response': {
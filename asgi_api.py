@@ -0,0 +1,188 @@
+from quart import Quart, request, jsonify
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+import json
+import os
+import tempfile
+from async_translation_service import AsyncTranslationService
+from translation_service import AudioTooLargeError
+
+app = Quart(__name__)
+
+# Initialize async translation service
+API_KEY = os.getenv('SARVAM_API_KEY', 'khemchandwillprovidethekey')
+MAX_AUDIO_BYTES = int(os.getenv('MAX_AUDIO_BYTES', str(200 * 1024 * 1024)))
+# Same body limit as api.py: the audio plus room for the multipart envelope
+MAX_REQUEST_BYTES = MAX_AUDIO_BYTES + 1024 * 1024 if MAX_AUDIO_BYTES else None
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+
+translation_service = AsyncTranslationService(
+    API_KEY,
+    max_audio_bytes=MAX_AUDIO_BYTES,
+    per_host_limit=int(os.getenv('DOWNLOAD_PER_HOST_LIMIT', '8')),
+    sarvam_limit=int(os.getenv('SARVAM_CONCURRENCY', '32')),
+    min_poll_interval=float(os.getenv('POLL_MIN_INTERVAL', '1')),
+    max_poll_interval=float(os.getenv('POLL_MAX_INTERVAL', '15')),
+    job_timeout=float(os.getenv('STTT_JOB_TIMEOUT', '600')),
+    download_timeout=float(os.getenv('AUDIO_DOWNLOAD_TIMEOUT', '30'))
+)
+
+
+def _request_too_large():
+    return jsonify({
+        'status': 'error',
+        'message': f'Request body exceeds maximum size of {MAX_REQUEST_BYTES} bytes'
+    }), 413
+
+
+@app.after_serving
+async def close_translation_service():
+    await translation_service.aclose()
+
+
+@app.route('/health', methods=['GET'])
+async def health_check():
+    """Health check endpoint for monitoring."""
+    return jsonify({
+        'status': 'healthy',
+        'service': 'audio-translation-api',
+        'mode': 'asgi',
+        'translation': translation_service.stats()
+    }), 200
+
+
+@app.route('/translate', methods=['POST'])
+async def translate_audio():
+    """
+    Translate audio from URL to text with speaker diarization.
+
+    Same request and response contract as POST /translate in api.py.
+    """
+    try:
+        # Validate request
+        if not request.is_json:
+            return jsonify({
+                'status': 'error',
+                'message': 'Request must be JSON'
+            }), 400
+
+        data = await request.get_json()
+        audio_url = data.get('audio_url')
+        metadata = data.get('seller_buyer_meta_data', {})
+
+        if not audio_url:
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required field: audio_url'
+            }), 400
+
+        # Process audio
+        result = await translation_service.translate_from_url(audio_url)
+
+        # Add metadata to response if provided
+        if metadata:
+            result['seller_buyer_meta_data'] = metadata
+
+        return jsonify(result), 200
+
+    except RequestEntityTooLarge:
+        return _request_too_large()
+
+    except HTTPException:
+        # Let Quart render other HTTP errors with their own status
+        raise
+
+    except AudioTooLargeError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/translate-file', methods=['POST'])
+async def translate_audio_file():
+    """
+    Translate uploaded audio file to text with speaker diarization.
+
+    Same request and response contract as POST /translate-file in api.py.
+    """
+    temp_file = None
+    try:
+        files = await request.files
+        form = await request.form
+
+        # Check if file is present
+        if 'audio_file' not in files:
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required field: audio_file'
+            }), 400
+
+        audio_file = files['audio_file']
+
+        if audio_file.filename == '':
+            return jsonify({
+                'status': 'error',
+                'message': 'No file selected'
+            }), 400
+
+        # Get metadata if provided
+        metadata = {}
+        if 'seller_buyer_meta_data' in form:
+            try:
+                metadata = json.loads(form['seller_buyer_meta_data'])
+            except json.JSONDecodeError:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Invalid JSON in seller_buyer_meta_data'
+                }), 400
+
+        # Save uploaded file
+        temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
+        temp_audio.close()
+        temp_file = temp_audio.name
+        await audio_file.save(temp_file)
+
+        # Process uploaded file
+        result = await translation_service.translate_from_path(temp_file)
+
+        # Add metadata to response if provided
+        if metadata:
+            result['seller_buyer_meta_data'] = metadata
+
+        return jsonify(result), 200
+
+    except RequestEntityTooLarge:
+        return _request_too_large()
+
+    except HTTPException:
+        # Let Quart render other HTTP errors with their own status
+        raise
+
+    except AudioTooLargeError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 413
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+    finally:
+        if temp_file and os.path.exists(temp_file):
+            os.unlink(temp_file)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.getenv('PORT', 8888))
+    uvicorn.run(app, host='0.0.0.0', port=port)
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import mimetypes
+import os
+import tempfile
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+from sarvamai import AsyncSarvamAI
+
+from job_monitor import estimate_audio_seconds, next_poll_interval
+from translation_service import TranslationService, AudioTooLargeError, STREAM_CHUNK_SIZE
+
+
+class AsyncTranslationService:
+    """asyncio implementation of the TranslationService workflow.
+
+    Downloads, uploads and status polls are all non-blocking, so one process
+    can keep many calls in flight. Concurrency is bounded separately for
+    each download host and for SarvamAI job submissions; jobs that have
+    been started are polled without holding a submission slot.
+    """
+
+    TERMINAL_STATES = {'completed', 'failed'}
+
+    def __init__(self, api_key, max_audio_bytes=None, per_host_limit=8, sarvam_limit=32,
+                 min_poll_interval=1.0, max_poll_interval=15.0, job_timeout=600,
+                 download_timeout=30, initial_ratio=0.5):
+        """Initialize the async translation service.
+
+        Args:
+            api_key (str): SarvamAI API subscription key
+            max_audio_bytes (int): Largest audio file accepted (None for no limit)
+            per_host_limit (int): Concurrent downloads allowed per audio host
+            sarvam_limit (int): Concurrent SarvamAI job submissions
+                (create, upload, start) allowed
+            min_poll_interval (float): Shortest gap between status polls
+            max_poll_interval (float): Longest gap between status polls
+            job_timeout (float): Seconds to wait for a job before giving up
+            download_timeout (float): Timeout for audio downloads
+            initial_ratio (float): Processing seconds per audio second assumed
+                before any job has completed
+        """
+        self.client = AsyncSarvamAI(api_subscription_key=api_key)
+        self.max_audio_bytes = max_audio_bytes
+        self.per_host_limit = per_host_limit
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.job_timeout = job_timeout
+        self.download_timeout = download_timeout
+
+        self._ratio = initial_ratio
+        self._host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+        self._sarvam_limit = asyncio.Semaphore(sarvam_limit)
+        self._http = None
+        self._in_flight = 0
+
+    @property
+    def http(self):
+        # Created on first use so it binds to the server's running event loop
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.download_timeout),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                follow_redirects=True
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def stats(self):
+        """Return concurrency counters for health reporting."""
+        return {
+            'in_flight': self._in_flight,
+            'sarvam_slots_free': self._sarvam_limit._value,
+            'seconds_per_audio_second': round(self._ratio, 3)
+        }
+
+    async def download_audio(self, audio_url):
+        """Stream audio from a URL to a temporary file.
+
+        Args:
+            audio_url (str): URL of the audio file to download
+
+        Returns:
+            str: Path to the downloaded temporary file
+
+        Raises:
+            httpx.HTTPError: If download fails
+            AudioTooLargeError: If the file exceeds max_audio_bytes
+        """
+        host = urlsplit(audio_url).netloc
+        async with self._host_limits[host]:
+            async with self.http.stream('GET', audio_url) as response:
+                response.raise_for_status()
+
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit():
+                    self._check_size(int(content_length))
+
+                total_bytes = 0
+                temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
+                try:
+                    with temp_audio:
+                        # Local disk writes of one chunk are short enough to do inline
+                        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                            total_bytes += len(chunk)
+                            self._check_size(total_bytes)
+                            temp_audio.write(chunk)
+                except BaseException:
+                    os.unlink(temp_audio.name)
+                    raise
+
+        return temp_audio.name
+
+    async def process_audio(self, audio_path):
+        """Run a SarvamAI STTT job on one audio file without blocking the loop.
+
+        Args:
+            audio_path (str): Path to the audio file
+
+        Returns:
+            dict: Translation results containing transcript and diarization
+
+        Raises:
+            Exception: If processing fails
+        """
+        jobs = self.client.speech_to_text_translate_job
+
+        # Only submission holds a slot; a started job just waits on polls,
+        # so hundreds of jobs can be in flight at once
+        async with self._sarvam_limit:
+            job = await jobs.create_job(
+                model=TranslationService.MODEL,
+                with_diarization=TranslationService.WITH_DIARIZATION,
+                num_speakers=TranslationService.NUM_SPEAKERS,
+                prompt=TranslationService.PROMPT
+            )
+
+            # Upload and process file
+            await self._upload(job.job_id, audio_path)
+            await jobs.start(job_id=job.job_id)
+
+        # Wait for completion
+        await self._wait(job.job_id, estimate_audio_seconds(audio_path))
+
+        # Check file-level results
+        file_results = await job.get_file_results()
+
+        if len(file_results['successful']) == 0:
+            error_msg = "Audio processing failed"
+            if file_results['failed']:
+                error_msg = file_results['failed'][0].get('error_message') or error_msg
+            raise Exception(error_msg)
+
+        output_file = file_results['successful'][0]['output_file']
+        download_links = await jobs.get_download_links(job_id=job.job_id, files=[output_file])
+        response = await self.http.get(download_links.download_urls[output_file].file_url)
+        response.raise_for_status()
+        return json.loads(response.content)
+
+    async def translate_from_url(self, audio_url):
+        """Complete translation workflow from URL to formatted response.
+
+        Args:
+            audio_url (str): URL of the audio file
+
+        Returns:
+            dict: Formatted translation response
+        """
+        self._in_flight += 1
+        temp_file = None
+        try:
+            temp_file = await self.download_audio(audio_url)
+            result_data = await self.process_audio(temp_file)
+            return TranslationService.format_response(result_data)
+        finally:
+            self._in_flight -= 1
+            if temp_file and os.path.exists(temp_file):
+                os.unlink(temp_file)
+
+    async def translate_from_path(self, audio_path):
+        """Translate an audio file that is already on local disk.
+
+        Args:
+            audio_path (str): Path to the audio file
+
+        Returns:
+            dict: Formatted translation response
+        """
+        self._in_flight += 1
+        try:
+            result_data = await self.process_audio(audio_path)
+            return TranslationService.format_response(result_data)
+        finally:
+            self._in_flight -= 1
+
+    async def _upload(self, job_id, audio_path):
+        file_name = os.path.basename(audio_path)
+        upload_links = await self.client.speech_to_text_translate_job.get_upload_links(
+            job_id=job_id,
+            files=[file_name]
+        )
+        content_type, _ = mimetypes.guess_type(audio_path)
+
+        response = await self.http.put(
+            upload_links.upload_urls[file_name].file_url,
+            content=_read_chunks(audio_path),
+            headers={
+                'x-ms-blob-type': 'BlockBlob',
+                'Content-Type': content_type or 'audio/wav',
+                'Content-Length': str(os.path.getsize(audio_path))
+            },
+            timeout=60
+        )
+        if response.status_code < 200 or response.status_code > 226:
+            raise RuntimeError(f"Upload failed for {file_name}: {response.status_code}")
+
+    async def _wait(self, job_id, audio_seconds):
+        started = time.monotonic()
+        expected = max(self.min_poll_interval, audio_seconds * self._ratio)
+        overdue_polls = 0
+
+        while True:
+            elapsed = time.monotonic() - started
+            if elapsed >= expected:
+                overdue_polls += 1
+            await asyncio.sleep(next_poll_interval(
+                elapsed, expected, overdue_polls, self.min_poll_interval, self.max_poll_interval
+            ))
+
+            status = await self.client.speech_to_text_translate_job.get_status(job_id)
+            state = status.job_state.lower()
+            if state in self.TERMINAL_STATES:
+                if state == 'completed' and audio_seconds > 0:
+                    observed = (time.monotonic() - started) / audio_seconds
+                    self._ratio = 0.8 * self._ratio + 0.2 * observed
+                return status
+
+            if time.monotonic() - started > self.job_timeout:
+                raise TimeoutError(f"Job {job_id} did not complete within {self.job_timeout} seconds.")
+
+    def _check_size(self, size):
+        if self.max_audio_bytes and size > self.max_audio_bytes:
+            raise AudioTooLargeError(
+                f"Audio file exceeds maximum size of {self.max_audio_bytes} bytes"
+            )
+
+
+async def _read_chunks(audio_path):
+    with open(audio_path, 'rb') as audio_file:
+        while True:
+            chunk = audio_file.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
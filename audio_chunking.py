@@ -0,0 +1,200 @@
+import os
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from audio_preprocess import SAMPLE_RATE, frame_levels_db
+
+
+def find_cut_points(samples, sample_rate=SAMPLE_RATE, chunk_seconds=180.0, search_seconds=15.0, frame_ms=20):
+    """Choose chunk boundaries at the quietest frame near each target boundary.
+
+    Args:
+        samples (numpy.ndarray): Mono int16 samples
+        sample_rate (int): Sample rate of the samples
+        chunk_seconds (float): Target chunk length
+        search_seconds (float): How far either side of a target to look for silence
+        frame_ms (int): Frame length used for level detection
+
+    Returns:
+        list: Cut positions in samples, excluding 0 and the end of the audio
+    """
+    levels = frame_levels_db(samples, sample_rate, frame_ms)
+    frame_size = sample_rate * frame_ms // 1000
+    chunk_frames = int(chunk_seconds * 1000 / frame_ms)
+    search_frames = int(search_seconds * 1000 / frame_ms)
+
+    cuts = []
+    previous = 0
+    target = chunk_frames
+    while target < len(levels) - search_frames:
+        low = max(previous + 1, target - search_frames)
+        high = min(len(levels), target + search_frames)
+        cut = low + int(np.argmin(levels[low:high]))
+        cuts.append(cut * frame_size)
+        previous = cut
+        target = cut + chunk_frames
+
+    return cuts
+
+
+class LongCallChunker:
+    """Splits long recordings into overlapping chunks cut at silences."""
+
+    def __init__(self, audio_codec, min_seconds=600.0, chunk_seconds=180.0, overlap_seconds=5.0, parallelism=4):
+        """Initialize the chunker.
+
+        Args:
+            audio_codec (AudioPreprocessor): Used to probe, decode and encode audio
+            min_seconds (float): Only recordings longer than this are split
+            chunk_seconds (float): Target chunk length
+            overlap_seconds (float): Audio shared by neighbouring chunks on
+                each side of a cut, used to align speakers
+            parallelism (int): Number of chunks processed concurrently
+        """
+        self.audio_codec = audio_codec
+        self.min_seconds = min_seconds
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.parallelism = parallelism
+
+    def split(self, audio_path):
+        """Split an audio file into overlapping chunk files.
+
+        Args:
+            audio_path (str): Path to the audio file
+
+        Returns:
+            list: Chunk dicts with 'path', 'offset' (seconds into the original
+                where the chunk file starts) and 'start'/'end' (the part of
+                the original this chunk owns), or None if the recording is
+                too short to split
+        """
+        # Most calls are short: read the duration from the header and only
+        # decode recordings that may need splitting
+        duration = self.audio_codec.duration(audio_path)
+        if duration is not None and duration <= self.min_seconds:
+            return None
+
+        samples = self.audio_codec.load(audio_path)
+        if len(samples) <= self.min_seconds * SAMPLE_RATE:
+            return None
+
+        cuts = find_cut_points(samples, chunk_seconds=self.chunk_seconds)
+        if not cuts:
+            return None
+
+        bounds = [0] + cuts + [len(samples)]
+        overlap = int(self.overlap_seconds * SAMPLE_RATE)
+        chunks = []
+        try:
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                chunk_start = max(0, start - overlap)
+                chunk_end = min(len(samples), end + overlap)
+                chunks.append({
+                    'path': self.audio_codec.save(samples[chunk_start:chunk_end]),
+                    'offset': chunk_start / SAMPLE_RATE,
+                    'start': start / SAMPLE_RATE,
+                    'end': end / SAMPLE_RATE
+                })
+        except BaseException:
+            for chunk in chunks:
+                os.unlink(chunk['path'])
+            raise
+
+        return chunks
+
+
+def merge_chunk_results(chunks, chunk_results):
+    """Merge per-chunk STTT results into one result for the whole recording.
+
+    Entry times are shifted by each chunk's offset. Every entry is kept only
+    by the chunk that owns its midpoint, which drops duplicates from the
+    overlaps. Speaker IDs of each chunk are mapped onto the previous chunk's
+    IDs by how much their entries overlap in time inside the shared audio.
+
+    Args:
+        chunks (list): Chunk dicts from LongCallChunker.split
+        chunk_results (list): Raw result data for each chunk, in order
+
+    Returns:
+        dict: Result data in the same shape as a single-file STTT result
+    """
+    merged = []
+    previous_entries = []
+
+    for chunk, result in zip(chunks, chunk_results):
+        entries = []
+        for entry in (result.get('diarized_transcript') or {}).get('entries', []):
+            shifted = dict(entry)
+            for key in ('start_time_seconds', 'end_time_seconds'):
+                if shifted.get(key) is not None:
+                    shifted[key] = round(shifted[key] + chunk['offset'], 3)
+            entries.append(shifted)
+
+        mapping = _match_speakers(previous_entries, entries)
+        for entry in entries:
+            if 'speaker_id' in entry:
+                entry['speaker_id'] = mapping.get(entry['speaker_id'], entry['speaker_id'])
+
+        for entry in entries:
+            midpoint = _midpoint(entry)
+            if midpoint is None or chunk['start'] <= midpoint < chunk['end']:
+                merged.append(entry)
+
+        previous_entries = entries
+
+    merged.sort(key=lambda e: e.get('start_time_seconds') or 0)
+
+    languages = Counter(r.get('language_code') for r in chunk_results if r.get('language_code'))
+    return {
+        'language_code': languages.most_common(1)[0][0] if languages else 'N/A',
+        'transcript': ' '.join(r.get('transcript', '') for r in chunk_results if r.get('transcript')),
+        'diarized_transcript': {'entries': merged}
+    }
+
+
+def _midpoint(entry):
+    start = entry.get('start_time_seconds')
+    end = entry.get('end_time_seconds')
+    if start is None or end is None:
+        return None
+    return (start + end) / 2
+
+
+def _match_speakers(previous_entries, entries):
+    # Seconds of shared speech between each (current speaker, previous speaker) pair
+    overlap = defaultdict(float)
+    for current in entries:
+        for previous in previous_entries:
+            shared = (
+                min(current.get('end_time_seconds') or 0, previous.get('end_time_seconds') or 0)
+                - max(current.get('start_time_seconds') or 0, previous.get('start_time_seconds') or 0)
+            )
+            if shared > 0:
+                overlap[(current.get('speaker_id'), previous.get('speaker_id'))] += shared
+
+    mapping = {}
+    used = set()
+    for (current_id, previous_id), _ in sorted(overlap.items(), key=lambda item: item[1], reverse=True):
+        if current_id in mapping or previous_id in used:
+            continue
+        mapping[current_id] = previous_id
+        used.add(previous_id)
+
+    # Speakers absent from the overlap take the remaining previous IDs in order
+    previous_ids = sorted({e.get('speaker_id') for e in previous_entries} - used, key=str)
+    for current_id in sorted({e.get('speaker_id') for e in entries} - set(mapping), key=str):
+        if previous_ids:
+            target = previous_ids.pop(0)
+        else:
+            # A speaker new to this chunk keeps its ID unless that is already taken
+            target = current_id
+            suffix = 2
+            while target in used:
+                target = f"{current_id}_{suffix}"
+                suffix += 1
+        mapping[current_id] = target
+        used.add(target)
+
+    return mapping
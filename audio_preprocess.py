@@ -0,0 +1,210 @@
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+# Speech-recognition friendly working format: 16 kHz mono
+SAMPLE_RATE = 16000
+CHANNELS = 1
+
+
+def decode_audio(audio_path, sample_rate=SAMPLE_RATE, ffmpeg='ffmpeg'):
+    """Decode an audio file to mono 16-bit PCM samples with ffmpeg.
+
+    ffmpeg downmixes multi-channel recordings while decoding.
+
+    Args:
+        audio_path (str): Path to the audio file
+        sample_rate (int): Output sample rate
+        ffmpeg (str): ffmpeg executable
+
+    Returns:
+        numpy.ndarray: Mono int16 samples
+
+    Raises:
+        RuntimeError: If ffmpeg cannot decode the file
+    """
+    result = subprocess.run(
+        [ffmpeg, '-v', 'error', '-i', audio_path,
+         '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', str(CHANNELS), '-ar', str(sample_rate), '-'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+def probe_duration(audio_path, ffprobe='ffprobe'):
+    """Read an audio file's duration from its container header with ffprobe.
+
+    Nothing is decoded, so this is cheap even for long recordings.
+
+    Args:
+        audio_path (str): Path to the audio file
+        ffprobe (str): ffprobe executable
+
+    Returns:
+        float: Duration in seconds, or None if ffprobe cannot tell
+    """
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', audio_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    try:
+        return float(result.stdout.decode('ascii', 'replace').strip())
+    except ValueError:
+        # Streams without a duration in the header report 'N/A'
+        return None
+
+
+def encode_audio(samples, out_path, sample_rate=SAMPLE_RATE, bitrate='32k', ffmpeg='ffmpeg'):
+    """Encode mono 16-bit PCM samples to a compact MP3 file.
+
+    Args:
+        samples (numpy.ndarray): Mono int16 samples
+        out_path (str): Destination file path
+        sample_rate (int): Sample rate of the samples
+        bitrate (str): Target MP3 bitrate
+        ffmpeg (str): ffmpeg executable
+
+    Raises:
+        RuntimeError: If ffmpeg cannot encode the samples
+    """
+    result = subprocess.run(
+        [ffmpeg, '-v', 'error', '-y',
+         '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', '-',
+         '-codec:a', 'libmp3lame', '-b:a', bitrate, out_path],
+        input=np.ascontiguousarray(samples, dtype=np.int16).tobytes(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg encode failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+
+def frame_levels_db(samples, sample_rate=SAMPLE_RATE, frame_ms=20):
+    """Compute the RMS level of each fixed-size frame in dBFS.
+
+    Args:
+        samples (numpy.ndarray): Mono int16 samples
+        sample_rate (int): Sample rate of the samples
+        frame_ms (int): Frame length in milliseconds
+
+    Returns:
+        numpy.ndarray: float32 level per frame (trailing partial frame dropped)
+    """
+    frame_size = sample_rate * frame_ms // 1000
+    frame_count = len(samples) // frame_size
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = samples[:frame_count * frame_size].reshape(frame_count, frame_size).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return (20 * np.log10(np.maximum(rms, 1.0) / 32768.0)).astype(np.float32)
+
+
+def find_speech_bounds(samples, sample_rate=SAMPLE_RATE, threshold_db=-40.0, padding_seconds=0.3, frame_ms=20):
+    """Find the first and last non-silent sample.
+
+    Args:
+        samples (numpy.ndarray): Mono int16 samples
+        sample_rate (int): Sample rate of the samples
+        threshold_db (float): Frames quieter than this are treated as silence
+        padding_seconds (float): Audio kept around the detected speech
+        frame_ms (int): Frame length in milliseconds
+
+    Returns:
+        tuple: (start, end) sample indices, or (0, 0) if everything is silent
+    """
+    levels = frame_levels_db(samples, sample_rate, frame_ms)
+    loud = np.flatnonzero(levels > threshold_db)
+    if len(loud) == 0:
+        return 0, 0
+
+    frame_size = sample_rate * frame_ms // 1000
+    padding = int(padding_seconds * sample_rate)
+    start = max(0, loud[0] * frame_size - padding)
+    end = min(len(samples), (loud[-1] + 1) * frame_size + padding)
+    return int(start), int(end)
+
+
+class AudioPreprocessor:
+    """Trims silence and transcodes call recordings before upload."""
+
+    def __init__(self, threshold_db=-40.0, padding_seconds=0.3, bitrate='32k', ffmpeg='ffmpeg', ffprobe='ffprobe'):
+        """Initialize the preprocessor.
+
+        Args:
+            threshold_db (float): Frames quieter than this count as silence
+            padding_seconds (float): Audio kept before and after speech
+            bitrate (str): MP3 bitrate of the processed file
+            ffmpeg (str): ffmpeg executable
+            ffprobe (str): ffprobe executable, used to read durations
+        """
+        self.threshold_db = threshold_db
+        self.padding_seconds = padding_seconds
+        self.bitrate = bitrate
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe
+
+    def duration(self, audio_path):
+        """Return the duration of an audio file in seconds without decoding it, or None."""
+        return probe_duration(audio_path, ffprobe=self.ffprobe)
+
+    def load(self, audio_path):
+        """Decode an audio file to mono int16 samples at SAMPLE_RATE."""
+        return decode_audio(audio_path, ffmpeg=self.ffmpeg)
+
+    def save(self, samples):
+        """Encode mono samples to a new temporary MP3 file and return its path."""
+        temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        temp_audio.close()
+        try:
+            encode_audio(samples, temp_audio.name, bitrate=self.bitrate, ffmpeg=self.ffmpeg)
+        except BaseException:
+            os.unlink(temp_audio.name)
+            raise
+        return temp_audio.name
+
+    def process(self, audio_path):
+        """Trim leading/trailing silence and re-encode as mono MP3.
+
+        Args:
+            audio_path (str): Path to the original audio file
+
+        Returns:
+            tuple: (path to the processed temporary file, stats dict)
+
+        Raises:
+            RuntimeError: If the audio cannot be decoded or encoded
+        """
+        samples = self.load(audio_path)
+        start, end = find_speech_bounds(
+            samples,
+            threshold_db=self.threshold_db,
+            padding_seconds=self.padding_seconds
+        )
+        if end <= start:
+            # Nothing above the threshold; keep the audio rather than upload nothing
+            start, end = 0, len(samples)
+
+        processed_path = self.save(samples[start:end])
+
+        stats = {
+            'original_seconds': round(len(samples) / SAMPLE_RATE, 2),
+            'processed_seconds': round((end - start) / SAMPLE_RATE, 2),
+            'original_bytes': os.path.getsize(audio_path),
+            'processed_bytes': os.path.getsize(processed_path)
+        }
+        return processed_path, stats
@@ -0,0 +1,153 @@
+"""Local HTTP server serving synthetic call recordings and fake job outputs.
+
+Audio is generated on the fly as 16-bit mono WAV: alternating tones that
+stand in for two speakers, separated by short silences. The URL path sets
+the duration and the query string makes each recording unique, so
+transcript caching can be exercised or avoided:
+
+    http://127.0.0.1:<port>/audio/30.wav          30 seconds
+    http://127.0.0.1:<port>/audio/30.wav?v=17     30 seconds, unique bytes
+
+The fake SarvamAI client registers job outputs here so the service can
+fetch them through its normal download-link path.
+"""
+
+import io
+import struct
+import threading
+import wave
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+SAMPLE_RATE = 8000
+
+
+@lru_cache(maxsize=32)
+def _base_audio(seconds):
+    # One second of a tone per speaker turn, then a quarter second of silence
+    index = np.arange(int(seconds * SAMPLE_RATE))
+    turn = int(1.25 * SAMPLE_RATE)
+    position = index % turn
+    frequency = np.where((index // turn) % 2 == 0, 220, 330)
+    samples = 8000 * np.sin(2 * np.pi * frequency * position / SAMPLE_RATE)
+    samples[position >= SAMPLE_RATE] = 0
+    return samples.astype('<i2').tobytes()
+
+
+def synthetic_wav(seconds, variant=''):
+    """Build a WAV recording of the given length.
+
+    Args:
+        seconds (float): Duration of the recording
+        variant (str): Any string; different variants give different bytes
+
+    Returns:
+        bytes: WAV file contents
+    """
+    frames = bytearray(_base_audio(seconds))
+    if variant and frames:
+        # Perturb the first sample so each variant hashes differently
+        frames[0:4] = struct.pack('<I', zlib.crc32(variant.encode('utf-8')))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body):
+        parts = urlsplit(self.path)
+        body, content_type = self.server.lookup(parts.path, parse_qs(parts.query))
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class AudioServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server for synthetic audio and registered outputs."""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _Handler)
+        self._outputs = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def audio_url(self, seconds, variant=None):
+        """URL of a synthetic recording."""
+        url = f'{self.base_url}/audio/{seconds:g}.wav'
+        return f'{url}?v={variant}' if variant is not None else url
+
+    def register_output(self, name, body):
+        """Serve body at /outputs/<name> and return its URL."""
+        with self._lock:
+            self._outputs[name] = body
+        return f'{self.base_url}/outputs/{name}'
+
+    def lookup(self, path, query):
+        if path.startswith('/audio/') and path.endswith('.wav'):
+            try:
+                seconds = float(path[len('/audio/'):-len('.wav')])
+            except ValueError:
+                return None, None
+            variant = query.get('v', [''])[0]
+            return synthetic_wav(seconds, variant), 'audio/wav'
+
+        if path.startswith('/outputs/'):
+            with self._lock:
+                return self._outputs.get(path[len('/outputs/'):]), 'application/json'
+
+        return None, None
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,184 @@
+"""Local stand-in for the SarvamAI speech_to_text_translate_job interface.
+
+Implements the parts of the sync SDK that TranslationService uses: job
+creation, upload, start, status polling, file results, download links and
+download_outputs. Jobs go Pending -> Running -> Completed on a wall-clock
+schedule, files fail at a configurable rate, and results are generated
+diarized transcripts (or a fixed payload).
+"""
+
+import copy
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+
+def _audio_seconds(path):
+    try:
+        with wave.open(path, 'rb') as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, EOFError, OSError):
+        return os.path.getsize(path) * 8 / 64000
+
+
+def default_payload(file_name, audio_seconds, entries_per_minute=12):
+    """Generate an STTT-shaped result with alternating speakers."""
+    count = max(1, int(audio_seconds / 60 * entries_per_minute))
+    step = audio_seconds / count if audio_seconds else 1.0
+    entries = [
+        {
+            'speaker_id': str(i % 2),
+            'transcript': f'Segment {i} of {file_name}: please share the price for 500 units.',
+            'start_time_seconds': round(i * step, 2),
+            'end_time_seconds': round((i + 1) * step, 2)
+        }
+        for i in range(count)
+    ]
+    return {
+        'language_code': 'hi-IN',
+        'transcript': ' '.join(e['transcript'] for e in entries),
+        'diarized_transcript': {'entries': entries}
+    }
+
+
+class FakeJob:
+    """One fake STTT job."""
+
+    def __init__(self, client):
+        self.client = client
+        self.job_id = f'fake-job-{next(client.ids)}'
+        self.files = {}
+        self.started_at = None
+        self.duration = 0.0
+        self.failed_files = set()
+        self.failed = False
+
+    def upload_files(self, file_paths, timeout=60):
+        time.sleep(self.client.upload_seconds)
+        for path in file_paths:
+            self.files[os.path.basename(path)] = _audio_seconds(path)
+        return True
+
+    def start(self):
+        seconds = max(self.files.values(), default=0.0)
+        self.duration = self.client.job_latency + seconds * self.client.latency_per_audio_second
+        self.failed = self.client.random.random() < self.client.job_failure_rate
+        self.failed_files = {
+            name for name in self.files
+            if self.failed or self.client.random.random() < self.client.failure_rate
+        }
+        self.started_at = time.monotonic()
+        return self.client.speech_to_text_translate_job.get_status(self.job_id)
+
+    def state(self):
+        if self.started_at is None:
+            return 'Accepted'
+        elapsed = time.monotonic() - self.started_at
+        if elapsed >= self.duration:
+            return 'Failed' if self.failed else 'Completed'
+        if elapsed >= self.client.queue_seconds:
+            return 'Running'
+        return 'Pending'
+
+    def get_file_results(self):
+        results = {'successful': [], 'failed': []}
+        for name in self.files:
+            if name in self.failed_files:
+                results['failed'].append({'file_name': name, 'status': 'Failed',
+                                          'error_message': 'Simulated processing failure'})
+            else:
+                results['successful'].append({'file_name': name, 'status': 'Success',
+                                              'output_file': f'{name}.json'})
+        return results
+
+    def result(self, file_name):
+        if self.client.payload is not None:
+            return copy.deepcopy(self.client.payload)
+        return default_payload(file_name, self.files[file_name])
+
+    def download_outputs(self, output_dir):
+        for name in self.files:
+            if name not in self.failed_files:
+                with open(os.path.join(output_dir, f'{name}.json'), 'w', encoding='utf-8') as output:
+                    json.dump(self.result(name), output)
+        return True
+
+
+class FakeJobClient:
+    """Fake of client.speech_to_text_translate_job."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def create_job(self, **kwargs):
+        time.sleep(self.client.api_call_seconds)
+        job = FakeJob(self.client)
+        with self.client.lock:
+            self.client.jobs[job.job_id] = job
+            self.client.counters['jobs'] += 1
+        return job
+
+    def get_status(self, job_id):
+        time.sleep(self.client.api_call_seconds)
+        with self.client.lock:
+            self.client.counters['status_calls'] += 1
+            job = self.client.jobs[job_id]
+        return SimpleNamespace(job_id=job_id, job_state=job.state())
+
+    def get_download_links(self, job_id, files):
+        time.sleep(self.client.api_call_seconds)
+        with self.client.lock:
+            job = self.client.jobs[job_id]
+        urls = {}
+        for output_file in files:
+            file_name = output_file[:-len('.json')]
+            body = json.dumps(job.result(file_name)).encode('utf-8')
+            if self.client.output_server is None:
+                raise RuntimeError('No output server configured')
+            url = self.client.output_server.register_output(f'{job_id}/{output_file}', body)
+            urls[output_file] = SimpleNamespace(file_url=url)
+        return SimpleNamespace(job_id=job_id, download_urls=urls)
+
+
+class FakeSarvamAI:
+    """Drop-in replacement for sarvamai.SarvamAI in benchmarks."""
+
+    def __init__(self, job_latency=2.0, latency_per_audio_second=0.0, queue_seconds=0.2,
+                 failure_rate=0.0, payload=None, upload_seconds=0.0, api_call_seconds=0.0,
+                 output_server=None, seed=0, job_failure_rate=0.0):
+        """Initialize the fake client.
+
+        Args:
+            job_latency (float): Fixed seconds from start to completion
+            latency_per_audio_second (float): Extra seconds per second of the
+                job's longest file
+            queue_seconds (float): Seconds a started job reports Pending
+            failure_rate (float): Probability that each file fails
+            payload (dict): Result returned for every file (None generates one)
+            upload_seconds (float): Simulated upload time per job
+            api_call_seconds (float): Simulated latency of each API call
+            output_server (AudioServer): Serves outputs for download links
+            seed (int): Random seed for failures
+            job_failure_rate (float): Probability that a whole job ends in
+                the Failed state, with every file failed
+        """
+        self.job_latency = job_latency
+        self.latency_per_audio_second = latency_per_audio_second
+        self.queue_seconds = queue_seconds
+        self.failure_rate = failure_rate
+        self.job_failure_rate = job_failure_rate
+        self.payload = payload
+        self.upload_seconds = upload_seconds
+        self.api_call_seconds = api_call_seconds
+        self.output_server = output_server
+        self.random = random.Random(seed)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.counters = {'jobs': 0, 'status_calls': 0}
+        self.speech_to_text_translate_job = FakeJobClient(self)
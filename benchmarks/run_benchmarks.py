@@ -0,0 +1,305 @@
+"""Offline load benchmarks for api.py.
+
+Runs the Flask API in-process against a local SarvamAI stand-in
+(fake_sarvam.py) and a local server of synthetic recordings
+(audio_server.py), then drives load scenarios and reports p50/p95/p99
+latency, throughput and peak RSS. No network access or API key is needed.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenario translate --requests 200 --concurrency 32
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --max-regression 0.2
+
+With --baseline the run exits with status 1 when any scenario's p95 latency
+rises, or its throughput falls, by more than --max-regression, so it can gate
+a deploy.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.serving import make_server
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARK_DIR)
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from audio_server import AudioServer, synthetic_wav  # noqa: E402
+from fake_sarvam import FakeSarvamAI  # noqa: E402
+
+SCENARIOS = ('translate', 'translate-file', 'batch')
+
+
+class RssSampler:
+    """Tracks the peak resident set size of this process while running."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak_bytes = self._current()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._current())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self._current())
+
+    @staticmethod
+    def _current():
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            # No /proc: fall back to the lifetime peak (kilobytes on Linux)
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def load_api(args, audio_server):
+    """Import api.py configured for benchmarking and inject the fake client."""
+    os.environ.setdefault('SARVAM_API_KEY', 'benchmark')
+    os.environ['JOB_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'benchmark_jobs.db')
+    os.environ['POLL_MIN_INTERVAL'] = str(args.poll_min_interval)
+    if not args.with_caches:
+        os.environ['TRANSCRIPT_CACHE_MAX_BYTES'] = '0'
+        os.environ['URL_CACHE_MAX_BYTES'] = '0'
+
+    import api
+
+    api.translation_service.client = FakeSarvamAI(
+        job_latency=args.job_latency,
+        latency_per_audio_second=args.latency_per_audio_second,
+        failure_rate=args.failure_rate,
+        job_failure_rate=args.job_failure_rate,
+        payload=json.load(open(args.payload)) if args.payload else None,
+        upload_seconds=args.upload_seconds,
+        api_call_seconds=args.api_call_seconds,
+        output_server=audio_server
+    )
+    return api
+
+
+def serve(app):
+    """Run a WSGI app on a background thread and return its base URL."""
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def make_requests(name, args, api_url, audio_server, session):
+    """Build the request function for a scenario.
+
+    Returns:
+        callable: Takes a request number and returns True on success
+    """
+    def variant(i):
+        return None if args.repeat_audio else f'{name}-{i}'
+
+    if name == 'translate':
+        def call(i):
+            response = session.post(f'{api_url}/translate', json={
+                'audio_url': audio_server.audio_url(args.audio_seconds, variant(i)),
+                'seller_buyer_meta_data': {'seller_identifier': str(i)}
+            })
+            return response.status_code == 200
+
+    elif name == 'translate-file':
+        def call(i):
+            audio = synthetic_wav(args.audio_seconds, variant(i) or '')
+            response = session.post(
+                f'{api_url}/translate-file',
+                files={'audio_file': (f'call-{i}.wav', audio, 'audio/wav')},
+                data={'seller_buyer_meta_data': json.dumps({'seller_identifier': str(i)})}
+            )
+            return response.status_code == 200
+
+    elif name == 'batch':
+        def call(i):
+            items = [
+                {'audio_url': audio_server.audio_url(args.audio_seconds, variant(f'{i}-{n}'))}
+                for n in range(args.batch_size)
+            ]
+            response = session.post(
+                f'{api_url}/translate/batch',
+                json={'items': items},
+                headers={'Accept': 'application/json'}
+            )
+            return response.status_code == 200 and response.json().get('failed') == 0
+
+    else:
+        raise ValueError(f'Unknown scenario: {name}')
+
+    return call
+
+
+def run_scenario(name, args, api, api_url, audio_server):
+    """Drive one scenario and return its summary."""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=args.concurrency))
+    call = make_requests(name, args, api_url, audio_server, session)
+    fake = api.translation_service.client
+
+    # Warm up connections and let the job monitor learn the fake's job latency
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(call, range(-args.warmup, 0)))
+
+    jobs_before = fake.counters['jobs']
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+
+    def timed(i):
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            ok = call(i)
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            failures += not ok
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(timed, range(args.requests)))
+        wall = time.perf_counter() - started
+
+    calls_per_request = args.batch_size if name == 'batch' else 1
+    return {
+        'scenario': name,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'failures': failures,
+        'p50_seconds': round(percentile(latencies, 0.50), 4),
+        'p95_seconds': round(percentile(latencies, 0.95), 4),
+        'p99_seconds': round(percentile(latencies, 0.99), 4),
+        'requests_per_second': round(args.requests / wall, 3),
+        'calls_per_second': round(args.requests * calls_per_request / wall, 3),
+        'sttt_jobs': fake.counters['jobs'] - jobs_before,
+        'peak_rss_mb': round(rss.peak_bytes / (1024 * 1024), 1),
+        'wall_seconds': round(wall, 3)
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Return a list of regressions against a baseline run."""
+    previous = {r['scenario']: r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result['scenario'])
+        if not old:
+            continue
+        if old['p95_seconds'] and result['p95_seconds'] > old['p95_seconds'] * (1 + max_regression):
+            regressions.append(f"{result['scenario']}: p95 {old['p95_seconds']}s -> {result['p95_seconds']}s")
+        if result['requests_per_second'] < old['requests_per_second'] * (1 - max_regression):
+            regressions.append(
+                f"{result['scenario']}: throughput {old['requests_per_second']} -> {result['requests_per_second']} req/s"
+            )
+    return regressions
+
+
+def print_table(results):
+    columns = ('scenario', 'requests', 'failures', 'p50_seconds', 'p95_seconds', 'p99_seconds',
+               'requests_per_second', 'calls_per_second', 'sttt_jobs', 'peak_rss_mb')
+    widths = [max(len(c), *(len(str(r[c])) for r in results)) for c in columns]
+    print('  '.join(c.ljust(w) for c, w in zip(columns, widths)))
+    for result in results:
+        print('  '.join(str(result[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Offline load benchmarks for the translation API')
+    parser.add_argument('--scenario', choices=SCENARIOS + ('all',), default='all')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients')
+    parser.add_argument('--warmup', type=int, default=16, help='Unmeasured requests sent before each scenario')
+    parser.add_argument('--audio-seconds', type=float, default=60, help='Length of each synthetic recording')
+    parser.add_argument('--batch-size', type=int, default=10, help='Items per /translate/batch request')
+    parser.add_argument('--repeat-audio', action='store_true', help='Reuse the same recording for every call')
+    parser.add_argument('--with-caches', action='store_true', help='Keep the transcript and URL caches enabled')
+    parser.add_argument('--job-latency', type=float, default=1.0, help='Fake STTT job latency in seconds')
+    parser.add_argument('--latency-per-audio-second', type=float, default=0.0,
+                        help='Extra fake job latency per second of audio')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Probability that a fake file fails')
+    parser.add_argument('--job-failure-rate', type=float, default=0.0,
+                        help='Probability that a whole fake job ends in the Failed state')
+    parser.add_argument('--upload-seconds', type=float, default=0.0, help='Simulated upload time per job')
+    parser.add_argument('--api-call-seconds', type=float, default=0.0, help='Simulated latency per SarvamAI API call')
+    parser.add_argument('--payload', help='JSON file returned as every job result')
+    parser.add_argument('--poll-min-interval', type=float, default=0.1, help='POLL_MIN_INTERVAL for the job monitor')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare against results JSON from an earlier run')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Allowed relative p95/throughput regression against the baseline')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    audio_server = AudioServer().start()
+    api = load_api(args, audio_server)
+    api_url, api_server = serve(api.app)
+
+    scenarios = SCENARIOS if args.scenario == 'all' else (args.scenario,)
+    results = []
+    try:
+        for name in scenarios:
+            print(f'Running {name}: {args.requests} requests, concurrency {args.concurrency}...', flush=True)
+            results.append(run_scenario(name, args, api, api_url, audio_server))
+    finally:
+        api_server.shutdown()
+        audio_server.stop()
+
+    print()
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({'args': vars(args), 'results': results}, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.max_regression)
+        if regressions:
+            print('\nRegressions:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print('\nNo regressions against baseline.')
+
+
+if __name__ == '__main__':
+    main()
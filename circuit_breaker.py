@@ -0,0 +1,198 @@
+import math
+import threading
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open.
+
+    Attributes:
+        retry_after (int): Seconds until the circuit next lets a probe through
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails calls to an unhealthy upstream fast instead of waiting on them.
+
+    The circuit starts closed. It opens after failure_threshold consecutive
+    failures, or when at least failure_rate of the last window calls failed
+    (once min_calls have been seen). While open, every call is refused with
+    CircuitOpenError. After open_seconds the circuit turns half-open and
+    lets up to half_open_max_calls probe calls through. If success_threshold
+    probes succeed, the circuit closes. A failed probe opens it again, and
+    the open period doubles each time, up to max_open_seconds.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, failure_rate=0.5, window=20, min_calls=10,
+                 open_seconds=30, max_open_seconds=300, half_open_max_calls=1, success_threshold=2):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            failure_rate (float): Failure ratio over the window that opens it
+            window (int): Number of recent calls the failure ratio covers
+            min_calls (int): Calls needed in the window before the ratio applies
+            open_seconds (float): Time the circuit stays open before probing
+            max_open_seconds (float): Longest open period after repeated
+                failed probes
+            half_open_max_calls (int): Probe calls allowed at once while half-open
+            success_threshold (int): Successful probes needed to close the circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._open_for = open_seconds
+        self._probes = 0
+        self._probe_successes = 0
+
+        self._calls = 0
+        self._failures = 0
+        self._rejected = 0
+        self._times_opened = 0
+        self._last_error = None
+
+    @property
+    def state(self):
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    def guard(self):
+        """Admit a call and record its outcome.
+
+        Returns:
+            _Call: Context manager that records a failure if its block raises
+                or calls record_failure(), and a success otherwise
+
+        Raises:
+            CircuitOpenError: If the circuit is open or has no free probe slot
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+
+            if self._state == self.OPEN:
+                self._rejected += 1
+                retry_after = max(1, math.ceil(self._opened_at + self._open_for - now))
+                raise CircuitOpenError(
+                    f"SarvamAI is unavailable after repeated failures; retry in {retry_after}s",
+                    retry_after
+                )
+
+            probe = self._state == self.HALF_OPEN
+            if probe:
+                if self._probes >= self.half_open_max_calls:
+                    self._rejected += 1
+                    raise CircuitOpenError(
+                        "SarvamAI is recovering; a probe request is already in progress",
+                        1
+                    )
+                self._probes += 1
+
+            self._calls += 1
+        return _Call(self, probe)
+
+    def stats(self):
+        """Return the circuit state and call counters."""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            recent_failures = self._outcomes.count(False)
+            return {
+                'state': self._state,
+                'calls': self._calls,
+                'failures': self._failures,
+                'rejected': self._rejected,
+                'times_opened': self._times_opened,
+                'consecutive_failures': self._consecutive_failures,
+                'recent_failure_rate': round(recent_failures / len(self._outcomes), 3) if self._outcomes else 0,
+                'open_seconds_remaining': (
+                    round(max(0.0, self._opened_at + self._open_for - now), 1)
+                    if self._state == self.OPEN else 0
+                ),
+                'last_error': self._last_error
+            }
+
+    def _refresh(self, now):
+        if self._state == self.OPEN and now >= self._opened_at + self._open_for:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+
+    def _record(self, probe, error):
+        with self._lock:
+            if probe:
+                self._probes -= 1
+
+            if error is None:
+                self._outcomes.append(True)
+                self._consecutive_failures = 0
+                if probe and self._state == self.HALF_OPEN:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.success_threshold:
+                        self._state = self.CLOSED
+                        self._open_for = self.open_seconds
+                        self._outcomes.clear()
+                return
+
+            self._failures += 1
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            self._last_error = str(error)[:200]
+
+            if probe and self._state == self.HALF_OPEN:
+                self._open(min(self.max_open_seconds, self._open_for * 2))
+            elif self._state == self.CLOSED and self._should_open():
+                self._open(self.open_seconds)
+
+    def _should_open(self):
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        if len(self._outcomes) < self.min_calls:
+            return False
+        return self._outcomes.count(False) / len(self._outcomes) >= self.failure_rate
+
+    def _open(self, open_for):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._open_for = open_for
+        self._times_opened += 1
+
+
+class _Call:
+    __slots__ = ('breaker', 'probe', 'error')
+
+    def __init__(self, breaker, probe):
+        self.breaker = breaker
+        self.probe = probe
+        self.error = None
+
+    def record_failure(self, error):
+        """Count the call as failed even though its block returns normally."""
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.breaker._record(self.probe, exc if exc is not None else self.error)
+        return False
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+
+class _Task:
+    def __init__(self, host, fn, args, kwargs):
+        self.host = host
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+
+class DownloadScheduler:
+    """Runs downloads on a bounded worker pool with per-host limits.
+
+    Each host gets at most per_host_limit downloads at a time and, when
+    per_host_rate is set, new downloads are started at no more than that
+    many per second (token bucket with a burst of per_host_limit). Workers
+    always take the oldest queued download whose host has capacity, so a
+    throttled host never blocks downloads from other hosts.
+    """
+
+    def __init__(self, max_workers=8, per_host_limit=8, per_host_rate=0, size_of=None, window_seconds=60):
+        """Initialize the scheduler.
+
+        Args:
+            max_workers (int): Downloads running at once across all hosts
+            per_host_limit (int): Downloads running at once per host
+            per_host_rate (float): New downloads started per second per host
+                (0 for no rate limit)
+            size_of (callable): Optional function returning the number of
+                bytes fetched from a download's result, used for throughput
+            window_seconds (float): Window over which throughput is measured
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.per_host_rate = per_host_rate
+        self.size_of = size_of
+        self.window_seconds = window_seconds
+
+        self._lock = threading.Condition()
+        self._queue = deque()
+        self._active = defaultdict(int)
+        self._tokens = {}
+        self._refilled_at = {}
+        self._threads = []
+
+        self._completed = 0
+        self._failed = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._recent = deque()
+
+    def submit(self, url, fn, *args, **kwargs):
+        """Queue a download.
+
+        Args:
+            url (str): URL being downloaded, used to find its host
+            fn (callable): Function performing the download
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future: Resolves to fn's return value, or raises its error
+        """
+        task = _Task(urlsplit(url).netloc, fn, args, kwargs)
+        with self._lock:
+            self._ensure_started()
+            self._queue.append(task)
+            self._lock.notify()
+        return task.future
+
+    def stats(self):
+        """Return queue depth, activity and throughput counters."""
+        with self._lock:
+            now = time.monotonic()
+            self._trim_recent(now)
+            finished = self._completed + self._failed
+            recent_bytes = sum(size for _, size in self._recent)
+            return {
+                'queue_depth': len(self._queue),
+                'active': sum(self._active.values()),
+                'active_by_host': {host: count for host, count in self._active.items() if count},
+                'max_workers': self.max_workers,
+                'completed': self._completed,
+                'failed': self._failed,
+                'avg_wait_seconds': round(self._wait_seconds / finished, 3) if finished else 0,
+                'avg_download_seconds': round(self._run_seconds / finished, 3) if finished else 0,
+                'downloads_per_second': round(len(self._recent) / self.window_seconds, 3),
+                'bytes_per_second': round(recent_bytes / self.window_seconds)
+            }
+
+    def _ensure_started(self):
+        # Started lazily so each gunicorn worker gets its own threads after fork
+        if not self._threads:
+            for _ in range(self.max_workers):
+                thread = threading.Thread(target=self._work_loop, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work_loop(self):
+        while True:
+            with self._lock:
+                task = self._next_task()
+                while task is None:
+                    self._lock.wait(self._next_token_delay())
+                    task = self._next_task()
+                self._active[task.host] += 1
+
+            started = time.monotonic()
+            result = error = None
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as e:
+                error = e
+            finished = time.monotonic()
+
+            size = 0
+            if error is None and self.size_of is not None:
+                try:
+                    size = self.size_of(result)
+                except Exception:
+                    size = 0
+
+            with self._lock:
+                self._active[task.host] -= 1
+                self._wait_seconds += started - task.queued_at
+                self._run_seconds += finished - started
+                if error is None:
+                    self._completed += 1
+                    self._recent.append((finished, size))
+                    self._trim_recent(finished)
+                else:
+                    self._failed += 1
+                self._lock.notify_all()
+
+            if error is None:
+                task.future.set_result(result)
+            else:
+                task.future.set_exception(error)
+
+    def _next_task(self):
+        # Oldest queued task whose host is under its concurrency and rate limits
+        now = time.monotonic()
+        for index, task in enumerate(self._queue):
+            if self._active[task.host] >= self.per_host_limit:
+                continue
+            if self.per_host_rate > 0 and not self._take_token(task.host, now):
+                continue
+            del self._queue[index]
+            return task
+        return None
+
+    def _take_token(self, host, now):
+        tokens = self._tokens.get(host, float(self.per_host_limit))
+        elapsed = now - self._refilled_at.get(host, now)
+        tokens = min(float(self.per_host_limit), tokens + elapsed * self.per_host_rate)
+        self._refilled_at[host] = now
+
+        if tokens < 1:
+            self._tokens[host] = tokens
+            return False
+        self._tokens[host] = tokens - 1
+        return True
+
+    def _next_token_delay(self):
+        # Wake up when a rate-limited host earns its next token
+        if self.per_host_rate <= 0:
+            return None
+        waiting = [
+            self._tokens.get(task.host, 0.0) for task in self._queue
+            if self._active[task.host] < self.per_host_limit
+        ]
+        if not waiting:
+            return None  # Every queued host is at its concurrency limit
+        return max(0.01, (1 - max(waiting)) / self.per_host_rate)
+
+    def _trim_recent(self, now):
+        while self._recent and self._recent[0][0] < now - self.window_seconds:
+            self._recent.popleft()
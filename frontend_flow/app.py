@@ -1,6 +1,10 @@
 from app import create_app
+from app.services.call_index import get_call_index
 
 app = create_app()
 
+# Build the call index for /api/aggregate in the background at startup
+get_call_index().warm()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -1,7 +1,8 @@
-import requests
 import logging
 from typing import List, Dict, Any, Optional
 
+from .services.http_pool import http_pool
+
 logger = logging.getLogger(__name__)
 
 class CompanyService:
@@ -19,7 +20,7 @@ class CompanyService:
         """
         url = self.base_url_template_1.format(user_id=user_id)
         try:
-            response = requests.get(url, timeout=10)
+            response = http_pool.get(url, endpoint='company')
             if response.status_code == 200:
                 data = response.json()
                 if "URL_DETAIL" in data and "FREESHOWROOM_ALIAS" in data["URL_DETAIL"]:
@@ -40,7 +41,7 @@ class CompanyService:
         """
         url = self.base_url_template_2.format(alias=alias)
         try:
-            response = requests.get(url, timeout=10)
+            response = http_pool.get(url, endpoint='company')
             if response.status_code == 200:
                 data = response.json()
                 return data
@@ -63,7 +64,7 @@ class CompanyService:
             url = self.gst_api_url.format(gst_number=gst_number)
             logger.info(f"🔍 Verifying GST {gst_number} with government API")
             
-            response = requests.get(url, timeout=15)
+            response = http_pool.get(url, endpoint='gst')
             if response.status_code == 200:
                 data = response.json()
                 
@@ -1,11 +1,12 @@
 import json
 import os
-import requests
 from datetime import datetime
 from flask import Blueprint, render_template, request, redirect, url_for, jsonify, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from .services.pipeline import process_call, aggregate_insights, SAMPLE_CATEGORIES
+from .services.call_index import AggregateQuery, IndexBuildingError
 from .company_service import company_service
+from .services.http_pool import http_pool
 import csv
 import time
 import queue
@@ -92,8 +93,9 @@ def upload():
                     print(f"Metadata: {json.dumps(seller_buyer_meta_data, indent=2)}")
                     print("="*80 + "\n")
                     
-                    response = requests.post(
+                    response = http_pool.post(
                         'https://imworkflow.intermesh.net/webhook/buyer-seller-insight',
+                        endpoint='webhook',
                         data=data_to_send,
                         files=files_to_send
                     )
@@ -121,8 +123,9 @@ def upload():
                 print(json.dumps(webhook_payload, indent=2))
                 print("="*80 + "\n")
                 
-                response = requests.post(
+                response = http_pool.post(
                     'https://imworkflow.intermesh.net/webhook/buyer-seller-insight',
+                    endpoint='webhook',
                     headers={'Content-Type': 'application/json'},
                     json=webhook_payload
                 )
@@ -159,8 +162,9 @@ def upload():
                 print(json.dumps(webhook_payload, indent=2))
                 print("="*80 + "\n")
                 
-                response = requests.post(
+                response = http_pool.post(
                     'https://imworkflow.intermesh.net/webhook/buyer-seller-insight',
+                    endpoint='webhook',
                     headers={'Content-Type': 'application/json'},
                     json=webhook_payload
                 )
@@ -448,4 +452,21 @@ def state_details(state_name):
 
 @bp.route('/api/aggregate')
 def api_aggregate():
-    return jsonify(aggregate_insights())
+    """Aggregated insights, optionally filtered and grouped
+
+    Query parameters: start, end (ISO date or datetime), category_name,
+    mcat_id, city, state, sentiment (repeatable) and group_by.
+    """
+    try:
+        query = AggregateQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        return jsonify(aggregate_insights(query))
+    except IndexBuildingError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+
+@bp.route('/api/http-pool')
+def api_http_pool():
+    """Connection reuse counters for outbound HTTP calls"""
+    return jsonify(http_pool.stats())
@@ -0,0 +1,335 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from .call_store import get_call_store
+from .entity_batch import SENTIMENTS
+
+
+class InsightAggregates:
+    """Running totals behind aggregate_insights().
+
+    Keeps price and quantity sums and counts per category, sentiment
+    counters per category and call counts per city, so insights() costs
+    O(categories + cities) instead of a pass over every stored call.
+
+    refresh() tails the call store from the last offset it consumed, so
+    calls written by other workers or scripts are picked up as well. If the
+    store's generation changes (it was cleared or compacted), the totals are
+    rebuilt from scratch. The totals, offset and generation are saved next
+    to the store as <store path>.aggregates.json, so a restart only reads
+    the calls written since the last save.
+    """
+
+    def __init__(self, store, snapshot_path=None, persist=True):
+        """Initialize the aggregates.
+
+        Args:
+            store (CallStore): Store the aggregates follow (None for
+                totals fed only through add() and add_batch())
+            snapshot_path (str): Snapshot file (defaults to
+                <store path>.aggregates.json)
+            persist (bool): Load and save the snapshot (False keeps the
+                totals in memory only)
+        """
+        self.store = store
+        if snapshot_path is None and store is not None:
+            snapshot_path = store.path + '.aggregates.json'
+        self.snapshot_path = snapshot_path
+        self.persist = persist and snapshot_path is not None
+        self._lock = threading.Lock()
+        self._reset(None)
+        if self.persist:
+            self._load()
+
+    def refresh(self):
+        """Fold calls stored since the last refresh into the totals.
+
+        Returns:
+            int: Number of calls added
+        """
+        with self._lock:
+            added = 0
+            rebuilt = False
+            while True:
+                generation = self.store.generation()
+                if generation != self.generation:
+                    self._reset(generation)
+                    added = 0
+                    rebuilt = True
+
+                try:
+                    for offset, record in self.store.iter_since(self.offset):
+                        self.add(record)
+                        self.offset = offset
+                        added += 1
+                except ValueError:
+                    # The store was replaced behind our back
+                    self._reset(None)
+                    continue
+
+                # Cleared or compacted while tailing: the offsets read are stale
+                if self.store.generation() == generation:
+                    break
+
+            if self.persist and (added or rebuilt):
+                self._save()
+            return added
+
+    def rebuild(self):
+        """Discard the totals and recompute them from every stored call.
+
+        Returns:
+            int: Number of calls read
+        """
+        with self._lock:
+            self._reset(None)
+        return self.refresh()
+
+    def add(self, record):
+        """Add one call record to the totals."""
+        metadata = record['metadata']
+        extracted = record['extracted']
+        self.add_totals(
+            metadata.get('category_name', 'Misc'),
+            metadata.get('city', 'Unknown'),
+            sum(extracted['prices']), len(extracted['prices']),
+            sum(extracted['quantities']), len(extracted['quantities']),
+            extracted['sentiment']
+        )
+
+    def add_totals(self, category, city, price_sum, price_count, qty_sum, qty_count, sentiment):
+        """Add one call, already reduced to its sums and counts, to the totals."""
+        totals = self.categories.get(category)
+        if totals is None:
+            totals = self.categories[category] = {
+                'price_sum': 0, 'price_count': 0, 'qty_sum': 0, 'qty_count': 0, 'sentiment': {}
+            }
+        totals['price_sum'] += price_sum
+        totals['price_count'] += price_count
+        totals['qty_sum'] += qty_sum
+        totals['qty_count'] += qty_count
+        totals['sentiment'][sentiment] = totals['sentiment'].get(sentiment, 0) + 1
+
+        self.locations[city] = self.locations.get(city, 0) + 1
+        self.total_calls += 1
+
+    def add_batch(self, batch):
+        """Add every call in an EntityBatch to the totals.
+
+        Equivalent to add() for each row, with the sums and counts reduced
+        per category and city in array form. Categories, cities and
+        sentiments are added in the order they first appear in the batch.
+        """
+        categories, category_codes = _codes(batch.categories)
+        cities, city_codes = _codes(batch.cities)
+        self.add_columns(
+            category_codes, categories, city_codes, cities, batch.sentiment_codes, SENTIMENTS,
+            batch.price_sums, batch.price_counts, batch.quantity_sums, batch.quantity_counts
+        )
+
+    def add_columns(self, category_codes, categories, city_codes, cities, sentiment_codes, sentiments,
+                    price_sums, price_counts, qty_sums, qty_counts):
+        """Add calls given as per-call columns to the totals.
+
+        Categories, cities and sentiments are passed as integer codes into
+        the value lists that follow them; the other columns hold each
+        call's sums and counts. Values are added in the order they first
+        appear, as add() would for each row in turn.
+        """
+        per_category = reduce_by(
+            category_codes, len(categories), sentiment_codes, len(sentiments),
+            price_sums, price_counts, qty_sums, qty_counts
+        )
+        city_codes = np.asarray(city_codes, dtype=np.int64)
+        city_calls = np.bincount(city_codes, minlength=len(cities))
+        per_city = {code: int(city_calls[code]) for code in _first_seen(city_codes, len(cities))}
+        self.add_reduced(per_category, categories, per_city, cities, sentiments)
+
+    def add_reduced(self, per_category, categories, per_city, cities, sentiments):
+        """Add calls already reduced per category and per city to the totals.
+
+        Args:
+            per_category (dict): Category code -> totals, as reduce_by()
+                returns them
+            categories (list): Category per code
+            per_city (dict): City code -> call count, in first-seen order
+            cities (list): City per code
+            sentiments (list): Sentiment per code
+        """
+        for code, reduced in per_category.items():
+            category = categories[code]
+            totals = self.categories.get(category)
+            if totals is None:
+                totals = self.categories[category] = {
+                    'price_sum': 0, 'price_count': 0, 'qty_sum': 0, 'qty_count': 0, 'sentiment': {}
+                }
+            for key in ('price_sum', 'price_count', 'qty_sum', 'qty_count'):
+                totals[key] += reduced[key]
+            for sentiment, calls in reduced['sentiment'].items():
+                counter = totals['sentiment']
+                counter[sentiments[sentiment]] = counter.get(sentiments[sentiment], 0) + calls
+
+        for code, calls in per_city.items():
+            self.locations[cities[code]] = self.locations.get(cities[code], 0) + calls
+            self.total_calls += calls
+
+    def insights(self):
+        """Return the insights in the shape aggregate_insights() has always returned."""
+        with self._lock:
+            categories = {
+                category: {
+                    'avg_price': mean_of(totals['price_sum'], totals['price_count']),
+                    'avg_qty': mean_of(totals['qty_sum'], totals['qty_count']),
+                    'sentiment': dict(totals['sentiment']),
+                }
+                for category, totals in self.categories.items()
+            }
+
+            # Stable sort, so tied cities keep first-seen order as before
+            top_cities = sorted(self.locations.items(), key=lambda x: x[1], reverse=True)[:5]
+
+            return {
+                'categories': categories,
+                'locations': dict(self.locations),
+                'overall': {
+                    'total_calls': self.total_calls,
+                    'cities_covered': sorted(self.locations),
+                    'top_cities': top_cities,
+                },
+            }
+
+    def to_dict(self):
+        return {
+            'generation': self.generation,
+            'offset': self.offset,
+            'total_calls': self.total_calls,
+            'categories': self.categories,
+            'locations': self.locations,
+        }
+
+    def _reset(self, generation):
+        self.generation = generation
+        self.offset = 0
+        self.total_calls = 0
+        self.categories = {}
+        self.locations = {}
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # A snapshot from an older generation is rebuilt by the next refresh
+        self.generation = snapshot.get('generation')
+        self.offset = snapshot.get('offset', 0)
+        self.total_calls = snapshot.get('total_calls', 0)
+        self.categories = snapshot.get('categories', {})
+        self.locations = snapshot.get('locations', {})
+
+    def _save(self):
+        # Unique temp name, as several workers may save at once
+        temp_path = f'{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(temp_path, self.snapshot_path)
+
+
+def mean_of(total, count):
+    """Return round(statistics.mean(values), 2) from the values' sum and count.
+
+    Like statistics.mean, a whole-number mean of integers stays an int.
+    """
+    if not count:
+        return None
+    if isinstance(total, float) and total.is_integer():
+        total = int(total)
+    if isinstance(total, int) and total % count == 0:
+        return total // count
+    return round(total / count, 2)
+
+
+def reduce_by(codes, size, sentiment_codes, sentiment_count, price_sums, price_counts, qty_sums, qty_counts):
+    """Reduce per-call columns to totals per group code.
+
+    Args:
+        codes (numpy.ndarray): Group code of each call, below size
+        size (int): Number of possible group codes
+        sentiment_codes (numpy.ndarray): Sentiment code of each call,
+            below sentiment_count
+        sentiment_count (int): Number of possible sentiment codes
+        price_sums, price_counts, qty_sums, qty_counts (numpy.ndarray):
+            Each call's price and quantity sums and counts
+
+    Returns:
+        dict: Group code -> {'calls', 'price_sum', 'price_count',
+            'qty_sum', 'qty_count', 'sentiment'} in the order the codes
+            first appear, where 'sentiment' maps sentiment codes to call
+            counts in the same order
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    calls = np.bincount(codes, minlength=size).tolist()
+    price_sum, price_count, qty_sum, qty_count = (
+        _sum_by(codes, values, size) for values in (price_sums, price_counts, qty_sums, qty_counts)
+    )
+
+    reduced = {
+        code: {
+            'calls': calls[code],
+            'price_sum': price_sum[code], 'price_count': price_count[code],
+            'qty_sum': qty_sum[code], 'qty_count': qty_count[code],
+            'sentiment': {},
+        }
+        for code in _first_seen(codes, size)
+    }
+
+    # (group, sentiment) pairs, taken in order of their first call
+    pairs = codes * sentiment_count + np.asarray(sentiment_codes, dtype=np.int64)
+    pair_calls = np.bincount(pairs, minlength=size * sentiment_count)
+    for pair in _first_seen(pairs, size * sentiment_count):
+        code, sentiment = divmod(pair, sentiment_count)
+        reduced[code]['sentiment'][sentiment] = int(pair_calls[pair])
+    return reduced
+
+
+def _sum_by(codes, values, size):
+    # Per-code sums; integer columns come back as Python ints
+    values = np.asarray(values)
+    totals = np.bincount(codes, weights=values, minlength=size)
+    if values.dtype.kind in 'biu':
+        return np.rint(totals).astype(np.int64).tolist()
+    return totals.tolist()
+
+
+def _first_seen(codes, size):
+    # Distinct codes below size in order of first appearance, in O(len(codes))
+    first = np.full(size, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+    present = np.flatnonzero(first < len(codes))
+    return present[np.argsort(first[present])].tolist()
+
+
+def _codes(values):
+    # Integer code per value, numbered in order of first appearance
+    seen = {}
+    codes = np.fromiter((seen.setdefault(v, len(seen)) for v in values), dtype=np.int64, count=len(values))
+    return list(seen), codes
+
+
+_default_aggregates = None
+_default_lock = threading.Lock()
+
+
+def get_aggregates():
+    """Return the process-wide aggregates for the default call store."""
+    global _default_aggregates
+    store = get_call_store()
+    if _default_aggregates is None or _default_aggregates.store is not store:
+        with _default_lock:
+            if _default_aggregates is None or _default_aggregates.store is not store:
+                _default_aggregates = InsightAggregates(store)
+    return _default_aggregates
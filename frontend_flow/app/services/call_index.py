@@ -0,0 +1,701 @@
+import json
+import os
+import sys
+import threading
+from array import array
+from datetime import date, datetime, time, timezone
+
+import numpy as np
+
+from .aggregates import InsightAggregates, mean_of, reduce_by
+from .call_store import get_call_store
+
+SECONDS_PER_DAY = 86400
+NO_TIMESTAMP = -1
+
+# Call fields that can be filtered and grouped on, with the default used
+# when a call's metadata lacks them (as aggregate_insights always has)
+FIELDS = {
+    'category_name': 'Misc',
+    'mcat_id': None,
+    'city': 'Unknown',
+    'state': None,
+    'sentiment': None,
+}
+
+# Interned columns: every field, plus the day of the call's timestamp.
+# Each value has a postings list of its rows; the day lists are the day
+# buckets time ranges are looked up in
+COLUMNS = tuple(FIELDS) + ('day',)
+GROUP_BY = COLUMNS
+
+# A filter whose postings lists together hold more than this share of the
+# calls is checked with a mask over its whole column instead
+POSTINGS_SHARE = 0.125
+
+# Fields with few values, whose filters match many calls each. Their
+# rollups break every value down by category and city, so filtering on
+# one of them never visits rows
+ROLLED_UP = ('sentiment', 'state')
+
+# Columns whose values are interned as they are rather than as strings
+RAW_KEYS = ('category_name', 'city', 'day')
+
+# First row of a total that has no calls yet
+NO_ROW = np.iinfo(np.int64).max
+
+# How long a query waits for a background index build before giving up
+BUILD_WAIT_SECONDS = 2.0
+
+
+class IndexBuildingError(Exception):
+    """Raised when the call index is still being built in the background."""
+
+
+class AggregateQuery:
+    """Filters and grouping for an /api/aggregate request.
+
+    Each field filter holds the values a call may have (any of them
+    matches). The time range is inclusive at both ends.
+    """
+
+    def __init__(self, start=None, end=None, group_by=None, **filters):
+        """Initialize the query.
+
+        Args:
+            start (datetime): Earliest call timestamp
+            end (datetime): Latest call timestamp
+            group_by (str): One of GROUP_BY, to break the matches down
+            **filters: Field name from FIELDS -> list of accepted values
+        """
+        unknown = set(filters) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown filter: {', '.join(sorted(unknown))}")
+        if group_by is not None and group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+        if start and end and start > end:
+            raise ValueError("start must not be after end")
+
+        self.start = start
+        self.end = end
+        self.group_by = group_by
+        self.filters = {field: [str(v) for v in values] for field, values in filters.items() if values}
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a query from request arguments.
+
+        Field filters may be repeated (?city=Pune&city=Surat). start and
+        end take an ISO date or datetime; a date-only end covers that
+        whole day.
+
+        Raises:
+            ValueError: If an argument is malformed
+        """
+        filters = {field: args.getlist(field) for field in FIELDS if args.getlist(field)}
+        return cls(
+            start=_parse_time(args.get('start'), end_of_day=False),
+            end=_parse_time(args.get('end'), end_of_day=True),
+            group_by=args.get('group_by') or None,
+            **filters
+        )
+
+    def is_empty(self):
+        return not self.filters and self.start is None and self.end is None and self.group_by is None
+
+    def to_dict(self):
+        return {
+            'start': self.start.isoformat() if self.start else None,
+            'end': self.end.isoformat() if self.end else None,
+            'group_by': self.group_by,
+            'filters': self.filters,
+        }
+
+
+class Rollup:
+    """Running totals of the indexed calls per value of one column.
+
+    Every total is a dense array indexed by value id: price and quantity
+    sums and counts and sentiment counts, and, for a detailed rollup, the
+    same broken down by category plus call counts per city. Each total
+    also keeps the first row it counted, so totals merged over several
+    values keep the order the calls were first seen in. A rollup without
+    a column has a single value that every call has.
+    """
+
+    def __init__(self, column=None, detailed=True):
+        """Initialize the rollup.
+
+        Args:
+            column (str): Column from COLUMNS whose values are totalled,
+                or None to total all calls together
+            detailed (bool): Break the totals down by category and city
+        """
+        self.column = column
+        self.detailed = detailed
+        self.sums = np.zeros((0, 1, 4))
+        self.first = np.full((0, 1), NO_ROW)
+        self.sentiment = np.zeros((0, 1, 0), dtype=np.int64)
+        self.sentiment_first = np.full((0, 1, 0), NO_ROW)
+        self.city_calls = np.zeros((0, 0), dtype=np.int64)
+        self.city_first = np.full((0, 0), NO_ROW)
+
+    def add(self, rows, codes, counts, sums):
+        """Add a batch of indexed calls.
+
+        Args:
+            rows (numpy.ndarray): Row number of each call
+            codes (dict): Column -> value id of each call
+            counts (dict): Column -> number of values interned so far
+            sums (list): Price sums and counts and quantity sums and
+                counts of each call
+        """
+        keys = codes[self.column] if self.column else np.zeros(len(rows), dtype=np.int64)
+        size = counts[self.column] if self.column else 1
+        categories = counts['category_name'] if self.detailed else 1
+        sentiments = counts['sentiment']
+
+        self.sums = _grown(self.sums, (size, categories, 4), 0)
+        self.first = _grown(self.first, (size, categories), NO_ROW)
+        self.sentiment = _grown(self.sentiment, (size, categories, sentiments), 0)
+        self.sentiment_first = _grown(self.sentiment_first, (size, categories, sentiments), NO_ROW)
+
+        cells = keys * categories + codes['category_name'] if self.detailed else keys
+        self.sums += np.stack(
+            [np.bincount(cells, weights=values, minlength=self.first.size) for values in sums], axis=-1
+        ).reshape(self.sums.shape)
+        np.minimum.at(self.first.reshape(-1), cells, rows)
+
+        pairs = cells * sentiments + codes['sentiment']
+        self.sentiment += np.bincount(pairs, minlength=self.sentiment.size).reshape(self.sentiment.shape)
+        np.minimum.at(self.sentiment_first.reshape(-1), pairs, rows)
+
+        if self.detailed:
+            cities = counts['city']
+            self.city_calls = _grown(self.city_calls, (size, cities), 0)
+            self.city_first = _grown(self.city_first, (size, cities), NO_ROW)
+            cells = keys * cities + codes['city']
+            self.city_calls += np.bincount(cells, minlength=self.city_calls.size).reshape(self.city_calls.shape)
+            np.minimum.at(self.city_first.reshape(-1), cells, rows)
+
+    def by_value(self):
+        """Totals per value id, in reduce_by()'s shape."""
+        return _reduced(self.first[:, 0], self.sums[:, 0], self.sentiment[:, 0], self.sentiment_first[:, 0])
+
+    def by_category(self, value_ids=None):
+        """Totals per category code over some values (all when None), in reduce_by()'s shape."""
+        pick = slice(None) if value_ids is None else value_ids
+        return _reduced(
+            self.first[pick].min(axis=0, initial=NO_ROW), self.sums[pick].sum(axis=0),
+            self.sentiment[pick].sum(axis=0), self.sentiment_first[pick].min(axis=0, initial=NO_ROW)
+        )
+
+    def by_city(self, value_ids=None):
+        """Call counts per city code over some values (all when None), in first-seen order."""
+        pick = slice(None) if value_ids is None else value_ids
+        calls = self.city_calls[pick].sum(axis=0)
+        first = self.city_first[pick].min(axis=0, initial=NO_ROW)
+        present = np.flatnonzero(calls)
+        order = present[np.argsort(first[present])].tolist()
+        calls = calls.tolist()
+        return {code: calls[code] for code in order}
+
+
+class CallIndex:
+    """Columnar index of stored calls for filtered aggregation queries.
+
+    Every call is reduced to one row of compact columns: timestamp, day,
+    interned field values and its price/quantity sums and counts. Each
+    field value and each day also has a postings list of its rows (the
+    day lists are the index's day buckets). A query starts from its most
+    selective postings list, checks the remaining filters on those rows
+    only, and reduces the matches with bincount, so no Python code runs
+    per matched call and the store is never read. Filters that match a
+    large share of the calls are checked with a NumPy mask over the
+    whole column instead.
+
+    Queries that filter on at most one of the ROLLED_UP fields, or that
+    match every call, skip the rows altogether: they are answered from
+    rollups, running totals kept per field value (see Rollup). Postings
+    and rollups are extended as calls are indexed, and rebuilt from the
+    columns after a restart rather than saved.
+
+    Like InsightAggregates, the index tails the call store and rebuilds
+    when the store's generation changes. Full builds run on a background
+    thread (see warm() and catch_up()) rather than inside a request. The
+    index is saved next to the store as <store path>.index every
+    save_every new calls, so a restart only reads calls stored since the
+    last save.
+    """
+
+    def __init__(self, store, snapshot_path=None, save_every=1000, persist=True):
+        """Initialize the index.
+
+        Args:
+            store (CallStore): Store the index follows
+            snapshot_path (str): Snapshot file (defaults to <store path>.index)
+            save_every (int): New calls between snapshot saves
+            persist (bool): Load and save the snapshot
+        """
+        self.store = store
+        self.snapshot_path = snapshot_path or store.path + '.index'
+        self.save_every = save_every
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._builder_lock = threading.Lock()
+        self._builder = None
+        self._unsaved = 0
+        self._reset(None)
+        if persist:
+            self._load()
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def refresh(self):
+        """Index calls stored since the last refresh.
+
+        Returns:
+            int: Number of calls added
+        """
+        with self._lock:
+            added = 0
+            rebuilt = False
+            while True:
+                generation = self.store.generation()
+                if generation != self.generation:
+                    self._reset(generation)
+                    added = 0
+                    rebuilt = True
+
+                try:
+                    for offset, record in self.store.iter_since(self.offset):
+                        self._add(record)
+                        self.offset = offset
+                        added += 1
+                except ValueError:
+                    # The store was replaced behind our back
+                    self._reset(None)
+                    continue
+
+                if self.store.generation() == generation:
+                    break
+
+            self._extend()
+            self._unsaved += added
+            if self.persist and (rebuilt or self._unsaved >= self.save_every):
+                self._save()
+            return added
+
+    def warm(self):
+        """Start bringing the index up to date on a background thread.
+
+        Returns:
+            threading.Thread: The build thread (the running one if a build
+                is already under way)
+        """
+        with self._builder_lock:
+            if self._builder is None or not self._builder.is_alive():
+                self._builder = threading.Thread(target=self.refresh, name='call-index-build', daemon=True)
+                self._builder.start()
+            return self._builder
+
+    def catch_up(self, timeout=BUILD_WAIT_SECONDS):
+        """Tail new calls, leaving any full build to a background thread.
+
+        A full build is needed on first use without a snapshot and after
+        the store was cleared or compacted. It runs through warm(), and
+        this waits up to timeout seconds for it.
+
+        Returns:
+            bool: True if the index is up to date, False while it is
+                still being built
+        """
+        builder = self._builder
+        if builder is None or not builder.is_alive():
+            if self.generation == self.store.generation():
+                self.refresh()
+                return True
+            builder = self.warm()
+        builder.join(timeout)
+        return not builder.is_alive()
+
+    def query(self, query):
+        """Aggregate the calls matching a query.
+
+        Args:
+            query (AggregateQuery): Filters and grouping
+
+        Returns:
+            dict: The aggregate_insights() shape for the matching calls,
+                plus 'query' and, when grouping, 'groups'
+        """
+        with self._lock:
+            totals, matched, sentiment_values, names, reduced = self._aggregate(query)
+
+        result = totals.insights()
+        result['query'] = dict(query.to_dict(), matched_calls=matched)
+        if query.group_by is not None:
+            groups = {}
+            for code, group_totals in reduced.items():
+                group = groups.setdefault(names[code], {
+                    'calls': 0, 'price_sum': 0, 'price_count': 0, 'qty_sum': 0, 'qty_count': 0, 'sentiment': {}
+                })
+                for key in ('calls', 'price_sum', 'price_count', 'qty_sum', 'qty_count'):
+                    group[key] += group_totals[key]
+                for sentiment, calls in group_totals['sentiment'].items():
+                    name = sentiment_values[sentiment]
+                    group['sentiment'][name] = group['sentiment'].get(name, 0) + calls
+
+            keys = sorted(groups) if query.group_by == 'day' else groups
+            result['groups'] = {
+                key: {
+                    'total_calls': groups[key]['calls'],
+                    'avg_price': mean_of(groups[key]['price_sum'], groups[key]['price_count']),
+                    'avg_qty': mean_of(groups[key]['qty_sum'], groups[key]['qty_count']),
+                    'sentiment': groups[key]['sentiment'],
+                }
+                for key in keys
+            }
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': len(self._timestamps),
+                'days': sum(day is not None for day in self._values['day']),
+                'distinct': {field: len(self._values[field]) for field in FIELDS},
+                'snapshot': self.snapshot_path if self.persist else None,
+                'building': self._builder is not None and self._builder.is_alive(),
+            }
+
+    def _aggregate(self, query):
+        # Reduce the matching calls. Runs under the lock: the column views
+        # must not outlive it, or the next append to a column would fail
+        self._extend()
+        sentiment_values = list(self._values['sentiment'])
+        totals = InsightAggregates(None, persist=False)
+
+        # Filters on at most one rolled-up field are answered from its rollup
+        filtered = list(query.filters)
+        rollup = value_ids = rows = None
+        if query.start is None and query.end is None:
+            if not filtered:
+                rollup = self._rollups[None]
+            elif len(filtered) == 1 and filtered[0] in ROLLED_UP:
+                rollup = self._rollups[filtered[0]]
+                ids = self._ids[filtered[0]]
+                value_ids = [ids[v] for v in query.filters[filtered[0]] if v in ids]
+        if rollup is None:
+            rows = self._match(query)
+            if rows is not None and len(rows) == len(self._timestamps):
+                rollup, rows = self._rollups[None], None
+
+        if rollup is not None:
+            totals.add_reduced(
+                rollup.by_category(value_ids), self._values['category_name'],
+                rollup.by_city(value_ids), self._values['city'], sentiment_values
+            )
+            if query.group_by is None:
+                return totals, totals.total_calls, sentiment_values, None, None
+            if rollup.column is None:
+                # Every call matches, so the groups are kept as they are
+                reduced = self._group_rollups[query.group_by].by_value()
+                return totals, totals.total_calls, sentiment_values, self._group_names(query.group_by), reduced
+            rows = self._match(query)
+
+        def column(data):
+            view = np.frombuffer(data, dtype=data.typecode)
+            return view if rows is None else view[rows]
+
+        sentiments = column(self._columns['sentiment'])
+        sums = [column(data) for data in (self._price_sums, self._price_counts, self._qty_sums, self._qty_counts)]
+        if rollup is None:
+            totals.add_columns(
+                column(self._columns['category_name']), self._values['category_name'],
+                column(self._columns['city']), self._values['city'],
+                sentiments, sentiment_values, *sums
+            )
+
+        names = reduced = None
+        if query.group_by is not None:
+            names = self._group_names(query.group_by)
+            reduced = reduce_by(
+                column(self._columns[query.group_by]), len(names),
+                sentiments, len(sentiment_values), *sums
+            )
+        return totals, len(sentiments), sentiment_values, names, reduced
+
+    def _group_names(self, group_by):
+        if group_by == 'day':
+            return ['Unknown' if day is None else date.fromordinal(day).isoformat() for day in self._values['day']]
+        return ['Unknown' if value is None else value for value in self._values[group_by]]
+
+    def _match(self, query):
+        # Matching row numbers in ascending order, or None when every row matches
+        checks = []
+        for field, wanted in query.filters.items():
+            ids = [self._ids[field][v] for v in wanted if v in self._ids[field]]
+            if not ids:
+                return np.empty(0, dtype=np.intp)
+            checks.append((field, ids))
+
+        timed = query.start is not None or query.end is not None
+        if timed:
+            # The day buckets the range touches. Their rows' timestamps are
+            # checked below only when the range starts or ends within a day
+            first = query.start.toordinal() if query.start is not None else -1
+            last = query.end.toordinal() if query.end is not None else sys.maxsize
+            ids = [i for i, day in enumerate(self._values['day']) if day is not None and first <= day <= last]
+            if not ids:
+                return np.empty(0, dtype=np.intp)
+            checks.append(('day', ids))
+            timed = (query.start is not None and _seconds(query.start) % SECONDS_PER_DAY != 0
+                     or query.end is not None and _seconds(query.end) % SECONDS_PER_DAY != SECONDS_PER_DAY - 1)
+
+        if not checks:
+            return None
+
+        # Start from the most selective postings, unless even that matches
+        # so many calls that scanning the whole column is cheaper
+        sizes = [sum(len(self._postings[column][i]) for i in ids) for column, ids in checks]
+        column, ids = checks.pop(sizes.index(min(sizes)))
+        lists = [np.frombuffer(self._postings[column][i], dtype=np.uint32) for i in ids]
+        if len(lists) == 1:
+            rows = lists[0]
+        elif min(sizes) <= len(self._timestamps) * POSTINGS_SHARE:
+            rows = np.sort(np.concatenate(lists))
+        else:
+            rows = None
+            checks.append((column, ids))
+
+        for column, ids in checks:
+            if column == 'day':
+                # Cheaper checked on the timestamps below
+                timed = True
+                continue
+            values = np.frombuffer(self._columns[column], dtype=np.uint32)
+            hit = np.isin(values if rows is None else values[rows], ids)
+            rows = np.flatnonzero(hit) if rows is None else rows[hit]
+
+        if timed:
+            timestamps = np.frombuffer(self._timestamps, dtype=self._timestamps.typecode)
+            if rows is not None:
+                timestamps = timestamps[rows]
+            hit = timestamps != NO_TIMESTAMP
+            if query.start is not None:
+                hit &= timestamps >= _seconds(query.start)
+            if query.end is not None:
+                hit &= timestamps <= _seconds(query.end)
+            rows = np.flatnonzero(hit) if rows is None else rows[hit]
+        return rows
+
+    def _extend(self):
+        # Add the rows indexed since the last call to the postings lists and
+        # rollups. A stable argsort of each column's new codes groups the
+        # rows of every value, still in row order
+        start, end = self._posted, len(self._timestamps)
+        if start == end:
+            return
+
+        codes = {}
+        for column in COLUMNS:
+            postings = self._postings[column]
+            postings.extend(array('I') for _ in range(len(self._values[column]) - len(postings)))
+            codes[column] = np.frombuffer(self._columns[column], dtype=np.uint32)[start:end].astype(np.int64)
+            counts = np.bincount(codes[column], minlength=len(postings))
+            order = np.argsort(codes[column], kind='stable').astype(np.uint32) + np.uint32(start)
+            bounds = np.cumsum(counts).tolist()
+            for value_id in np.flatnonzero(counts).tolist():
+                postings[value_id].frombytes(order[bounds[value_id] - counts[value_id]:bounds[value_id]].tobytes())
+
+        rows = np.arange(start, end)
+        counts = {column: len(self._values[column]) for column in COLUMNS}
+        sums = [
+            np.frombuffer(data, dtype=data.typecode)[start:end]
+            for data in (self._price_sums, self._price_counts, self._qty_sums, self._qty_counts)
+        ]
+        for rollup in list(self._rollups.values()) + list(self._group_rollups.values()):
+            rollup.add(rows, codes, counts, sums)
+        self._posted = end
+
+    def _add(self, record):
+        metadata = record.get('metadata') or {}
+        extracted = record['extracted']
+        seconds = _record_seconds(record)
+
+        for column in COLUMNS:
+            if column == 'sentiment':
+                value = extracted.get('sentiment')
+            elif column == 'day':
+                value = None if seconds == NO_TIMESTAMP else seconds // SECONDS_PER_DAY
+            else:
+                value = metadata.get(column, FIELDS[column])
+            # Categories and cities keep their type-less legacy keys and days
+            # are ordinals; other ids are strings
+            if value is not None and column not in RAW_KEYS:
+                value = str(value)
+            value_id = self._ids[column].get(value)
+            if value_id is None:
+                value_id = self._ids[column][value] = len(self._values[column])
+                self._values[column].append(value)
+            self._columns[column].append(value_id)
+
+        self._timestamps.append(seconds)
+        self._price_sums.append(sum(extracted['prices']))
+        self._price_counts.append(len(extracted['prices']))
+        self._qty_sums.append(sum(extracted['quantities']))
+        self._qty_counts.append(len(extracted['quantities']))
+
+    def _reset(self, generation):
+        self.generation = generation
+        self.offset = 0
+        self._timestamps = array('q')
+        self._price_sums = array('d')
+        self._price_counts = array('I')
+        self._qty_sums = array('d')
+        self._qty_counts = array('I')
+        self._columns = {column: array('I') for column in COLUMNS}
+        self._values = {column: [] for column in COLUMNS}
+        self._ids = {column: {} for column in COLUMNS}
+        # Postings lists by column and value id, and the rollups, covering
+        # the first _posted rows. Neither is saved: both are rebuilt from
+        # the columns
+        self._postings = {column: [] for column in COLUMNS}
+        self._rollups = {column: Rollup(column) for column in (None,) + ROLLED_UP}
+        self._group_rollups = {column: Rollup(column, detailed=False) for column in GROUP_BY}
+        self._posted = 0
+
+    def _arrays(self):
+        # Every array in snapshot order
+        arrays = [
+            ('timestamps', self._timestamps), ('price_sums', self._price_sums),
+            ('price_counts', self._price_counts), ('qty_sums', self._qty_sums),
+            ('qty_counts', self._qty_counts),
+        ]
+        arrays += [(f'column:{column}', self._columns[column]) for column in COLUMNS]
+        return arrays
+
+    def _save(self):
+        # A JSON header line, then the raw bytes of every array in order
+        arrays = self._arrays()
+        header = {
+            'generation': self.generation,
+            'offset': self.offset,
+            'byteorder': sys.byteorder,
+            'values': self._values,
+            'arrays': [[name, data.typecode, len(data)] for name, data in arrays],
+        }
+        temp_path = f'{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            for _, data in arrays:
+                data.tofile(f)
+        os.replace(temp_path, self.snapshot_path)
+        self._unsaved = 0
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('byteorder') != sys.byteorder:
+                    return
+                loaded = {}
+                for name, typecode, length in header['arrays']:
+                    data = array(typecode)
+                    data.fromfile(f, length)
+                    loaded[name] = data
+            # Snapshots from before the day column are rebuilt
+            values = {column: header['values'][column] for column in COLUMNS}
+            columns = {column: loaded[f'column:{column}'] for column in COLUMNS}
+        except (OSError, ValueError, EOFError, KeyError, TypeError):
+            return
+
+        self._reset(header['generation'])
+        self.offset = header['offset']
+        self._timestamps = loaded['timestamps']
+        self._price_sums = loaded['price_sums']
+        self._price_counts = loaded['price_counts']
+        self._qty_sums = loaded['qty_sums']
+        self._qty_counts = loaded['qty_counts']
+        self._columns = columns
+        self._values = values
+        self._ids = {column: {value: i for i, value in enumerate(values[column])} for column in COLUMNS}
+
+
+def _parse_time(value, end_of_day):
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            day = date.fromisoformat(value)
+            return datetime.combine(day, time.max if end_of_day else time.min)
+        return _naive(datetime.fromisoformat(value))
+    except ValueError:
+        raise ValueError(f"Invalid date or datetime: {value}") from None
+
+
+def _naive(moment):
+    # Aware timestamps are compared in UTC; naive ones are taken as they are
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _seconds(moment):
+    return moment.toordinal() * SECONDS_PER_DAY + moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+def _record_seconds(record):
+    # The call's own timestamp, else when it was processed
+    value = (record.get('metadata') or {}).get('timestamp') or record.get('processed_at')
+    if not isinstance(value, str):
+        return NO_TIMESTAMP
+    try:
+        return _seconds(_naive(datetime.fromisoformat(value)))
+    except ValueError:
+        return NO_TIMESTAMP
+
+
+def _grown(data, shape, fill):
+    # The array padded with fill up to shape; shapes only ever grow
+    if data.shape == shape:
+        return data
+    grown = np.full(shape, fill, dtype=data.dtype)
+    grown[tuple(slice(0, n) for n in data.shape)] = data
+    return grown
+
+
+def _reduced(first, sums, sentiment, sentiment_first):
+    # reduce_by()'s shape from dense totals per code, in order of first row
+    calls = sentiment.sum(axis=1)
+    present = np.flatnonzero(calls)
+    order = present[np.argsort(first[present])].tolist()
+    sentiment_order = np.argsort(sentiment_first, axis=1).tolist()
+    calls, sums, sentiment = calls.tolist(), sums.tolist(), sentiment.tolist()
+
+    reduced = {}
+    for code in order:
+        price_sum, price_count, qty_sum, qty_count = sums[code]
+        reduced[code] = {
+            'calls': calls[code],
+            'price_sum': price_sum, 'price_count': round(price_count),
+            'qty_sum': qty_sum, 'qty_count': round(qty_count),
+            'sentiment': {s: sentiment[code][s] for s in sentiment_order[code] if sentiment[code][s]},
+        }
+    return reduced
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_call_index():
+    """Return the process-wide index of the default call store."""
+    global _default_index
+    store = get_call_store()
+    if _default_index is None or _default_index.store is not store:
+        with _default_lock:
+            if _default_index is None or _default_index.store is not store:
+                _default_index = CallIndex(store)
+    return _default_index
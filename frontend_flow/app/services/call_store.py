@@ -0,0 +1,411 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking falls back to this process only
+    fcntl = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
+LEGACY_FILE = os.path.join(DATA_DIR, 'sample_calls.json')
+
+
+class _FileLock:
+    """Exclusive lock shared by threads in this process and by other processes.
+
+    Uses flock on a side file where available, so gunicorn workers and
+    scripts such as seed_data.py never interleave writes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+        return False
+
+
+class CallStore:
+    """Append-only store of processed call records.
+
+    Backends keep inserts O(1) no matter how many calls are stored, and
+    serialise writers across threads and processes.
+    """
+
+    backend = None
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = _FileLock(path + '.lock')
+
+    def append(self, record):
+        """Store one call record."""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Store several call records in one write."""
+        raise NotImplementedError
+
+    def __iter__(self):
+        """Yield every stored record in insertion order."""
+        for _, record in self.iter_since(0):
+            yield record
+
+    def iter_since(self, offset):
+        """Yield records stored after an offset, for tailing the store.
+
+        Args:
+            offset (int): 0, or an offset previously yielded by this method
+
+        Yields:
+            tuple: (offset after the record, record)
+
+        Raises:
+            ValueError: If the offset lies beyond the end of the store, e.g.
+                because the store file was deleted and recreated
+        """
+        raise NotImplementedError
+
+    def generation(self):
+        """Return a number that changes whenever stored records are removed
+        or rewritten, which invalidates offsets from iter_since()."""
+        raise NotImplementedError
+
+    def count(self):
+        """Return the number of stored records."""
+        return sum(1 for _ in self)
+
+    def clear(self):
+        """Remove every stored record."""
+        raise NotImplementedError
+
+    def compact(self):
+        """Reclaim space and drop damaged data left by crashed writers."""
+        raise NotImplementedError
+
+    def stats(self):
+        return {
+            'backend': self.backend,
+            'path': self.path,
+            'size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+
+
+class JsonlCallStore(CallStore):
+    """Calls stored one JSON document per line.
+
+    An insert appends one line under the lock. A writer that crashes
+    mid-line leaves a torn tail, which the next append terminates so the
+    new record stays intact. Reads skip lines that do not parse.
+    compact() rewrites the log without them. It runs automatically after
+    an append once a read has found damaged lines.
+    """
+
+    backend = 'jsonl'
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._damaged_lines = 0
+        self._generation_path = path + '.generation'
+
+    def append_many(self, records):
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        if not lines:
+            return
+
+        with self.lock:
+            with open(self.path, 'a+b') as f:
+                # Terminate a torn line left by a crashed writer
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(lines.encode('utf-8'))
+                f.flush()
+
+            if self._damaged_lines:
+                self.compact()
+
+    def iter_since(self, offset):
+        if not os.path.exists(self.path):
+            if offset:
+                raise ValueError(f"Offset {offset} is past the end of {self.path}")
+            return
+
+        damaged = 0
+        with open(self.path, 'rb') as f:
+            if offset > f.seek(0, os.SEEK_END):
+                raise ValueError(f"Offset {offset} is past the end of {self.path}")
+            f.seek(offset)
+            for line in f:
+                # A line without its newline is still being written (or torn)
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    damaged += 1
+                    continue
+                yield offset, record
+        self._damaged_lines += damaged
+
+    def generation(self):
+        try:
+            with open(self._generation_path, 'r', encoding='utf-8') as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def clear(self):
+        with self.lock:
+            temp_path = self.path + '.clear'
+            with open(temp_path, 'w', encoding='utf-8'):
+                pass
+            os.replace(temp_path, self.path)
+            self._bump_generation()
+            self._damaged_lines = 0
+
+    def compact(self):
+        """Rewrite the log without torn or corrupt lines.
+
+        Returns:
+            int: Number of lines dropped
+        """
+        with self.lock:
+            if not os.path.exists(self.path):
+                return 0
+
+            dropped = 0
+            temp_path = self.path + '.compact'
+            # Binary, so a torn multi-byte character only loses its own line
+            with open(self.path, 'rb') as source, open(temp_path, 'wb') as target:
+                for line in source:
+                    if not line.strip():
+                        continue
+                    try:
+                        json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        dropped += 1
+                        continue
+                    target.write(line if line.endswith(b'\n') else line + b'\n')
+                target.flush()
+                os.fsync(target.fileno())
+
+            os.replace(temp_path, self.path)
+            self._bump_generation()
+            self._damaged_lines = 0
+            return dropped
+
+    def _bump_generation(self):
+        # Called under the lock whenever line offsets change
+        temp_path = self._generation_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(str(self.generation() + 1))
+        os.replace(temp_path, self._generation_path)
+
+
+class SqliteCallStore(CallStore):
+    """Calls stored as rows of an embedded SQLite database in WAL mode.
+
+    SQLite serialises writers itself. The write-ahead log is checkpointed
+    and truncated every checkpoint_every inserts, and compact() also
+    vacuums the database file.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path, checkpoint_every=1000):
+        super().__init__(path)
+        self.checkpoint_every = checkpoint_every
+        self._inserts = 0
+        self._inserts_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    record TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def append_many(self, records):
+        rows = [(time.time(), json.dumps(record, ensure_ascii=False)) for record in records]
+        if not rows:
+            return
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany('INSERT INTO calls (created_at, record) VALUES (?, ?)', rows)
+        finally:
+            conn.close()
+
+        with self._inserts_lock:
+            self._inserts += len(rows)
+            checkpoint = self._inserts >= self.checkpoint_every
+            if checkpoint:
+                self._inserts = 0
+        if checkpoint:
+            self._checkpoint()
+
+    def iter_since(self, offset):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'calls'").fetchone()
+            if offset > (row[0] if row else 0):
+                raise ValueError(f"Offset {offset} is past the last row of {self.path}")
+            for row_id, record in conn.execute('SELECT id, record FROM calls WHERE id > ? ORDER BY id', (offset,)):
+                yield row_id, json.loads(record)
+        finally:
+            conn.close()
+
+    def generation(self):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+
+    def count(self):
+        conn = self._connect()
+        try:
+            return conn.execute('SELECT COUNT(*) FROM calls').fetchone()[0]
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM calls')
+                conn.execute('''
+                    INSERT INTO meta (key, value) VALUES ('generation', 1)
+                    ON CONFLICT (key) DO UPDATE SET value = value + 1
+                ''')
+        finally:
+            conn.close()
+
+    def compact(self):
+        """Checkpoint the write-ahead log and vacuum the database.
+
+        Returns:
+            int: Always 0; SQLite never keeps damaged rows
+        """
+        conn = self._connect()
+        try:
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+        self._checkpoint()
+        return 0
+
+    def _checkpoint(self):
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            conn.close()
+
+
+def migrate_legacy_json(store, legacy_path=LEGACY_FILE):
+    """Import calls from the old sample_calls.json array, once per store.
+
+    The file is left in place, since it is tracked in git. A marker file
+    next to the store, <store path>.migrated, records the import so later
+    starts skip it; so does a <legacy path>.migrated left by versions that
+    renamed the file instead. The store's lock keeps concurrent workers
+    from importing it twice.
+
+    Args:
+        store (CallStore): Destination store
+        legacy_path (str): Path of the JSON array file
+
+    Returns:
+        int: Number of calls imported
+    """
+    marker = store.path + '.migrated'
+    with store.lock:
+        if os.path.exists(marker) or not os.path.exists(legacy_path):
+            return 0
+
+        calls = []
+        if not os.path.exists(legacy_path + '.migrated'):
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                try:
+                    calls = json.load(f)
+                except json.JSONDecodeError:
+                    calls = []
+            store.append_many(calls)
+
+        with open(marker, 'w', encoding='utf-8') as f:
+            json.dump({'legacy_path': os.path.abspath(legacy_path), 'calls': len(calls), 'migrated_at': time.time()}, f)
+        return len(calls)
+
+
+def create_call_store(backend='jsonl', path=None):
+    """Build a call store.
+
+    Args:
+        backend (str): 'jsonl' or 'sqlite'
+        path (str): Store file (defaults to data/calls.jsonl or data/calls.db)
+
+    Returns:
+        CallStore: The store
+    """
+    if backend == 'jsonl':
+        return JsonlCallStore(path or os.path.join(DATA_DIR, 'calls.jsonl'))
+    if backend == 'sqlite':
+        return SqliteCallStore(path or os.path.join(DATA_DIR, 'calls.db'))
+    raise ValueError(f"Unknown call store backend: {backend}")
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_call_store():
+    """Return the process-wide call store, migrating sample_calls.json on first use."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                store = create_call_store(
+                    os.getenv('CALL_STORE_BACKEND', 'jsonl'),
+                    os.getenv('CALL_STORE_PATH') or None
+                )
+                migrate_legacy_json(store)
+                _default_store = store
+    return _default_store
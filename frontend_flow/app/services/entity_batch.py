@@ -0,0 +1,322 @@
+import re
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+SENTIMENTS = ('negative', 'neutral', 'positive')
+
+# Separates transcripts in the joined batch text. It is not a word, space or
+# digit character, so to every pattern it looks like the start or end of a
+# string, and no match can run across it.
+SEPARATOR = '\x00'
+PADDING = 16
+
+# Spec kinds, in SPEC_PATTERNS order; quantities use 'pieces' as well
+MM, KG, METERS, UNITS, GRADE, PIECES = range(6)
+
+# Character classes and case-insensitive letters, tested with re itself so
+# the scan below agrees with the patterns on every character
+_WORD = re.compile(r'\w')
+_SPACE = re.compile(r'\s')
+_DIGIT = re.compile(r'\d')
+_GRADE_LETTER = re.compile(r'(?i)[A-D]')
+_LETTERS = {letter: re.compile('(?i)' + letter) for letter in 'acdegikmnprstu'}
+
+
+@lru_cache(maxsize=None)
+def _char_class(code):
+    ch = chr(code)
+    folded = next((ord(letter) for letter, pattern in _LETTERS.items() if pattern.fullmatch(ch)), 0)
+    return (
+        folded,
+        _WORD.fullmatch(ch) is not None,
+        _SPACE.fullmatch(ch) is not None,
+        int(ch) if _DIGIT.fullmatch(ch) else -1,
+        _GRADE_LETTER.fullmatch(ch) is not None,
+    )
+
+
+_ASCII = [_char_class(code) for code in range(128)]
+_ASCII_FOLDED = np.array([c[0] for c in _ASCII], dtype=np.uint8)
+_ASCII_WORD = np.array([c[1] for c in _ASCII], dtype=bool)
+_ASCII_SPACE = np.array([c[2] for c in _ASCII], dtype=bool)
+_ASCII_DIGIT = np.array([c[3] for c in _ASCII], dtype=np.int8)
+_ASCII_GRADE = np.array([c[4] for c in _ASCII], dtype=bool)
+
+
+class EntityBatch:
+    """Entities extracted from many transcripts, stored as columns.
+
+    Prices, quantities and specs are flat arrays with offsets: the prices of
+    transcript i are prices[price_offsets[i]:price_offsets[i + 1]], and so
+    on. positive and negative hold each transcript's sentiment word counts.
+    categories and cities come from the metadata passed to
+    extract_entities_batch(), with the same defaults aggregate_insights()
+    uses. row(i) returns transcript i exactly as extract_entities() would.
+
+    The derived columns (sentiment codes, sums and counts) are computed on
+    first access and kept, so iterating the rows stays O(n).
+    """
+
+    def __init__(self, prices, price_offsets, quantities, quantity_offsets,
+                 specs, spec_offsets, positive, negative, categories, cities):
+        self.prices = prices
+        self.price_offsets = price_offsets
+        self.quantities = quantities
+        self.quantity_offsets = quantity_offsets
+        self.specs = specs
+        self.spec_offsets = spec_offsets
+        self.positive = positive
+        self.negative = negative
+        self.categories = categories
+        self.cities = cities
+
+    def __len__(self):
+        return len(self.positive)
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    @cached_property
+    def sentiment_codes(self):
+        """Index into SENTIMENTS for every transcript."""
+        return (np.sign(self.positive.astype(np.int64) - self.negative) + 1).astype(np.int8)
+
+    @cached_property
+    def price_counts(self):
+        return np.diff(self.price_offsets)
+
+    @cached_property
+    def price_sums(self):
+        return _segment_sums(self.prices, self.price_offsets)
+
+    @cached_property
+    def quantity_counts(self):
+        return np.diff(self.quantity_offsets)
+
+    @cached_property
+    def quantity_sums(self):
+        return _segment_sums(self.quantities, self.quantity_offsets)
+
+    def row(self, i):
+        """Return transcript i's entities in the extract_entities() format."""
+        specs = self.specs[self.spec_offsets[i]:self.spec_offsets[i + 1]]
+        return {
+            'specs': list(set(specs)),
+            'prices': self.prices[self.price_offsets[i]:self.price_offsets[i + 1]].tolist(),
+            'quantities': self.quantities[self.quantity_offsets[i]:self.quantity_offsets[i + 1]].tolist(),
+            'sentiment': SENTIMENTS[self.sentiment_codes[i]],
+        }
+
+
+def scan_batch(transcripts, positive_words, negative_words):
+    """Extract the entities of many transcripts at once.
+
+    The transcripts are joined into one text and converted to an array of
+    code points. Matches of SPEC_PATTERNS, PRICE_PATTERN and QTY_PATTERN
+    are then found with array operations, anchored on digit runs, price
+    keywords and the word 'grade', instead of running a regex per
+    transcript. Only the matches themselves are handled one by one.
+
+    Args:
+        transcripts (list): Transcript strings
+        positive_words (list): Sentiment words counted as positive
+        negative_words (list): Sentiment words counted as negative
+
+    Returns:
+        tuple: (prices, price_offsets, quantities, quantity_offsets, specs,
+            spec_offsets, positive, negative)
+    """
+    count = len(transcripts)
+    lengths = np.fromiter(map(len, transcripts), dtype=np.int64, count=count)
+    row_starts = np.empty(count + 1, dtype=np.int64)
+    row_starts[0] = 1
+    np.cumsum(lengths + 1, out=row_starts[1:])
+    row_starts[1:] += 1
+
+    text = SEPARATOR + SEPARATOR.join(transcripts) + SEPARATOR * PADDING
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    folded, word, space, digit, grade_letter = _classify(codes)
+    is_digit = digit >= 0
+
+    # Digit runs: the text starts and ends with separators, so edges pair up
+    edges = np.diff(is_digit.view(np.int8))
+    run_starts = np.flatnonzero(edges == 1) + 1
+    run_ends = np.flatnonzero(edges == -1) + 1
+
+    def at(positions, literal):
+        found = np.ones(len(positions), dtype=bool)
+        for offset, ch in enumerate(literal):
+            found &= folded[positions + offset] == ord(ch)
+        return found
+
+    def unit(positions, literals):
+        # First literal followed by a word boundary, as 'meters?' tries 'meters' first
+        end = np.full(len(positions), -1, dtype=np.int64)
+        for literal in literals:
+            stop = positions + len(literal)
+            hit = (end < 0) & at(positions, literal) & ~word[stop]
+            end[hit] = stop[hit]
+        return end
+
+    # Numbers followed by a unit: \b(\d+)\s?(mm|kg|meters?|units?|pieces?)\b
+    starts = run_starts[~word[run_starts - 1]]
+    ends = run_ends[~word[run_starts - 1]]
+    after = ends + space[ends]
+    unit_end = np.full(len(starts), -1, dtype=np.int64)
+    unit_kind = np.full(len(starts), -1, dtype=np.int8)
+    for kind, literals in ((MM, ('mm',)), (KG, ('kg',)), (METERS, ('meters', 'meter')),
+                           (UNITS, ('units', 'unit')), (PIECES, ('pieces', 'piece'))):
+        end = unit(after, literals)
+        hit = (unit_kind < 0) & (end >= 0)
+        unit_end[hit] = end[hit]
+        unit_kind[hit] = kind
+    has_unit = unit_kind >= 0
+    starts, ends, unit_end, unit_kind = starts[has_unit], ends[has_unit], unit_end[has_unit], unit_kind[has_unit]
+
+    is_quantity = (unit_kind != MM) & (ends - starts <= 5)
+    quantity_at = starts[is_quantity]
+    quantities = _numbers(digit, quantity_at, ends[is_quantity] - quantity_at)
+
+    is_spec = unit_kind != PIECES
+    spec_at = [starts[is_spec]]
+    spec_end = [unit_end[is_spec]]
+    spec_kind = [unit_kind[is_spec]]
+
+    # \b(grade\s?[A-D])\b
+    grade_at = np.flatnonzero(folded == ord('g'))
+    grade_at = grade_at[at(grade_at, 'grade') & ~word[grade_at - 1]]
+    letter = grade_at + 5 + space[grade_at + 5]
+    ok = grade_letter[letter] & ~word[letter + 1]
+    spec_at.append(grade_at[ok])
+    spec_end.append(letter[ok] + 1)
+    spec_kind.append(np.full(int(ok.sum()), GRADE, dtype=np.int8))
+
+    # (?:INR|Rs\.?|Rupees)\s?(\d{2,7})(?:\s?per\s?(?:kg|unit|meter|piece))?
+    keyword_at = np.flatnonzero((folded == ord('i')) | (folded == ord('r')))
+    keyword_end = np.full(len(keyword_at), -1, dtype=np.int64)
+    for literal in ('inr', 'rs', 'rupees'):
+        hit = (keyword_end < 0) & at(keyword_at, literal)
+        keyword_end[hit] = keyword_at[hit] + len(literal)
+    rs = keyword_end == keyword_at + 2
+    keyword_end[rs] += codes[keyword_end[rs]] == ord('.')
+    found = keyword_end >= 0
+    keyword_at, keyword_end = keyword_at[found], keyword_end[found]
+
+    digits_at = keyword_end + space[keyword_end]
+    found = is_digit[digits_at] & is_digit[digits_at + 1]
+    keyword_at, digits_at = keyword_at[found], digits_at[found]
+    # The digits start a run, as the keyword or a space precedes them
+    run_length = run_ends[np.searchsorted(run_starts, digits_at)] - digits_at
+    digit_count = np.minimum(run_length, 7)
+    price_end = digits_at + digit_count
+    per = price_end + space[price_end]
+    per_unit = per + 3 + space[per + 3]
+    per_end = np.full(len(per), -1, dtype=np.int64)
+    for literal in ('kg', 'unit', 'meter', 'piece'):
+        hit = (per_end < 0) & at(per_unit, literal)
+        per_end[hit] = per_unit[hit] + len(literal)
+    has_per = at(per, 'per') & (per_end >= 0)
+    price_end[has_per] = per_end[has_per]
+
+    # Like findall, skip a price that starts inside the one before it
+    overlapping = keyword_at[1:] < price_end[:-1]
+    if overlapping.any():
+        keep = np.ones(len(keyword_at), dtype=bool)
+        last_end = 0
+        for i, (start, end) in enumerate(zip(keyword_at.tolist(), price_end.tolist())):
+            if start < last_end:
+                keep[i] = False
+            else:
+                last_end = end
+        keyword_at, digits_at, digit_count = keyword_at[keep], digits_at[keep], digit_count[keep]
+    prices = _numbers(digit, digits_at, digit_count)
+
+    # Specs grouped by transcript, then by pattern, then by position
+    spec_at = np.concatenate(spec_at)
+    spec_end = np.concatenate(spec_end)
+    spec_kind = np.concatenate(spec_kind)
+    spec_row = np.searchsorted(row_starts, spec_at, side='right') - 1
+    order = np.lexsort((spec_at, spec_kind, spec_row))
+    specs = [text[start:end] for start, end in zip(spec_at[order].tolist(), spec_end[order].tolist())]
+    spec_offsets = np.searchsorted(spec_row[order], np.arange(count + 1), side='left')
+
+    positive, negative = _sentiment_counts(transcripts, positive_words, negative_words)
+
+    return (
+        prices, _offsets(keyword_at, row_starts),
+        quantities, _offsets(quantity_at, row_starts),
+        specs, spec_offsets,
+        positive, negative,
+    )
+
+
+def extract_batch(transcripts, metadata, positive_words, negative_words):
+    """Build an EntityBatch from transcripts and their optional metadata."""
+    transcripts = list(transcripts)
+    metadata = [{}] * len(transcripts) if metadata is None else list(metadata)
+    if len(metadata) != len(transcripts):
+        raise ValueError(f"Got {len(metadata)} metadata entries for {len(transcripts)} transcripts")
+
+    return EntityBatch(
+        *scan_batch(transcripts, positive_words, negative_words),
+        categories=[m.get('category_name', 'Misc') for m in metadata],
+        cities=[m.get('city', 'Unknown') for m in metadata]
+    )
+
+
+def _classify(codes):
+    ascii_codes = codes < 128
+    if ascii_codes.all():
+        return (_ASCII_FOLDED[codes], _ASCII_WORD[codes], _ASCII_SPACE[codes],
+                _ASCII_DIGIT[codes], _ASCII_GRADE[codes])
+
+    # Non-ASCII characters are classified once per distinct code point
+    clipped = np.where(ascii_codes, codes, 0)
+    classes = [_ASCII_FOLDED[clipped], _ASCII_WORD[clipped], _ASCII_SPACE[clipped],
+               _ASCII_DIGIT[clipped], _ASCII_GRADE[clipped]]
+    others = np.flatnonzero(~ascii_codes)
+    unique, inverse = np.unique(codes[others], return_inverse=True)
+    looked_up = [_char_class(int(code)) for code in unique]
+    for column, values in zip(classes, zip(*looked_up)):
+        column[others] = np.array(values, dtype=column.dtype)[inverse]
+    return tuple(classes)
+
+
+def _numbers(digit, starts, lengths):
+    # Vectorised int(): one pass per digit position
+    values = np.zeros(len(starts), dtype=np.int64)
+    for position in range(int(lengths.max()) if len(lengths) else 0):
+        more = position < lengths
+        values[more] = values[more] * 10 + digit[starts[more] + position]
+    return values
+
+
+def _offsets(positions, row_starts):
+    # Positions are sorted, so each transcript's matches are contiguous
+    return np.searchsorted(positions, row_starts, side='left')
+
+
+def _segment_sums(values, offsets):
+    totals = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(values, out=totals[1:])
+    return totals[offsets[1:]] - totals[offsets[:-1]]
+
+
+def _sentiment_counts(transcripts, positive_words, negative_words):
+    # One lowered text; each word's hits are mapped back to their transcript
+    lowered = [t.lower() for t in transcripts]
+    lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+    starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+    text = SEPARATOR.join(lowered)
+
+    counts = []
+    for words in (positive_words, negative_words):
+        total = np.zeros(len(transcripts), dtype=np.int16)
+        for w in words:
+            hits = np.fromiter((m.start() for m in re.finditer(re.escape(w), text)), dtype=np.int64)
+            present = np.zeros(len(transcripts), dtype=bool)
+            present[np.searchsorted(starts, hits, side='right') - 1] = True
+            total += present
+        counts.append(total)
+    return counts[0], counts[1]
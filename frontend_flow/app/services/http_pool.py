@@ -0,0 +1,25 @@
+import os
+import sys
+
+# HttpPool itself is the API's http_pool.py at the repository root, so
+# retry and reuse-counter fixes are made in one place. The root is
+# appended, not prepended, so its app.py never shadows this app package
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from http_pool import HttpPool  # noqa: E402
+
+# Global instance shared by company lookups, GST checks and webhook posts
+http_pool = HttpPool(
+    pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', '10')),
+    pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', '10')),
+    max_retries=int(os.getenv('HTTP_MAX_RETRIES', '3')),
+    backoff_factor=float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5')),
+    timeouts={
+        'company': 10,
+        'gst': 15,
+        # The n8n workflow runs transcription before answering
+        'webhook': (10, float(os.getenv('WEBHOOK_TIMEOUT', '300')))
+    }
+)
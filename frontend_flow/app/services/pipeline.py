@@ -1,11 +1,12 @@
-from collections import defaultdict
+from datetime import datetime
+from itertools import chain
 import re
-import json
-import os
 from statistics import mean
 
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
-SAMPLE_FILE = os.path.join(DATA_DIR, 'sample_calls.json')
+from .aggregates import InsightAggregates, get_aggregates
+from .call_index import IndexBuildingError, get_call_index
+from .call_store import get_call_store
+from .entity_batch import extract_batch
 
 SAMPLE_CATEGORIES = [
     'Steel Rods',
@@ -29,9 +30,91 @@ CITY_STATE_PATTERN = (
     r"\b(Delhi|Mumbai|Kolkata|Chennai|Bengaluru|Hyderabad|Jaipur|Surat|Pune)\b|"
     r"\b(UP|MH|DL|RJ|GJ|TN|WB|KA|TS)\b"
 )
+POSITIVE_WORDS = ['good', 'ok', 'yes', 'fine', 'deal', 'confirm']
+NEGATIVE_WORDS = ['no', 'delay', 'price high', 'issue', 'problem', 'cancel']
+
+# SPEC_PATTERNS, PRICE_PATTERN and QTY_PATTERN folded into one alternation so
+# a transcript is scanned once. Each branch consumes as little as possible
+# (the price branch nothing, the number branch only its digits) so branches
+# can overlap the way the separate findall calls do: "Rs 500 kg" yields a
+# price and a quantity, and the "rs" inside "meters" still starts a price.
+# The leading class skips positions no branch can start at. Units are told
+# apart by group rather than by lowercasing, so case folding matches the
+# original patterns exactly, and the mm/kg/meters/units groups follow the
+# order of SPEC_PATTERNS (grade last).
+ENTITY_PATTERN = re.compile(r"""(?i:(?=[\dgir])(?:
+    (?=(?P<price_match>(?:INR|Rs\.?|Rupees)\s?(?P<price>\d{2,7})(?:\s?per\s?(?:kg|unit|meter|piece))?))
+  | \b(?P<number>\d+)(?=(?P<unit>\s?(?:(?P<mm>mm)|(?P<kg>kg)|(?P<meters>meters?)|(?P<units>units?)|pieces?))\b)
+  | \b(?=(?P<grade>grade\s?[A-D])\b)
+))""", re.VERBOSE)
 
 
 def extract_entities(transcript: str):
+    """Extract specs, prices, quantities and sentiment from a transcript.
+
+    Returns exactly what extract_entities_reference() returns, in a single
+    scan of the transcript with ENTITY_PATTERN.
+    """
+    # One list per SPEC_PATTERNS entry, so the set below is built in the same order
+    specs = ([], [], [], [], [])
+    prices = []
+    quantities = []
+    price_end = 0
+
+    for m in ENTITY_PATTERN.finditer(transcript):
+        price, number = m.group('price', 'number')
+        if price is not None:
+            # findall never returns a price starting inside the previous one
+            if m.start() >= price_end:
+                prices.append(int(price))
+                price_end = m.start() + len(m.group('price_match'))
+        elif number is not None:
+            units = m.group('mm', 'kg', 'meters', 'units')
+            if units[0] is None and len(number) <= 5:
+                quantities.append(int(number))
+            for kind, unit in enumerate(units):
+                if unit is not None:
+                    specs[kind].append(number + m.group('unit'))
+                    break
+        else:
+            specs[4].append(m.group('grade'))
+
+    # sentiment heuristic: count positive/negative words. Kept out of
+    # ENTITY_PATTERN: the words start with common letters (c d f g i n o p y),
+    # so as a lookahead branch they make the scan stop at most positions and
+    # cost more than these substring tests on the lowered text
+    lowered = transcript.lower()
+    pos_words = sum(w in lowered for w in POSITIVE_WORDS)
+    neg_words = sum(w in lowered for w in NEGATIVE_WORDS)
+    sentiment = 'positive' if pos_words > neg_words else ('negative' if neg_words > pos_words else 'neutral')
+
+    return {
+        'specs': list(set(chain.from_iterable(specs))),
+        'prices': prices,
+        'quantities': quantities,
+        'sentiment': sentiment,
+    }
+
+
+def extract_entities_batch(transcripts, metadata=None):
+    """Extract entities from many transcripts in one vectorised pass.
+
+    Args:
+        transcripts (iterable): Transcript strings (a list or any stream)
+        metadata (iterable): Optional metadata dict per transcript, for the
+            category and city aggregate_insights() groups by
+
+    Returns:
+        EntityBatch: Columnar results; row(i) equals extract_entities(transcripts[i])
+    """
+    return extract_batch(transcripts, metadata, POSITIVE_WORDS, NEGATIVE_WORDS)
+
+
+def extract_entities_reference(transcript: str):
+    """The original one-pattern-at-a-time extraction.
+
+    Kept as the reference extract_entities() is tested and benchmarked against.
+    """
     # Very simple regex-based extraction as a mock
     specs = []
     for pat in SPEC_PATTERNS:
@@ -41,8 +124,8 @@ def extract_entities(transcript: str):
     quantities = [int(q) for q in re.findall(QTY_PATTERN, transcript, flags=re.IGNORECASE)]
 
     # sentiment heuristic: count positive/negative words
-    pos_words = sum(w in transcript.lower() for w in ['good','ok','yes','fine','deal','confirm'])
-    neg_words = sum(w in transcript.lower() for w in ['no','delay','price high','issue','problem','cancel'])
+    pos_words = sum(w in transcript.lower() for w in POSITIVE_WORDS)
+    neg_words = sum(w in transcript.lower() for w in NEGATIVE_WORDS)
     sentiment = 'positive' if pos_words > neg_words else ('negative' if neg_words > pos_words else 'neutral')
 
     return {
@@ -66,74 +149,33 @@ def process_call(transcript: str, metadata: dict):
             'avg_price': avg_price,
             'total_qty': total_qty,
             'price_per_qty': (avg_price / total_qty) if avg_price and total_qty else None,
-        }
+        },
+        'processed_at': datetime.now().isoformat(timespec='seconds'),
     }
 
-    # persist to sample file for aggregation demo
-    os.makedirs(DATA_DIR, exist_ok=True)
-    calls = []
-    if os.path.exists(SAMPLE_FILE):
-        with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
-            try:
-                calls = json.load(f)
-            except Exception:
-                calls = []
-    calls.append(result)
-    with open(SAMPLE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(calls, f, ensure_ascii=False, indent=2)
+    # persist to the call store and fold it into the running aggregates
+    get_call_store().append(result)
+    get_aggregates().refresh()
 
     return result
 
 
-def aggregate_insights():
-    # Read saved calls and produce category and location insights
-    if not os.path.exists(SAMPLE_FILE):
-        return {
-            'categories': {},
-            'locations': {},
-            'overall': {
-                'total_calls': 0,
-                'cities_covered': [],
-                'top_cities': [],
-            }
-        }
-
-    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
-        calls = json.load(f)
-
-    cat_prices = defaultdict(list)
-    cat_qty = defaultdict(list)
-    sentiments = defaultdict(lambda: defaultdict(int))
-    location_counts = defaultdict(int)
-
-    for c in calls:
-        cat = c['metadata'].get('category_name','Misc')
-        city = c['metadata'].get('city','Unknown')
-        if c['extracted']['prices']:
-            cat_prices[cat] += c['extracted']['prices']
-        if c['extracted']['quantities']:
-            cat_qty[cat] += c['extracted']['quantities']
-        sentiments[cat][c['extracted']['sentiment']] += 1
-        location_counts[city] += 1
-
-    categories = {}
-    for cat in set(list(cat_prices.keys()) + list(cat_qty.keys()) + list(sentiments.keys())):
-        categories[cat] = {
-            'avg_price': round(mean(cat_prices[cat]), 2) if cat_prices[cat] else None,
-            'avg_qty': round(mean(cat_qty[cat]), 2) if cat_qty[cat] else None,
-            'sentiment': sentiments[cat],
-        }
-
-    top_cities = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)[:5] if location_counts else []
-    
-    overall = {
-        'total_calls': len(calls),
-        'cities_covered': sorted(location_counts.keys()) if location_counts else [],
-        'top_cities': top_cities,
-    }
-
-    return {
-        'categories': categories,
-        'locations': dict(location_counts),
-        'overall': overall,
-    }
+def aggregate_insights(query=None, batch=None):
+    # An EntityBatch from extract_entities_batch() is aggregated on its own
+    if batch is not None:
+        aggregates = InsightAggregates(None, persist=False)
+        aggregates.add_batch(batch)
+        return aggregates.insights()
+
+    # Filtered or grouped queries are answered from the call index, which
+    # is built in the background rather than on this request
+    if query is not None and not query.is_empty():
+        index = get_call_index()
+        if not index.catch_up():
+            raise IndexBuildingError("The call index is still being built, retry shortly")
+        return index.query(query)
+
+    # Fold in calls stored since the last request, then read the running totals
+    aggregates = get_aggregates()
+    aggregates.refresh()
+    return aggregates.insights()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark of extract_entities against the original multi-pass extraction.
+
+Runs both, and extract_entities_batch over all the transcripts at once, on
+the seed transcripts, checks they return identical results and reports the
+time per transcript.
+
+Usage:
+    python bench_extract.py
+    python bench_extract.py --repeat 5000
+"""
+import argparse
+import sys
+import timeit
+
+from app.services.pipeline import extract_entities, extract_entities_batch, extract_entities_reference
+from seed_data import MOCK_TRANSCRIPTS
+
+
+def time_per_call(func, transcripts, repeat, rounds):
+    # Best of several rounds, to keep scheduler noise out of the comparison
+    best = min(timeit.repeat(lambda: [func(t) for t in transcripts], number=repeat, repeat=rounds))
+    return best / (repeat * len(transcripts))
+
+
+def time_per_batch_row(transcripts, repeat, rounds):
+    # The batch is the seed transcripts repeated, as one bulk reprocessing run
+    batch = transcripts * repeat
+    best = min(timeit.repeat(lambda: extract_entities_batch(batch), number=1, repeat=rounds))
+    return best / len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extract_entities on the seed transcripts')
+    parser.add_argument('--repeat', type=int, default=2000, help='Passes over the transcripts per round')
+    parser.add_argument('--rounds', type=int, default=5, help='Rounds; the fastest is reported')
+    args = parser.parse_args()
+
+    transcripts = [t for category in MOCK_TRANSCRIPTS.values() for t in category]
+
+    mismatches = [t for t in transcripts if extract_entities(t) != extract_entities_reference(t)]
+    batch = extract_entities_batch(transcripts)
+    mismatches += [t for i, t in enumerate(transcripts) if batch.row(i) != extract_entities_reference(t)]
+    if mismatches:
+        print(f"✗ {len(mismatches)} transcripts extract differently, e.g.: {mismatches[0]}")
+        return 1
+    print(f"✓ Identical results on {len(transcripts)} seed transcripts")
+
+    reference = time_per_call(extract_entities_reference, transcripts, args.repeat, args.rounds)
+    current = time_per_call(extract_entities, transcripts, args.repeat, args.rounds)
+    batched = time_per_batch_row(transcripts, args.repeat, args.rounds)
+    print(f"extract_entities_reference: {reference * 1e6:8.2f} µs per transcript")
+    print(f"extract_entities:           {current * 1e6:8.2f} µs per transcript")
+    print(f"extract_entities_batch:     {batched * 1e6:8.2f} µs per transcript")
+    print(f"Speed-up: {reference / current:.2f}x single pass, {reference / batched:.2f}x batched")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
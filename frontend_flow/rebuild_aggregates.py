@@ -0,0 +1,55 @@
+"""
+Verify the running insight aggregates against a rebuild from the call store.
+
+Usage:
+    python rebuild_aggregates.py          # compare, exit 1 on mismatch
+    python rebuild_aggregates.py --write  # replace the saved aggregates with the rebuild
+"""
+import argparse
+import json
+import sys
+
+from app.services.aggregates import InsightAggregates
+from app.services.call_store import get_call_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild insight aggregates from the call store and compare')
+    parser.add_argument('--write', action='store_true', help='Save the rebuilt aggregates as the snapshot')
+    args = parser.parse_args()
+
+    store = get_call_store()
+
+    # What /api/aggregate serves: the saved snapshot plus calls stored since
+    incremental = InsightAggregates(store)
+    incremental.refresh()
+
+    scratch = InsightAggregates(store, persist=False)
+    scratch.rebuild()
+
+    expected = scratch.insights()
+    actual = incremental.insights()
+    print(f"Calls in store: {scratch.total_calls}")
+    print(f"Snapshot: {incremental.snapshot_path}")
+
+    if args.write:
+        rebuilt = InsightAggregates(store)
+        rebuilt.rebuild()
+        print("✓ Snapshot replaced with the rebuilt aggregates")
+        return 0
+
+    if actual == expected:
+        print("✓ Running aggregates match a rebuild from scratch")
+        return 0
+
+    print("✗ Running aggregates differ from a rebuild from scratch")
+    print("Running:")
+    print(json.dumps(actual, indent=2, ensure_ascii=False))
+    print("Rebuilt:")
+    print(json.dumps(expected, indent=2, ensure_ascii=False))
+    print("Run with --write to replace the snapshot")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,10 @@
 Seed script to populate sample buyer-seller call data for demo purposes.
 Run this before starting the app to see pre-populated insights.
 """
-import json
-import os
 from datetime import datetime, timedelta
 import random
 
-DATA_DIR = 'data'
-SAMPLE_FILE = os.path.join(DATA_DIR, 'sample_calls.json')
+from app.services.call_store import get_call_store
 
 # Mock transcripts for different categories
 MOCK_TRANSCRIPTS = {
@@ -53,8 +50,6 @@ STATES = {
 
 def generate_seed_data():
     """Generate realistic mock call data across all categories"""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    
     calls = []
     call_id = 1
     base_time = datetime.now() - timedelta(days=30)
@@ -104,11 +99,13 @@ def generate_seed_data():
             calls.append(call)
             call_id += 1
     
-    with open(SAMPLE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(calls, f, ensure_ascii=False, indent=2)
+    # Replace whatever is stored with the fresh seed set
+    store = get_call_store()
+    store.clear()
+    store.append_many(calls)
     
     print(f"✓ Generated {len(calls)} sample calls across {len(MOCK_TRANSCRIPTS)} categories")
-    print(f"✓ Data saved to {SAMPLE_FILE}")
+    print(f"✓ Data saved to {store.path}")
     print(f"\nCategories: {', '.join(MOCK_TRANSCRIPTS.keys())}")
     print(f"Cities covered: {', '.join(set(c['metadata']['city'] for c in calls))}")
 
@@ -0,0 +1,106 @@
+"""
+Tests for the running insight aggregates kept alongside the call store
+"""
+
+import json
+
+import pytest
+
+from app.services.aggregates import InsightAggregates
+from app.services.call_store import create_call_store
+
+
+def make_call(prices, quantities, sentiment='neutral', city='Delhi', category='Steel Rods'):
+    return {
+        'metadata': {'category_name': category, 'city': city},
+        'transcript': '',
+        'extracted': {'specs': [], 'prices': prices, 'quantities': quantities, 'sentiment': sentiment},
+        'derived': {},
+    }
+
+
+@pytest.fixture(params=['jsonl', 'sqlite'])
+def store(request, tmp_path):
+    suffix = 'jsonl' if request.param == 'jsonl' else 'db'
+    return create_call_store(request.param, str(tmp_path / f'calls.{suffix}'))
+
+
+def test_running_totals_match_legacy_shape(store):
+    aggregates = InsightAggregates(store)
+    store.append_many([
+        make_call([450, 500], [100], 'positive', 'Pune'),
+        make_call([451], [], 'negative', 'Surat'),
+        make_call([], [30], 'positive', 'Pune', 'Textiles'),
+        {'metadata': {}, 'extracted': {'prices': [], 'quantities': [], 'sentiment': 'neutral'}},
+    ])
+    assert aggregates.refresh() == 4
+
+    insights = aggregates.insights()
+    assert insights['categories']['Steel Rods'] == {
+        'avg_price': 467, 'avg_qty': 100, 'sentiment': {'positive': 1, 'negative': 1}
+    }
+    assert insights['categories']['Textiles']['avg_price'] is None
+    assert insights['categories']['Misc']['sentiment'] == {'neutral': 1}
+    assert insights['locations'] == {'Pune': 2, 'Surat': 1, 'Unknown': 1}
+    assert insights['overall'] == {
+        'total_calls': 4,
+        'cities_covered': ['Pune', 'Surat', 'Unknown'],
+        'top_cities': [('Pune', 2), ('Surat', 1), ('Unknown', 1)],
+    }
+
+    store.append(make_call([452], [], city='Surat'))
+    assert aggregates.refresh() == 1
+    assert aggregates.insights()['categories']['Steel Rods']['avg_price'] == 463.25
+
+
+def test_snapshot_resumes_from_saved_offset(store):
+    store.append_many([make_call([100], [10]), make_call([200], [20])])
+    InsightAggregates(store).refresh()
+
+    store.append(make_call([300], [30]))
+    restarted = InsightAggregates(store)
+    assert restarted.total_calls == 2
+    assert restarted.refresh() == 1
+    assert restarted.insights()['categories']['Steel Rods']['avg_price'] == 200
+
+
+def test_clear_triggers_rebuild(store):
+    aggregates = InsightAggregates(store)
+    store.append_many([make_call([100], [10]) for _ in range(3)])
+    aggregates.refresh()
+
+    store.clear()
+    store.append(make_call([700], [70], city='Jaipur'))
+    aggregates.refresh()
+
+    insights = aggregates.insights()
+    assert insights['overall']['total_calls'] == 1
+    assert insights['locations'] == {'Jaipur': 1}
+
+
+def test_replaced_store_file_triggers_rebuild(tmp_path):
+    path = str(tmp_path / 'calls.jsonl')
+    store = create_call_store('jsonl', path)
+    store.append_many([make_call([100], [10]) for _ in range(3)])
+    InsightAggregates(store).refresh()
+
+    # Deleted by hand: the saved offset now points past the end of the file
+    (tmp_path / 'calls.jsonl').unlink()
+    store.append(make_call([900], [1]))
+
+    aggregates = InsightAggregates(store)
+    aggregates.refresh()
+    assert aggregates.total_calls == 1
+    with open(aggregates.snapshot_path, encoding='utf-8') as f:
+        assert json.load(f)['total_calls'] == 1
+
+
+def test_rebuild_matches_incremental(store):
+    aggregates = InsightAggregates(store)
+    for i in range(40):
+        store.append(make_call([i * 10 + 1], [i], ['positive', 'negative', 'neutral'][i % 3], f'City-{i % 7}'))
+        aggregates.refresh()
+
+    scratch = InsightAggregates(store, persist=False)
+    scratch.rebuild()
+    assert scratch.insights() == aggregates.insights()
@@ -0,0 +1,198 @@
+"""
+Tests for filtered and grouped aggregation through the call index
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from app import create_app
+from app.services import call_store
+from app.services.aggregates import InsightAggregates
+from app.services.call_index import AggregateQuery, CallIndex
+from app.services.call_store import create_call_store
+
+
+def make_call(timestamp, city, category, sentiment='neutral', prices=(100,), quantities=(10,), **metadata):
+    return {
+        'metadata': dict(metadata, category_name=category, city=city, timestamp=timestamp),
+        'transcript': '',
+        'extracted': {'specs': [], 'prices': list(prices), 'quantities': list(quantities), 'sentiment': sentiment},
+        'derived': {},
+    }
+
+
+CALLS = [
+    make_call('2025-03-01T09:00:00', 'Pune', 'Textiles', 'positive', (120,), (500,), state='MH', mcat_id=11),
+    make_call('2025-03-01T18:30:00', 'Delhi', 'Steel Rods', 'negative', (9500,), (200,), state='DL', mcat_id=22),
+    make_call('2025-03-02T10:00:00', 'Pune', 'Steel Rods', 'positive', (48,), (1000,), state='MH', mcat_id=22),
+    make_call('2025-03-05T12:00:00', 'Surat', 'Textiles', 'neutral', (85,), (300,), state='GJ', mcat_id=11),
+    make_call(None, 'Delhi', 'Furniture', 'positive', (), (50,), state='DL'),
+]
+
+
+@pytest.fixture(params=['jsonl', 'sqlite'])
+def store(request, tmp_path):
+    suffix = 'jsonl' if request.param == 'jsonl' else 'db'
+    store = create_call_store(request.param, str(tmp_path / f'calls.{suffix}'))
+    store.append_many(CALLS)
+    return store
+
+
+@pytest.fixture
+def index(store):
+    index = CallIndex(store)
+    index.refresh()
+    return index
+
+
+def test_field_filters(index):
+    result = index.query(AggregateQuery(city=['Pune']))
+    assert result['overall']['total_calls'] == 2
+    assert result['categories']['Textiles']['avg_price'] == 120
+
+    result = index.query(AggregateQuery(city=['Pune', 'Delhi'], category_name=['Steel Rods'], mcat_id=[22]))
+    assert result['query']['matched_calls'] == 2
+    assert result['categories']['Steel Rods']['avg_price'] == 4774
+    assert result['locations'] == {'Delhi': 1, 'Pune': 1}
+
+    assert index.query(AggregateQuery(state=['MH'], sentiment=['negative']))['overall']['total_calls'] == 0
+    assert index.query(AggregateQuery(city=['Nowhere']))['overall']['total_calls'] == 0
+
+
+def test_time_range_is_inclusive(index):
+    query = AggregateQuery.from_args(MultiDict({'start': '2025-03-01T12:00:00', 'end': '2025-03-02'}))
+    result = index.query(query)
+    assert result['locations'] == {'Delhi': 1, 'Pune': 1}
+
+    # Calls without a timestamp never match a time range
+    assert index.query(AggregateQuery(end=datetime(2030, 1, 1)))['overall']['total_calls'] == 4
+
+
+def test_group_by(index):
+    result = index.query(AggregateQuery(group_by='day'))
+    assert list(result['groups']) == ['2025-03-01', '2025-03-02', '2025-03-05', 'Unknown']
+    assert result['groups']['2025-03-01'] == {
+        'total_calls': 2, 'avg_price': 4810, 'avg_qty': 350, 'sentiment': {'positive': 1, 'negative': 1}
+    }
+
+    result = index.query(AggregateQuery(state=['DL'], group_by='category_name'))
+    assert result['groups']['Furniture']['avg_price'] is None
+    assert result['groups']['Steel Rods']['total_calls'] == 1
+
+
+def test_grouping_alone_matches_running_totals(store, index):
+    totals = InsightAggregates(store, persist=False)
+    totals.refresh()
+
+    result = index.query(AggregateQuery(group_by='city'))
+    for key in ('categories', 'locations', 'overall'):
+        assert result[key] == totals.insights()[key]
+
+
+def scan(keep):
+    totals = InsightAggregates(None, persist=False)
+    for call in CALLS:
+        if keep(call):
+            totals.add(call)
+    return totals.insights()
+
+
+@pytest.mark.parametrize('query, keep', [
+    (AggregateQuery(), lambda call: True),
+    (AggregateQuery(sentiment=['positive']), lambda call: call['extracted']['sentiment'] == 'positive'),
+    (AggregateQuery(state=['DL', 'GJ']), lambda call: call['metadata']['state'] in ('DL', 'GJ')),
+    (AggregateQuery(start=datetime(2025, 1, 1)), lambda call: call['metadata']['timestamp'] is not None),
+])
+def test_rollups_match_a_scan_of_the_calls(index, query, keep):
+    # Answered from the rollups, in the order the calls were first seen
+    result = index.query(query)
+    expected = scan(keep)
+    for key in ('categories', 'locations', 'overall'):
+        assert result[key] == expected[key]
+    assert list(result['locations']) == list(expected['locations'])
+
+
+def test_new_calls_extend_postings_and_rollups(store, index):
+    assert index.query(AggregateQuery(group_by='day'))['groups']['2025-03-01']['total_calls'] == 2
+    store.append(make_call('2025-03-01T20:00:00', 'Pune', 'Furniture', 'negative', state='MH'))
+    index.refresh()
+
+    assert index.query(AggregateQuery(sentiment=['negative']))['locations'] == {'Delhi': 1, 'Pune': 1}
+    assert index.query(AggregateQuery(group_by='day'))['groups']['2025-03-01']['total_calls'] == 3
+    day = AggregateQuery(city=['Pune'], start=datetime(2025, 3, 1), end=datetime(2025, 3, 1, 23, 59, 59))
+    assert index.query(day)['categories'] == {
+        'Textiles': {'avg_price': 120, 'avg_qty': 500, 'sentiment': {'positive': 1}},
+        'Furniture': {'avg_price': 100, 'avg_qty': 10, 'sentiment': {'negative': 1}},
+    }
+
+
+def test_snapshot_reload_and_rebuild(store, index):
+    index._save()
+    store.append(make_call('2025-04-01T08:00:00', 'Jaipur', 'Agriculture Seeds', state='RJ'))
+
+    reloaded = CallIndex(store)
+    assert len(reloaded) == 5
+    assert reloaded.refresh() == 1
+    assert reloaded.query(AggregateQuery(state=['RJ']))['overall']['total_calls'] == 1
+
+    store.clear()
+    reloaded.refresh()
+    assert len(reloaded) == 0
+
+
+def test_api_filters_and_validation(store, monkeypatch):
+    monkeypatch.setattr(call_store, '_default_store', store)
+    client = create_app().test_client()
+
+    data = client.get('/api/aggregate?sentiment=positive&group_by=state').get_json()
+    assert data['overall']['total_calls'] == 3
+    assert data['groups']['MH']['total_calls'] == 2
+
+    unfiltered = client.get('/api/aggregate').get_json()
+    assert 'query' not in unfiltered
+    assert unfiltered['overall']['total_calls'] == 5
+
+    assert client.get('/api/aggregate?group_by=price').status_code == 400
+    assert client.get('/api/aggregate?start=yesterday').status_code == 400
+    assert client.get('/api/aggregate?start=2025-03-05&end=2025-03-01').status_code == 400
+
+
+def test_catch_up_builds_in_the_background(store, monkeypatch):
+    index = CallIndex(store, persist=False)
+    release = threading.Event()
+    iter_since = store.iter_since
+
+    def blocked_iter_since(offset):
+        release.wait(5)
+        return iter_since(offset)
+
+    monkeypatch.setattr(store, 'iter_since', blocked_iter_since)
+
+    # The full build runs on the builder thread, not the caller's
+    assert index.catch_up(timeout=0) is False
+    assert index.warm() is index.warm()
+    release.set()
+    assert index.catch_up() is True
+    assert len(index) == 5
+
+    # Once built, new calls are tailed inline
+    store.append(make_call('2025-04-01T08:00:00', 'Jaipur', 'Agriculture Seeds', state='RJ'))
+    assert index.catch_up(timeout=0) is True
+    assert len(index) == 6
+
+
+def test_api_reports_index_still_building(store, monkeypatch):
+    monkeypatch.setattr(call_store, '_default_store', store)
+    monkeypatch.setattr(CallIndex, 'catch_up', lambda self, timeout=None: False)
+    client = create_app().test_client()
+
+    response = client.get('/api/aggregate?city=Pune')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
+    assert 'error' in response.get_json()
+
+    # The running totals need no index
+    assert client.get('/api/aggregate').status_code == 200
@@ -0,0 +1,131 @@
+"""
+Tests for the append-only call store (JSON lines and SQLite backends)
+and the one-shot migration from data/sample_calls.json
+"""
+
+import json
+import threading
+
+import pytest
+
+from app.services import call_store, pipeline
+from app.services.call_store import JsonlCallStore, SqliteCallStore, create_call_store, migrate_legacy_json
+
+
+def make_call(i, city='Delhi', category='Steel Rods'):
+    return {
+        'metadata': {'category_name': category, 'city': city, 'seller_id': f'S-{i:03d}'},
+        'transcript': f'Call {i}: need 100 kg at Rs 450',
+        'extracted': {'specs': [], 'prices': [450], 'quantities': [100], 'sentiment': 'neutral'},
+        'derived': {'avg_price': 450, 'total_qty': 100, 'price_per_qty': 4.5},
+    }
+
+
+@pytest.fixture(params=['jsonl', 'sqlite'])
+def store(request, tmp_path):
+    suffix = 'jsonl' if request.param == 'jsonl' else 'db'
+    return create_call_store(request.param, str(tmp_path / f'calls.{suffix}'))
+
+
+def test_append_and_iterate_in_order(store):
+    store.append(make_call(1))
+    store.append_many([make_call(2), make_call(3)])
+
+    assert [c['metadata']['seller_id'] for c in store] == ['S-001', 'S-002', 'S-003']
+    assert store.count() == 3
+
+    store.clear()
+    assert list(store) == []
+
+
+def test_concurrent_appends_are_not_lost(store):
+    def writer(offset):
+        for i in range(50):
+            store.append(make_call(offset + i))
+
+    threads = [threading.Thread(target=writer, args=(n * 100,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [c['metadata']['seller_id'] for c in store]
+    assert len(ids) == 200
+    assert len(set(ids)) == 200
+
+
+def test_jsonl_recovers_from_torn_write(tmp_path):
+    store = JsonlCallStore(str(tmp_path / 'calls.jsonl'))
+    store.append(make_call(1))
+    with open(store.path, 'a', encoding='utf-8') as f:
+        f.write('{"metadata": {"city": "Pu')  # writer crashed mid-record
+
+    store.append(make_call(2))
+    assert [c['metadata']['seller_id'] for c in store] == ['S-001', 'S-002']
+
+    # The damaged line seen by the read is compacted away on the next append
+    store.append(make_call(3))
+    with open(store.path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)['metadata']['seller_id'] for line in lines] == ['S-001', 'S-002', 'S-003']
+
+
+def test_jsonl_recovers_from_torn_utf8_tail(tmp_path):
+    store = JsonlCallStore(str(tmp_path / 'calls.jsonl'))
+    store.append(make_call(1))
+    with open(store.path, 'ab') as f:
+        # Crashed mid-way through a Hindi transcript, inside a character
+        f.write('{"transcript": "नमस्ते'.encode('utf-8')[:-1])
+
+    store.append(make_call(2))
+    assert [c['metadata']['seller_id'] for c in store] == ['S-001', 'S-002']
+
+    # The append that compacts the damaged line, and every one after it, succeeds
+    for i in (3, 4):
+        store.append(make_call(i))
+    assert store.compact() == 0
+    assert [c['metadata']['seller_id'] for c in store] == ['S-001', 'S-002', 'S-003', 'S-004']
+
+
+def test_sqlite_compact(tmp_path):
+    store = SqliteCallStore(str(tmp_path / 'calls.db'), checkpoint_every=10)
+    store.append_many([make_call(i) for i in range(25)])
+    assert store.compact() == 0
+    assert store.count() == 25
+
+
+def test_migrates_legacy_json_once(store, tmp_path):
+    legacy = tmp_path / 'sample_calls.json'
+    legacy.write_text(json.dumps([make_call(1), make_call(2)]), encoding='utf-8')
+
+    assert migrate_legacy_json(store, str(legacy)) == 2
+    assert json.loads(legacy.read_text(encoding='utf-8')) == [make_call(1), make_call(2)]
+    assert json.loads(open(store.path + '.migrated', encoding='utf-8').read())['calls'] == 2
+
+    assert migrate_legacy_json(store, str(legacy)) == 0
+    assert store.count() == 2
+
+
+def test_legacy_json_renamed_by_an_earlier_migration_is_not_imported_again(store, tmp_path):
+    # A checkout restores the file an older version renamed after importing it
+    legacy = tmp_path / 'sample_calls.json'
+    legacy.write_text(json.dumps([make_call(1)]), encoding='utf-8')
+    (tmp_path / 'sample_calls.json.migrated').write_text(legacy.read_text(encoding='utf-8'), encoding='utf-8')
+
+    assert migrate_legacy_json(store, str(legacy)) == 0
+    assert store.count() == 0
+    assert legacy.exists()
+
+
+def test_process_call_appends_to_store(tmp_path, monkeypatch):
+    store = JsonlCallStore(str(tmp_path / 'calls.jsonl'))
+    monkeypatch.setattr(call_store, '_default_store', store)
+
+    pipeline.process_call('Need 200 kg at Rs 500, good deal', {'category_name': 'Textiles', 'city': 'Pune'})
+    pipeline.process_call('Price high, 50 units at INR 900', {'category_name': 'Textiles', 'city': 'Surat'})
+
+    assert store.count() == 2
+    insights = pipeline.aggregate_insights()
+    assert insights['overall']['total_calls'] == 2
+    assert insights['categories']['Textiles']['avg_price'] == 700
+    assert insights['locations'] == {'Pune': 1, 'Surat': 1}
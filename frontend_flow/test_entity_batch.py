@@ -0,0 +1,101 @@
+"""
+Tests that extract_entities_batch matches per-transcript extraction and aggregation
+"""
+
+import random
+
+import pytest
+
+from app.services.aggregates import InsightAggregates
+from app.services.call_store import create_call_store
+from app.services.pipeline import aggregate_insights, extract_entities_batch, extract_entities_reference
+from seed_data import MOCK_TRANSCRIPTS
+from test_extraction import SEED_TRANSCRIPTS
+
+EDGE_CASES = [
+    '',
+    'Rs 500 kg',
+    'INR 12345678 per kg',
+    'Rs 50 permeters 70',
+    'need 123456 kg and 12 pieces',
+    'x12mm, 12 MM, 12mm_, grade b, GRADE  C, gradeD',
+    'İNR 300, 2 unitſ, 4 Kg, ı',
+    'Rs\x0012 kg',                    # the batch separator inside a transcript
+    '12 mm, ५०० kg, Rs ٣٤',
+    'nok, no good, price high issue',
+]
+
+
+def random_transcripts(count, seed):
+    tokens = [
+        'Rs', 'Rs.', 'INR', 'İNR', 'Rupees', 'rs', '12', '5', '99', '123456', '12345678', 'mm', 'kg', 'KG',
+        'meters', 'meter', 'unit', 'unitſ', 'units', 'pieces', 'per', 'grade', 'Grade A', 'gradeB', 'no',
+        'ok', 'deal', 'price high', '-', ',', '.', '\n', ' ', '५००', 'ı',
+    ]
+    rng = random.Random(seed)
+    return [
+        ''.join(rng.choice(tokens) + rng.choice(['', ' ', ' ']) for _ in range(rng.randint(0, 12)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize('transcripts', [SEED_TRANSCRIPTS, EDGE_CASES, random_transcripts(5000, 11)],
+                         ids=['seed', 'edge-cases', 'random'])
+def test_rows_match_reference(transcripts):
+    batch = extract_entities_batch(transcripts)
+    assert len(batch) == len(transcripts)
+    for i, transcript in enumerate(transcripts):
+        assert batch.row(i) == extract_entities_reference(transcript), transcript
+
+
+def test_accepts_streams_and_empty_input():
+    batch = extract_entities_batch(t for t in EDGE_CASES)
+    assert list(batch) == [extract_entities_reference(t) for t in EDGE_CASES]
+    assert list(extract_entities_batch([])) == []
+
+    with pytest.raises(ValueError):
+        extract_entities_batch(['Rs 50'], metadata=[])
+
+
+def test_iterating_a_large_batch_reuses_its_columns():
+    transcripts = random_transcripts(20000, 7)
+    batch = extract_entities_batch(transcripts)
+
+    # Each derived column is computed once, not once per row
+    for column in ('sentiment_codes', 'price_counts', 'price_sums', 'quantity_counts', 'quantity_sums'):
+        assert getattr(batch, column) is getattr(batch, column)
+
+    rows = list(batch)
+    assert len(rows) == len(transcripts)
+    for row, transcript in zip(rows, transcripts):
+        assert row == extract_entities_reference(transcript), transcript
+
+
+def test_aggregates_match_stored_calls(tmp_path):
+    transcripts, metadata = [], []
+    for category, texts in MOCK_TRANSCRIPTS.items():
+        for i, text in enumerate(texts * 3):
+            transcripts.append(text)
+            metadata.append({'category_name': category, 'city': ['Pune', 'Delhi', 'Surat'][i % 3]})
+    transcripts.append('Rs 40 per kg')
+    metadata.append({})
+
+    store = create_call_store('jsonl', str(tmp_path / 'calls.jsonl'))
+    store.append_many(
+        {'metadata': m, 'transcript': t, 'extracted': extract_entities_reference(t), 'derived': {}}
+        for t, m in zip(transcripts, metadata)
+    )
+    expected = InsightAggregates(store, persist=False)
+    expected.refresh()
+
+    batch = extract_entities_batch(transcripts, metadata)
+    assert aggregate_insights(batch=batch) == expected.insights()
+
+    # A batch folds into totals that already hold calls
+    totals = InsightAggregates(None)
+    totals.add_batch(batch)
+    for record in store:
+        totals.add(record)
+    doubled = InsightAggregates(None)
+    doubled.add_batch(extract_entities_batch(transcripts * 2, metadata * 2))
+    assert totals.to_dict() == doubled.to_dict()
@@ -0,0 +1,45 @@
+"""
+Tests that the single-pass extract_entities matches the original extraction
+"""
+
+import random
+
+import pytest
+
+from app.services.pipeline import extract_entities, extract_entities_reference
+from seed_data import MOCK_TRANSCRIPTS
+
+SEED_TRANSCRIPTS = [t for category in MOCK_TRANSCRIPTS.values() for t in category]
+
+
+@pytest.mark.parametrize('transcript', SEED_TRANSCRIPTS)
+def test_matches_reference_on_seed_transcripts(transcript):
+    assert extract_entities(transcript) == extract_entities_reference(transcript)
+
+
+@pytest.mark.parametrize('transcript', [
+    '',
+    'Rs 500 kg',                      # a price and a quantity overlap
+    'INR 12345678 per kg',            # price digits capped at seven
+    'Rs 50 permeters 70',             # the "rs" inside a price is skipped
+    '5 meters 100',                   # but the "rs" inside "meters" is not
+    'need 123456 kg and 12 pieces',   # quantities are at most five digits
+    'x12mm, 12 MM, 12mm_, grade b, GRADE  C, gradeD',
+    'İNR 300, 2 unitſ, 4 Kg',         # case folding beyond ASCII
+    'Rs. 99 per unit, Rupees45 per piece, rs.1',
+    'nok, no good, price high issue',
+])
+def test_matches_reference_on_edge_cases(transcript):
+    assert extract_entities(transcript) == extract_entities_reference(transcript)
+
+
+def test_matches_reference_on_random_transcripts():
+    tokens = [
+        'Rs', 'Rs.', 'INR', 'Rupees', 'rs', '12', '5', '99', '123456', '12345678', 'mm', 'kg', 'KG',
+        'meters', 'meter', 'unit', 'units', 'pieces', 'per', 'grade', 'Grade A', 'no', 'ok', 'deal',
+        'price high', '-', ',', '.', '\n', '५००',
+    ]
+    rng = random.Random(7)
+    for _ in range(5000):
+        transcript = ''.join(rng.choice(tokens) + rng.choice(['', ' ', ' ']) for _ in range(rng.randint(1, 12)))
+        assert extract_entities(transcript) == extract_entities_reference(transcript), transcript
@@ -0,0 +1,157 @@
+import os
+import threading
+from collections import defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+class HttpPool:
+    """Shared keep-alive HTTP session with per-host connection pools.
+
+    Every outbound call goes through one requests.Session per process, so
+    repeated calls to the same host reuse an open TCP/TLS connection instead
+    of paying a fresh handshake. Idempotent requests are retried with
+    exponential backoff on connection errors and 502/503/504 responses.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=3,
+                 backoff_factor=0.5, timeouts=None, default_timeout=30):
+        """Initialize the pool.
+
+        Args:
+            pool_connections (int): Number of hosts to keep pools for
+            pool_maxsize (int): Maximum open connections kept per host
+            max_retries (int): Retries for idempotent requests
+            backoff_factor (float): Exponential backoff factor between retries
+            timeouts (dict): Timeout per endpoint name, in seconds or as a
+                (connect, read) tuple
+            default_timeout (float): Timeout for endpoints not in timeouts
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+        self._stats = defaultdict(lambda: {'requests': 0, 'reused': 0, 'new_connections': 0})
+
+    def get(self, url, endpoint=None, **kwargs):
+        return self.request('GET', url, endpoint=endpoint, **kwargs)
+
+    def head(self, url, endpoint=None, **kwargs):
+        return self.request('HEAD', url, endpoint=endpoint, **kwargs)
+
+    def post(self, url, endpoint=None, **kwargs):
+        return self.request('POST', url, endpoint=endpoint, **kwargs)
+
+    def request(self, method, url, endpoint=None, **kwargs):
+        """Send a request through the shared session.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            endpoint (str): Endpoint name used to look up the timeout
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The response
+        """
+        kwargs.setdefault('timeout', self.timeouts.get(endpoint, self.default_timeout))
+        return self._get_session().request(method, url, **kwargs)
+
+    def stats(self):
+        """Return connection reuse counters per host."""
+        with self._lock:
+            hosts = {host: dict(counts) for host, counts in self._stats.items()}
+
+        total_requests = sum(c['requests'] for c in hosts.values())
+        total_reused = sum(c['reused'] for c in hosts.values())
+        return {
+            'requests': total_requests,
+            'reused': total_reused,
+            'new_connections': total_requests - total_reused,
+            'hit_rate': round(total_reused / total_requests, 3) if total_requests else 0,
+            'hosts': hosts
+        }
+
+    def _record(self, host, reused):
+        with self._lock:
+            counts = self._stats[host]
+            counts['requests'] += 1
+            if reused:
+                counts['reused'] += 1
+            else:
+                counts['new_connections'] += 1
+
+    def _get_session(self):
+        # Sessions are created lazily per process so forked workers never share sockets
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._build_session()
+                    self._session_pid = pid
+        return self._session
+
+    def _build_session(self):
+        retries = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False
+        )
+        adapter = _CountingAdapter(
+            self._record,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retries
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report whether each request reused a connection."""
+
+    def __init__(self, record, **kwargs):
+        self._record = record
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        record = self._record
+
+        class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+            pass
+
+        class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+            pass
+
+        CountingHTTPConnectionPool.record = staticmethod(record)
+        CountingHTTPSConnectionPool.record = staticmethod(record)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+
+class _CountingPoolMixin:
+    record = None
+
+    def _make_request(self, conn, *args, **kwargs):
+        # A connection without an open socket is about to do a new TCP/TLS handshake
+        self.record(self.host, getattr(conn, 'sock', None) is not None)
+        return super()._make_request(conn, *args, **kwargs)
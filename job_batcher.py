@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class JobBatcher:
+    """Collects audio files from concurrent requests into multi-file STTT jobs."""
+
+    def __init__(self, run_job, window_seconds=0.5, max_files=8, max_concurrent_jobs=4):
+        """Initialize the batcher.
+
+        Args:
+            run_job (callable): Function taking a list of audio paths and returning
+                a dict mapping each path to its result data or an Exception
+            window_seconds (float): How long to wait for more files after the
+                first file of a batch arrives
+            max_files (int): Maximum number of files submitted in one job
+            max_concurrent_jobs (int): Maximum number of batched jobs in flight
+        """
+        self.run_job = run_job
+        self.window_seconds = window_seconds
+        self.max_files = max_files
+        self.max_concurrent_jobs = max_concurrent_jobs
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._batch_started_at = None
+        self._executor = None
+        self._thread = None
+
+        self._jobs_submitted = 0
+        self._files_submitted = 0
+
+    def submit(self, audio_path):
+        """Queue an audio file for the next batched job.
+
+        Args:
+            audio_path (str): Path to the audio file
+
+        Returns:
+            Future: Resolves to the file's result data, or raises its error
+        """
+        future = Future()
+        with self._condition:
+            self._ensure_started()
+            if not self._pending:
+                self._batch_started_at = time.monotonic()
+            self._pending.append((audio_path, future))
+            self._condition.notify()
+        return future
+
+    def stats(self):
+        """Return batching counters for health reporting."""
+        with self._condition:
+            return {
+                'jobs_submitted': self._jobs_submitted,
+                'files_submitted': self._files_submitted,
+                'avg_files_per_job': round(self._files_submitted / self._jobs_submitted, 2) if self._jobs_submitted else 0,
+                'pending_files': len(self._pending)
+            }
+
+    def _ensure_started(self):
+        # Started lazily so each gunicorn worker gets its own thread after fork
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_jobs)
+            self._thread = threading.Thread(target=self._collect_loop, daemon=True)
+            self._thread.start()
+
+    def _collect_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                # Keep collecting until the window closes or the batch is full
+                while len(self._pending) < self.max_files:
+                    remaining = self._batch_started_at + self.window_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._take_batch()
+                self._jobs_submitted += 1
+                self._files_submitted += len(batch)
+
+            self._executor.submit(self._run_batch, batch)
+
+    def _take_batch(self):
+        # The SDK keys uploads by file name, so a batch must not repeat one
+        batch = []
+        names = set()
+        leftover = []
+        for audio_path, future in self._pending:
+            name = os.path.basename(audio_path)
+            if len(batch) < self.max_files and name not in names:
+                batch.append((audio_path, future))
+                names.add(name)
+            else:
+                leftover.append((audio_path, future))
+
+        self._pending = leftover
+        self._batch_started_at = time.monotonic() if leftover else None
+        return batch
+
+    def _run_batch(self, batch):
+        try:
+            results = self.run_job([audio_path for audio_path, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for audio_path, future in batch:
+            result = results.get(audio_path)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            elif result is None:
+                future.set_exception(Exception("Audio processing failed"))
+            else:
+                future.set_result(result)
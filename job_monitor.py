@@ -0,0 +1,321 @@
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Bitrate assumed when the duration cannot be read from the file header
+ASSUMED_BITRATE = 64000
+
+
+def estimate_audio_seconds(audio_path):
+    """Estimate the duration of an audio file without decoding it.
+
+    WAV durations are read from the header; other formats are estimated from
+    the file size. The estimate only seeds the polling schedule, so a rough
+    value is fine.
+
+    Args:
+        audio_path (str): Path to the audio file
+
+    Returns:
+        float: Estimated duration in seconds
+    """
+    try:
+        with wave.open(audio_path, 'rb') as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, EOFError, OSError):
+        pass
+
+    try:
+        return os.path.getsize(audio_path) * 8 / ASSUMED_BITRATE
+    except OSError:
+        return 0.0
+
+
+def next_poll_interval(elapsed, expected, overdue_polls, min_interval, max_interval):
+    """Compute the delay before the next status poll of a job.
+
+    Args:
+        elapsed (float): Seconds since the job was started
+        expected (float): Expected total processing time
+        overdue_polls (int): Polls already made after the expected finish
+        min_interval (float): Shortest allowed delay
+        max_interval (float): Longest allowed delay
+
+    Returns:
+        float: Seconds to wait
+    """
+    remaining = expected - elapsed
+    if remaining > 0:
+        # Close half the distance to the expected finish on each poll
+        interval = remaining / 2
+    else:
+        # Overdue: poll quickly at first, then back off gradually
+        interval = min_interval * (1.5 ** max(0, overdue_polls - 1))
+    return min(max_interval, max(min_interval, interval))
+
+
+class _Waiter:
+    def __init__(self, job_id, audio_seconds, timeout, on_running=None):
+        self.job_id = job_id
+        self.audio_seconds = audio_seconds
+        self.on_running = on_running
+        self.submitted_at = time.monotonic()
+        self.deadline = self.submitted_at + timeout
+        self.running_at = None
+        self.polls = 0
+        self.overdue_polls = 0
+        self.errors = 0
+        self.cancelled = False
+        self.future = Future()
+
+
+class JobMonitor:
+    """Polls every outstanding STTT job from one scheduler thread.
+
+    Each job is polled on its own adaptive schedule. The first polls are
+    spaced out around the job's expected duration and get denser as it
+    approaches, so waiting requests wake soon after their job finishes
+    without polling every job at a fixed cadence. Expected durations are
+    learned from observed completion times per second of audio.
+    """
+
+    TERMINAL_STATES = {'completed', 'failed'}
+    MAX_POLL_ERRORS = 5
+
+    def __init__(self, get_status, min_interval=1.0, max_interval=15.0, timeout=600,
+                 initial_ratio=0.5, poll_workers=4, history=200):
+        """Initialize the monitor.
+
+        Args:
+            get_status (callable): Function taking a job ID and returning the
+                SDK JobStatusResponse
+            min_interval (float): Shortest gap between polls of one job
+            max_interval (float): Longest gap between polls of one job
+            timeout (float): Seconds before a waiting job times out
+            initial_ratio (float): Processing seconds per audio second assumed
+                before any job has completed
+            poll_workers (int): Threads used to issue status calls
+            history (int): Number of recent job timings kept for stats
+        """
+        self.get_status = get_status
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.poll_workers = poll_workers
+
+        self._ratio = initial_ratio
+        self._lock = threading.Condition()
+        self._schedule = []
+        self._waiters = {}
+        self._thread = None
+        self._executor = None
+        self._timings = deque(maxlen=history)
+
+    def wait(self, job_id, audio_seconds=0.0, on_running=None):
+        """Block until a started job completes or fails.
+
+        Args:
+            job_id (str): SarvamAI job ID
+            audio_seconds (float): Duration of the job's longest input file
+            on_running (callable): Called with no arguments from the poller
+                thread when the job is first seen running
+
+        Returns:
+            JobStatusResponse: Final job status
+
+        Raises:
+            TimeoutError: If the job does not finish within the timeout
+        """
+        return self.watch(job_id, audio_seconds, on_running).result()
+
+    def watch(self, job_id, audio_seconds=0.0, on_running=None):
+        """Start polling a started job without blocking.
+
+        Args:
+            job_id (str): SarvamAI job ID
+            audio_seconds (float): Duration of the job's longest input file
+            on_running (callable): Called with no arguments from the poller
+                thread when the job is first seen running
+
+        Returns:
+            Future: Resolves to the final JobStatusResponse, or raises
+                TimeoutError if the job does not finish within the timeout
+        """
+        waiter = _Waiter(job_id, audio_seconds, self.timeout, on_running)
+
+        with self._lock:
+            self._ensure_started()
+            self._waiters[job_id] = waiter
+            self._push(waiter, self._next_interval(waiter))
+
+        return waiter.future
+
+    def cancel(self, job_id):
+        """Stop polling a job whose result is no longer needed."""
+        with self._lock:
+            waiter = self._waiters.pop(job_id, None)
+            if waiter is not None:
+                waiter.cancelled = True
+
+    def expected_seconds(self, audio_seconds):
+        """Expected processing time for a job with the given audio duration."""
+        with self._lock:
+            return max(self.min_interval, audio_seconds * self._ratio)
+
+    def quantile_seconds(self, audio_seconds, quantile=0.95, min_samples=20):
+        """Processing time that the given fraction of recent jobs finished within.
+
+        Recent completion times are scaled to the job's audio duration, so
+        long and short recordings share one history.
+
+        Args:
+            audio_seconds (float): Duration of the job's longest input file
+            quantile (float): Fraction of jobs, e.g. 0.95 for the p95
+            min_samples (int): Completed jobs needed before estimating
+
+        Returns:
+            float: Estimated seconds, or None without enough history
+        """
+        with self._lock:
+            timings = [t for t in self._timings if t['state'].lower() == 'completed']
+        if len(timings) < min_samples:
+            return None
+
+        if audio_seconds > 0:
+            samples = sorted(t['total_seconds'] / t['audio_seconds'] for t in timings if t['audio_seconds'] > 0)
+            scale = audio_seconds
+        else:
+            samples = []
+        if not samples:
+            samples = sorted(t['total_seconds'] for t in timings)
+            scale = 1.0
+
+        rank = min(len(samples) - 1, max(0, math.ceil(quantile * len(samples)) - 1))
+        return max(self.min_interval, samples[rank] * scale)
+
+    def stats(self):
+        """Return per-job timing summaries for tuning the schedule."""
+        with self._lock:
+            timings = list(self._timings)
+            outstanding = len(self._waiters)
+            ratio = self._ratio
+
+        summary = {
+            'outstanding_jobs': outstanding,
+            'seconds_per_audio_second': round(ratio, 3),
+            'completed_jobs': len(timings)
+        }
+        if timings:
+            totals = sorted(t['total_seconds'] for t in timings)
+            summary.update({
+                'avg_queue_seconds': round(sum(t['queue_seconds'] for t in timings) / len(timings), 2),
+                'avg_run_seconds': round(sum(t['run_seconds'] for t in timings) / len(timings), 2),
+                'avg_polls': round(sum(t['polls'] for t in timings) / len(timings), 2),
+                'p50_total_seconds': round(totals[len(totals) // 2], 2),
+                'p95_total_seconds': round(totals[min(len(totals) - 1, int(len(totals) * 0.95))], 2),
+                'recent': timings[-10:]
+            })
+        return summary
+
+    def _ensure_started(self):
+        # Started lazily so each gunicorn worker gets its own thread after fork
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.poll_workers)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _push(self, waiter, delay):
+        heapq.heappush(self._schedule, (time.monotonic() + delay, id(waiter), waiter))
+        self._lock.notify()
+
+    def _next_interval(self, waiter):
+        elapsed = time.monotonic() - waiter.submitted_at
+        expected = max(self.min_interval, waiter.audio_seconds * self._ratio)
+        if elapsed >= expected:
+            waiter.overdue_polls += 1
+        return next_poll_interval(
+            elapsed, expected, waiter.overdue_polls, self.min_interval, self.max_interval
+        )
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._schedule or self._schedule[0][0] > time.monotonic():
+                    timeout = self._schedule[0][0] - time.monotonic() if self._schedule else None
+                    self._lock.wait(timeout)
+                _, _, waiter = heapq.heappop(self._schedule)
+                if waiter.cancelled:
+                    continue
+
+            self._executor.submit(self._poll, waiter)
+
+    def _poll(self, waiter):
+        try:
+            status = self.get_status(waiter.job_id)
+        except Exception as e:
+            logger.warning(f"Status poll failed for job {waiter.job_id}: {e}")
+            waiter.errors += 1
+            if waiter.errors >= self.MAX_POLL_ERRORS:
+                self._finish(waiter, error=e)
+            else:
+                with self._lock:
+                    self._push(waiter, self.min_interval)
+            return
+
+        now = time.monotonic()
+        waiter.polls += 1
+        waiter.errors = 0
+        state = status.job_state.lower()
+
+        if state == 'running' and waiter.running_at is None:
+            waiter.running_at = now
+            if waiter.on_running is not None:
+                try:
+                    waiter.on_running()
+                except Exception as e:
+                    logger.warning(f"on_running callback failed for job {waiter.job_id}: {e}")
+
+        if state in self.TERMINAL_STATES:
+            self._finish(waiter, status=status)
+        elif now > waiter.deadline:
+            self._finish(waiter, error=TimeoutError(
+                f"Job {waiter.job_id} did not complete within {self.timeout} seconds."
+            ))
+        else:
+            with self._lock:
+                self._push(waiter, self._next_interval(waiter))
+
+    def _finish(self, waiter, status=None, error=None):
+        now = time.monotonic()
+        total = now - waiter.submitted_at
+        running_at = waiter.running_at or waiter.submitted_at
+
+        with self._lock:
+            self._waiters.pop(waiter.job_id, None)
+            if status is not None and not waiter.cancelled:
+                self._timings.append({
+                    'job_id': waiter.job_id,
+                    'state': status.job_state,
+                    'audio_seconds': round(waiter.audio_seconds, 2),
+                    'queue_seconds': round(running_at - waiter.submitted_at, 2),
+                    'run_seconds': round(now - running_at, 2),
+                    'total_seconds': round(total, 2),
+                    'polls': waiter.polls
+                })
+                # Learn processing time per audio second from successful jobs
+                if waiter.audio_seconds > 0 and status.job_state.lower() == 'completed':
+                    observed = total / waiter.audio_seconds
+                    self._ratio = 0.8 * self._ratio + 0.2 * observed
+
+        if error is not None:
+            waiter.future.set_exception(error)
+        else:
+            waiter.future.set_result(status)
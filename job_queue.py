@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+class JobStore:
+    """SQLite-backed table of asynchronous translation jobs.
+
+    The table is shared by every gunicorn worker, so a job submitted to one
+    worker can be polled through any other.
+    """
+
+    def __init__(self, db_path):
+        """Open (and create if needed) the job table.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT,
+                    result TEXT,
+                    error TEXT,
+                    worker_pid INTEGER,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at)')
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def create(self, job_id, request):
+        """Record a new queued job."""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (job_id, status, request, worker_pid, created_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, 'queued', json.dumps(request), os.getpid(), time.time())
+            )
+
+    def mark_running(self, job_id):
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, started_at = ? WHERE job_id = ?',
+                ('running', time.time(), job_id)
+            )
+
+    def mark_completed(self, job_id, result):
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE job_id = ?',
+                ('completed', json.dumps(result), time.time(), job_id)
+            )
+
+    def mark_failed(self, job_id, error):
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?',
+                ('failed', error, time.time(), job_id)
+            )
+
+    def get(self, job_id):
+        """Fetch a job record.
+
+        Returns:
+            dict: Job record, or None if the job does not exist
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['request'] = json.loads(job['request']) if job['request'] else None
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def fail_orphaned(self):
+        """Fail unfinished jobs whose owning worker process no longer exists."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, worker_pid FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            orphaned = [job_id for job_id, pid in rows if not _pid_alive(pid)]
+            conn.executemany(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?',
+                [('failed', 'Job interrupted by worker restart', time.time(), job_id) for job_id in orphaned]
+            )
+        return len(orphaned)
+
+    def prune(self, older_than_seconds):
+        """Delete finished jobs older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN ('completed', 'failed') AND created_at < ?",
+                (cutoff,)
+            )
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Runs translation jobs on a bounded background executor."""
+
+    PRUNE_INTERVAL = 300
+
+    def __init__(self, store, max_workers=8, max_pending=500, retention_seconds=86400):
+        """Initialize the queue.
+
+        Args:
+            store (JobStore): Persistent job table
+            max_workers (int): Number of jobs processed concurrently
+            max_pending (int): Maximum number of queued or running jobs
+            retention_seconds (int): How long finished jobs are kept
+        """
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_prune = 0
+
+    def submit(self, work, request):
+        """Queue a job and return its ID immediately.
+
+        Args:
+            work (callable): Function run in the background; its return value
+                is stored as the job result
+            request (dict): Request payload recorded with the job
+
+        Returns:
+            str: The new job ID
+
+        Raises:
+            QueueFullError: If max_pending jobs are already in flight
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} jobs in flight)")
+            self._pending += 1
+
+            # Executor is created lazily so each gunicorn worker gets its own threads
+            if self._executor is None:
+                self.store.fail_orphaned()
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+            now = time.monotonic()
+            should_prune = now - self._last_prune > self.PRUNE_INTERVAL
+            if should_prune:
+                self._last_prune = now
+
+        if should_prune:
+            self.store.prune(self.retention_seconds)
+
+        job_id = uuid.uuid4().hex
+        try:
+            self.store.create(job_id, request)
+            self._executor.submit(self._run, job_id, work)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job_id
+
+    def backlogged(self):
+        """Return True if every worker is busy, so a new job would wait in the queue."""
+        with self._lock:
+            return self._pending >= self.max_workers
+
+    def stats(self):
+        """Return queue counters for health reporting."""
+        with self._lock:
+            return {
+                'in_flight': self._pending,
+                'max_pending': self.max_pending,
+                'workers': self.max_workers
+            }
+
+    def _run(self, job_id, work):
+        try:
+            self.store.mark_running(job_id)
+            result = work()
+            self.store.mark_completed(job_id, result)
+        except Exception as e:
+            self.store.mark_failed(job_id, str(e))
+        finally:
+            with self._lock:
+                self._pending -= 1
@@ -0,0 +1,176 @@
+import logging
+import os
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use so worker boot does not pay for the SDK import
+_sdk_lock = threading.Lock()
+_sdk_class = None
+_sdk_import_seconds = None
+
+
+def load_sdk():
+    """Import the SarvamAI SDK once and return its client class.
+
+    Returns:
+        type: sarvamai.SarvamAI
+    """
+    global _sdk_class, _sdk_import_seconds
+    if _sdk_class is None:
+        with _sdk_lock:
+            if _sdk_class is None:
+                started = time.perf_counter()
+                from sarvamai import SarvamAI
+                _sdk_import_seconds = time.perf_counter() - started
+                _sdk_class = SarvamAI
+    return _sdk_class
+
+
+class SarvamClientPool:
+    """Pool of SarvamAI clients, one per thread, created after fork.
+
+    Building a client loads the SDK's resource modules and an HTTP client,
+    which is slow enough to matter on every worker boot. warm() does that
+    work on a background thread so the worker can answer health checks
+    straight away, and get() hands each thread its own client so request,
+    download and poller threads never share one. When a thread exits, its
+    client goes back to the idle list, so the short-lived executor threads
+    of batch and chunked requests reuse warm clients instead of building
+    new ones mid-request. Clients are never carried
+    across a fork: a forked child drops its parent's clients and warms its
+    own.
+    """
+
+    def __init__(self, api_key, size=4, factory=None):
+        """Initialize the pool.
+
+        Args:
+            api_key (str): SarvamAI API subscription key
+            size (int): Number of clients created ahead of time by warm()
+            factory (callable): Builds a client from the API key (defaults
+                to sarvamai.SarvamAI, imported lazily)
+        """
+        self.api_key = api_key
+        self.size = size
+        self.factory = factory
+
+        self._lock = threading.Lock()
+        self._warm_requested = False
+        self._reset()
+
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def warm(self):
+        """Create the pool's clients on a background thread.
+
+        Returns:
+            threading.Thread: The warming thread (None if already warming)
+        """
+        with self._lock:
+            self._warm_requested = True
+            if self._warm_thread is not None:
+                return None
+            self._warm_thread = threading.Thread(target=self._warm, daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def get(self):
+        """Return the calling thread's client, creating it if needed."""
+        if self._pid != os.getpid():
+            # Forked without the at-fork hook (or before it ran)
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            return lease.client
+
+        with self._lock:
+            idle = self._idle
+            client = idle.pop() if idle else None
+        if client is None:
+            client = self._create()
+        self._local.lease = _Lease(client)
+        # Dropped with the thread-local data when the thread exits
+        weakref.finalize(self._local.lease, self._return, client, idle)
+
+        with self._lock:
+            self._threads_served += 1
+        return client
+
+    def stats(self):
+        """Return pool size, usage and startup timings."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'created': self._created,
+                'returned': self._returned,
+                'threads_served': self._threads_served,
+                'warm': self._warm_seconds is not None,
+                'sdk_import_seconds': _round(_sdk_import_seconds),
+                'warm_seconds': _round(self._warm_seconds)
+            }
+
+    def _warm(self):
+        started = time.perf_counter()
+        try:
+            clients = [self._create() for _ in range(self.size)]
+        except Exception:
+            logger.exception('Failed to warm SarvamAI clients')
+            return
+
+        with self._lock:
+            self._idle.extend(clients)
+            self._warm_seconds = time.perf_counter() - started
+        logger.info('Warmed %d SarvamAI clients in %.3fs', len(clients), self._warm_seconds)
+
+    def _create(self):
+        factory = self.factory or load_sdk()
+        client = factory(api_subscription_key=self.api_key)
+        # Touch the job resource so its lazy import happens here, not mid-request
+        client.speech_to_text_translate_job
+        with self._lock:
+            self._created += 1
+        return client
+
+    def _return(self, client, idle):
+        with self._lock:
+            # A reset (fork) replaced the idle list; its clients are dropped
+            if idle is self._idle:
+                idle.append(client)
+                self._returned += 1
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._idle = []
+        self._created = 0
+        self._returned = 0
+        self._threads_served = 0
+        self._warm_thread = None
+        self._warm_seconds = None
+
+    def _after_fork(self):
+        # The child has only the forking thread, so the lock is recreated
+        self._lock = threading.Lock()
+        self._reset()
+        if self._warm_requested:
+            self.warm()
+
+
+class _Lease:
+    # Holds a thread's client; its finalizer returns the client to the pool
+    __slots__ = ('client', '__weakref__')
+
+    def __init__(self, client):
+        self.client = client
+
+
+def _round(seconds):
+    return round(seconds, 3) if seconds is not None else None
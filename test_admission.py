@@ -0,0 +1,184 @@
+"""
+Tests for fair admission control and 429 load shedding
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from werkzeug.test import EnvironBuilder
+
+from admission import AdmissionController, OverloadedError
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.005)
+
+
+class Queued:
+    """A request waiting in admit() on its own thread, recording the admission order."""
+
+    def __init__(self, controller, client_key, order):
+        self.client_key = client_key
+        self.ticket = None
+        self.error = None
+
+        def run():
+            try:
+                self.ticket = controller.admit(client_key)
+                order.append(self)
+            except OverloadedError as e:
+                self.error = e
+
+        depth = controller.stats()['queue_depth']
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        wait_for(lambda: controller.stats()['queue_depth'] > depth or self.error is not None)
+
+
+def controller(**kwargs):
+    kwargs.setdefault('initial_service_seconds', 0.01)
+    return AdmissionController(**kwargs)
+
+
+def test_admits_immediately_while_slots_are_free():
+    admission = controller(max_concurrent=2)
+    with admission.admit('a'), admission.admit('b'):
+        assert admission.stats()['active'] == 2
+    assert admission.stats()['active'] == 0
+
+
+def test_free_slots_go_round_robin_across_clients():
+    admission = controller(max_concurrent=1, max_queue=10)
+    running = admission.admit('busy')
+
+    order = []
+    waiting = [Queued(admission, key, order) for key in ('a', 'a', 'a', 'b', 'c')]
+
+    # Each release hands the slot to the next client in turn
+    running.release()
+    for admitted in range(1, len(waiting) + 1):
+        wait_for(lambda: len(order) == admitted)
+        order[-1].ticket.release()
+
+    assert [w.client_key for w in order] == ['a', 'b', 'c', 'a', 'a']
+    assert admission.stats()['active'] == 0
+
+
+def test_sheds_when_the_queue_or_a_client_is_full():
+    admission = controller(max_concurrent=1, max_queue=3, max_queued_per_client=2)
+    running = admission.admit('busy')
+    order = []
+    Queued(admission, 'a', order)
+    Queued(admission, 'a', order)
+
+    with pytest.raises(OverloadedError) as shed:
+        admission.admit('a')
+    assert shed.value.reason == 'client_limit'
+
+    Queued(admission, 'b', order)
+    with pytest.raises(OverloadedError) as shed:
+        admission.check('c')
+    assert shed.value.reason == 'queue_full'
+    assert shed.value.retry_after >= 1
+
+    assert admission.stats()['shed'] == {'queue_full': 1, 'client_limit': 1, 'wait_budget': 0, 'timeout': 0}
+    running.release()
+
+
+def test_sheds_on_estimated_wait_and_on_timeout():
+    admission = AdmissionController(max_concurrent=1, max_wait_seconds=1, initial_service_seconds=10)
+    running = admission.admit('busy')
+    with pytest.raises(OverloadedError) as shed:
+        admission.admit('a')
+    assert shed.value.reason == 'wait_budget'
+
+    admission = controller(max_concurrent=1, max_wait_seconds=0.05)
+    running = admission.admit('busy')
+    with pytest.raises(OverloadedError) as shed:
+        admission.admit('a')
+    assert shed.value.reason == 'timeout'
+    assert admission.stats()['queue_depth'] == 0
+    running.release()
+    assert admission.stats()['active'] == 0
+
+
+def test_ticket_release_is_idempotent_across_threads():
+    admission = controller(max_concurrent=1)
+    ticket = admission.admit('a')
+    threads = [threading.Thread(target=ticket.release) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ticket.release()
+
+    assert admission.stats()['active'] == 0
+    with admission.admit('b'):
+        assert admission.stats()['active'] == 1
+
+
+@pytest.mark.parametrize('close_early', [False, True])
+def test_streamed_translate_releases_its_ticket_once(monkeypatch, close_early):
+    import api
+
+    admission = controller(max_concurrent=1)
+    monkeypatch.setattr(api, 'admission', admission)
+    finish = threading.Event()
+
+    def translate_from_url(audio_url, progress=None):
+        progress('downloaded', bytes=10)
+        finish.wait(5)
+        return {'status': 'success', 'language_code': 'hi-IN', 'speakers': []}
+
+    monkeypatch.setattr(api.translation_service, 'translate_from_url', translate_from_url)
+    client = api.app.test_client()
+    response = client.post('/translate', json={'audio_url': 'https://audio.example/a.mp3'},
+                           headers={'Accept': 'application/x-ndjson'}, buffered=False)
+    assert response.status_code == 200
+    lines = response.response
+
+    assert json.loads(next(lines))['event'] == 'accepted'
+    if close_early:
+        # The client went away, but the worker keeps translating: the slot
+        # stays held until it finishes
+        response.close()
+        time.sleep(0.05)
+        assert admission.stats()['active'] == 1
+        finish.set()
+    else:
+        finish.set()
+        events = [json.loads(line)['event'] for line in lines]
+        assert events[-1] == 'done'
+        response.close()
+
+    wait_for(lambda: admission.stats()['active'] == 0)
+    time.sleep(0.05)
+    assert admission.stats()['active'] == 0
+    with admission.admit('next'):
+        assert admission.stats()['active'] == 1
+
+
+def test_streamed_translate_closed_before_starting_frees_its_ticket(monkeypatch):
+    import api
+
+    admission = controller(max_concurrent=1)
+    monkeypatch.setattr(api, 'admission', admission)
+    calls = []
+    monkeypatch.setattr(api.translation_service, 'translate_from_url',
+                        lambda audio_url, progress=None: calls.append(audio_url))
+
+    # Call the WSGI app directly, as the test client reads the first chunk
+    environ = EnvironBuilder(method='POST', path='/translate', json={'audio_url': 'https://audio.example/a.mp3'},
+                             headers={'Accept': 'application/x-ndjson'}).get_environ()
+    app_iter = api.app(environ, lambda status, headers, exc_info=None: None)
+    assert admission.stats()['active'] == 1
+
+    # Never read, so no worker started: closing the response frees the slot
+    app_iter.close()
+    assert admission.stats()['active'] == 0
+    assert calls == []
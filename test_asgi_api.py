@@ -0,0 +1,71 @@
+"""
+Tests for the asyncio API's error contract and SarvamAI concurrency limit
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import asgi_api
+from async_translation_service import AsyncTranslationService
+
+
+def test_oversized_upload_returns_413(monkeypatch):
+    monkeypatch.setitem(asgi_api.app.config, 'MAX_CONTENT_LENGTH', 1024)
+
+    async def post():
+        client = asgi_api.app.test_client()
+        return await client.post('/translate-file', data=b'x' * 4096, headers={
+            'Content-Type': 'multipart/form-data; boundary=xyz'
+        })
+
+    response = asyncio.run(post())
+    assert response.status_code == 413
+    assert asyncio.run(response.get_json())['status'] == 'error'
+
+
+class FakeJobs:
+    """Minimal speech_to_text_translate_job stand-in that never finishes on its own."""
+
+    def __init__(self):
+        self.started = 0
+
+    async def create_job(self, **kwargs):
+        async def get_file_results():
+            return {'successful': [], 'failed': [{'error_message': 'boom'}]}
+        return SimpleNamespace(job_id=f'job-{self.started}', get_file_results=get_file_results)
+
+    async def start(self, job_id):
+        self.started += 1
+
+
+def test_polling_does_not_hold_a_submission_slot(tmp_path):
+    audio = tmp_path / 'call.mp3'
+    audio.write_bytes(b'\0' * 100)
+
+    async def run():
+        service = AsyncTranslationService('test-key', sarvam_limit=1)
+        jobs = FakeJobs()
+        service.client = SimpleNamespace(speech_to_text_translate_job=jobs)
+        release = asyncio.Event()
+
+        async def upload(job_id, audio_path):
+            pass
+
+        async def wait(job_id, audio_seconds):
+            await release.wait()
+
+        service._upload = upload
+        service._wait = wait
+
+        tasks = [asyncio.create_task(service.process_audio(str(audio))) for _ in range(5)]
+        for _ in range(20):
+            await asyncio.sleep(0)
+        # Every job was submitted although only one submission slot exists
+        started = jobs.started
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return started, results
+
+    started, results = asyncio.run(run())
+    assert started == 5
+    assert all(str(r) == 'boom' for r in results)
@@ -0,0 +1,126 @@
+"""
+Tests for long-call chunking and the merge of per-chunk STTT results
+"""
+
+import numpy as np
+
+from audio_chunking import LongCallChunker, merge_chunk_results
+from audio_preprocess import SAMPLE_RATE
+
+
+def entry(speaker, start, end, text='...'):
+    return {'speaker_id': speaker, 'start_time_seconds': start, 'end_time_seconds': end, 'transcript': text}
+
+
+def speakers(result):
+    return [(e['speaker_id'], e['start_time_seconds'], e['end_time_seconds'])
+            for e in result['diarized_transcript']['entries']]
+
+
+# Two chunks cut at 100s, overlapping by 5s on each side of the cut
+CHUNKS = [
+    {'path': 'a.mp3', 'offset': 0.0, 'start': 0.0, 'end': 100.0},
+    {'path': 'b.mp3', 'offset': 95.0, 'start': 100.0, 'end': 200.0},
+]
+
+
+def test_times_are_shifted_and_overlap_kept_once():
+    results = [
+        {'language_code': 'hi-IN', 'transcript': 'first',
+         'diarized_transcript': {'entries': [entry('SPEAKER_00', 0, 97), entry('SPEAKER_00', 97, 103)]}},
+        {'language_code': 'hi-IN', 'transcript': 'second',
+         'diarized_transcript': {'entries': [entry('SPEAKER_00', 2, 8), entry('SPEAKER_00', 8, 100)]}},
+    ]
+    merged = merge_chunk_results(CHUNKS, results)
+
+    # The 97-103 entry appears in both chunks; only the chunk owning its midpoint keeps it
+    assert speakers(merged) == [('SPEAKER_00', 0, 97), ('SPEAKER_00', 97, 103), ('SPEAKER_00', 103, 195)]
+    assert merged['transcript'] == 'first second'
+    assert merged['language_code'] == 'hi-IN'
+
+
+def test_speaker_labels_swapped_across_the_cut_are_realigned():
+    results = [
+        {'diarized_transcript': {'entries': [
+            entry('SPEAKER_00', 0, 50), entry('SPEAKER_01', 50, 98), entry('SPEAKER_00', 98, 104),
+        ]}},
+        # The second job numbered the speakers the other way round
+        {'diarized_transcript': {'entries': [
+            entry('SPEAKER_01', 3, 9), entry('SPEAKER_00', 9, 60), entry('SPEAKER_01', 60, 105),
+        ]}},
+    ]
+    merged = merge_chunk_results(CHUNKS, results)
+
+    assert speakers(merged) == [
+        ('SPEAKER_00', 0, 50), ('SPEAKER_01', 50, 98), ('SPEAKER_00', 98, 104),
+        ('SPEAKER_01', 104, 155), ('SPEAKER_00', 155, 200),
+    ]
+    assert merged['language_code'] == 'N/A'
+
+
+def test_new_speaker_in_later_chunk_gets_an_unused_id():
+    results = [
+        {'diarized_transcript': {'entries': [entry('SPEAKER_00', 0, 104)]}},
+        {'diarized_transcript': {'entries': [entry('SPEAKER_01', 0, 9), entry('SPEAKER_00', 9, 105)]}},
+    ]
+    merged = merge_chunk_results(CHUNKS, results)
+
+    assert speakers(merged) == [('SPEAKER_00', 0, 104), ('SPEAKER_00_2', 104, 200)]
+
+
+def test_entries_without_times_are_kept():
+    results = [
+        {'diarized_transcript': {'entries': [{'speaker_id': 'SPEAKER_00', 'transcript': 'x'}]}},
+        {'diarized_transcript': None},
+    ]
+    merged = merge_chunk_results(CHUNKS, results)
+    assert merged['diarized_transcript']['entries'] == [{'speaker_id': 'SPEAKER_00', 'transcript': 'x'}]
+
+
+class FakeCodec:
+    """Stands in for AudioPreprocessor, recording what the chunker asks of it."""
+
+    def __init__(self, seconds, probed=True):
+        self.seconds = seconds
+        self.probed = probed
+        self.loaded = 0
+        self.saved = []
+
+    def duration(self, audio_path):
+        return self.seconds if self.probed else None
+
+    def load(self, audio_path):
+        self.loaded += 1
+        # Speech everywhere except one second of silence every 30 seconds
+        samples = np.full(int(self.seconds * SAMPLE_RATE), 8000, dtype=np.int16)
+        for second in range(30, int(self.seconds), 30):
+            samples[second * SAMPLE_RATE:(second + 1) * SAMPLE_RATE] = 0
+        return samples
+
+    def save(self, samples):
+        self.saved.append(len(samples))
+        return f'chunk{len(self.saved)}.mp3'
+
+
+def test_short_recordings_are_not_decoded():
+    codec = FakeCodec(seconds=300)
+    assert LongCallChunker(codec, min_seconds=600).split('call.mp3') is None
+    assert codec.loaded == 0
+
+
+def test_long_recordings_are_split_with_overlap():
+    codec = FakeCodec(seconds=400)
+    chunks = LongCallChunker(codec, min_seconds=200, chunk_seconds=100, overlap_seconds=5).split('call.mp3')
+
+    assert codec.loaded == 1
+    assert [(c['start'], c['end']) for c in chunks] == [
+        (0.0, 90.0), (90.0, 180.0), (180.0, 270.0), (270.0, 360.0), (360.0, 400.0),
+    ]
+    assert [c['offset'] for c in chunks] == [0.0, 85.0, 175.0, 265.0, 355.0]
+    assert codec.saved[0] == 95 * SAMPLE_RATE
+
+
+def test_unknown_duration_falls_back_to_decoding():
+    codec = FakeCodec(seconds=300, probed=False)
+    assert LongCallChunker(codec, min_seconds=600).split('call.mp3') is None
+    assert codec.loaded == 1
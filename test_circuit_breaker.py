@@ -0,0 +1,155 @@
+"""
+Tests for the circuit breaker around SarvamAI jobs
+"""
+
+import time
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+    return clock
+
+
+def fail(breaker, error=RuntimeError('upstream 503')):
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+
+def succeed(breaker):
+    with breaker.guard():
+        pass
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=30)
+    fail(breaker)
+    succeed(breaker)
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as refused:
+        breaker.guard()
+    assert refused.value.retry_after == 30
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_opens_on_failure_rate(clock):
+    breaker = CircuitBreaker(failure_threshold=100, failure_rate=0.5, window=10, min_calls=6)
+    for _ in range(2):
+        fail(breaker)
+        succeed(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_probes_close_or_reopen_with_backoff(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, max_open_seconds=25,
+                             half_open_max_calls=1, success_threshold=2)
+    fail(breaker)
+    clock.now += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # One probe at a time; a failed probe reopens for twice as long
+    probe = breaker.guard()
+    with pytest.raises(CircuitOpenError):
+        breaker.guard()
+    with pytest.raises(RuntimeError):
+        with probe:
+            raise RuntimeError('still down')
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 19
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 1
+    fail(breaker)
+    clock.now += 25  # capped at max_open_seconds
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    succeed(breaker)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    succeed(breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    # Closing resets the open period
+    fail(breaker)
+    assert breaker.stats()['open_seconds_remaining'] == 10
+    assert breaker.stats()['times_opened'] == 4
+
+
+def fake_service(breaker, **fake_options):
+    from benchmarks.fake_sarvam import FakeSarvamAI
+    from job_monitor import JobMonitor
+    from translation_service import TranslationService
+
+    fake = FakeSarvamAI(job_latency=0, queue_seconds=0, **fake_options)
+    service = TranslationService('test-key', client=fake, circuit_breaker=breaker)
+    service.job_monitor = JobMonitor(service.get_job_status, min_interval=0.01, max_interval=0.05)
+    return fake, service
+
+
+def test_failing_jobs_drive_the_breaker_through_every_state(tmp_path):
+    # Jobs end in SarvamAI's Failed state, with every file failed
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=0.2, success_threshold=1)
+    fake, service = fake_service(breaker, job_failure_rate=1.0)
+
+    audio = tmp_path / 'call.mp3'
+    audio.write_bytes(b'\0' * 1000)
+
+    for _ in range(3):
+        result = service.run_job([str(audio)])
+        assert isinstance(result[str(audio)], Exception)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        service.run_job([str(audio)])
+    assert fake.counters['jobs'] == 3
+
+    # A failed probe reopens the circuit
+    time.sleep(0.2)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    service.run_job([str(audio)])
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Once SarvamAI recovers, a successful probe closes it
+    fake.job_failure_rate = 0.0
+    time.sleep(0.4)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    result = service.run_job([str(audio)])
+    assert not isinstance(result[str(audio)], Exception)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert fake.counters['jobs'] == 5
+
+
+def test_rejected_files_do_not_trip_the_breaker(tmp_path):
+    # The jobs complete, but SarvamAI rejects every file (e.g. corrupt audio)
+    breaker = CircuitBreaker(failure_threshold=2, open_seconds=60)
+    fake, service = fake_service(breaker, failure_rate=1.0)
+
+    audio = tmp_path / 'corrupt.mp3'
+    audio.write_bytes(b'\0' * 1000)
+
+    for _ in range(5):
+        result = service.run_job([str(audio)])
+        assert isinstance(result[str(audio)], Exception)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()['times_opened'] == 0
+    assert fake.counters['jobs'] == 5
@@ -0,0 +1,163 @@
+"""
+Tests for the download scheduler and prefetching of queued /jobs audio
+"""
+
+import os
+import threading
+import time
+
+from download_scheduler import DownloadScheduler
+from job_queue import JobQueue, JobStore
+from translation_service import TranslationService
+
+
+class CountingDownloads:
+    """Stands in for TranslationService._download_audio, blocking until released."""
+
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.calls = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, audio_url, headers=None):
+        with self._lock:
+            self.calls += 1
+            path = self.tmp_path / f'audio{self.calls}.mp3'
+        self.release.wait(5)
+        path.write_bytes(b'\0' * 10)
+        return str(path), {'etag': None}
+
+
+def make_service(tmp_path):
+    service = TranslationService('test-key', download_scheduler=DownloadScheduler(max_workers=2))
+    service._download_audio = CountingDownloads(tmp_path)
+    return service
+
+
+def test_request_joins_an_in_flight_prefetch(tmp_path):
+    service = make_service(tmp_path)
+    assert service.prefetch('https://audio.example/a.mp3')
+
+    fetched = []
+    worker = threading.Thread(target=lambda: fetched.append(service._fetch_url('https://audio.example/a.mp3')))
+    worker.start()
+    service._download_audio.release.set()
+    worker.join(5)
+
+    _, temp_file, _ = fetched[0]
+    assert service._download_audio.calls == 1
+    assert os.path.exists(temp_file)
+    assert service.prefetch_stats()['held'] == 0
+
+
+def test_failed_prefetch_falls_back_to_a_download(tmp_path):
+    service = make_service(tmp_path)
+    downloads = service._download_audio
+
+    def fail_once(audio_url, headers=None):
+        service._download_audio = downloads
+        raise ConnectionError('reset')
+
+    service._download_audio = fail_once
+    service.prefetch('https://audio.example/a.mp3')
+    downloads.release.set()
+
+    _, temp_file, _ = service._fetch_url('https://audio.example/a.mp3')
+    assert downloads.calls == 1
+    assert os.path.exists(temp_file)
+
+
+def test_cancelled_prefetch_removes_its_file(tmp_path):
+    service = make_service(tmp_path)
+    service.prefetch('https://audio.example/a.mp3')
+    service.cancel_prefetch('https://audio.example/a.mp3')
+    assert service.prefetch_stats()['held'] == 0
+    service._download_audio.release.set()
+
+    # The file is removed by a callback once the download finishes
+    deadline = time.monotonic() + 5
+    while list(tmp_path.iterdir()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_job_queue_reports_backlog(tmp_path):
+    queue = JobQueue(JobStore(str(tmp_path / 'jobs.db')), max_workers=1)
+    release = threading.Event()
+    assert not queue.backlogged()
+    queue.submit(lambda: release.wait(5), {})
+    assert queue.backlogged()
+    release.set()
+
+
+class Tracker:
+    """Download function that records how many run at once per host."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.active = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, host, hold=True):
+        with self._lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        if hold:
+            self.release.wait(5)
+        with self._lock:
+            self.active[host] -= 1
+        return host
+
+
+def test_per_host_limit_does_not_block_other_hosts():
+    scheduler = DownloadScheduler(max_workers=4, per_host_limit=2)
+    tracker = Tracker()
+    slow = [scheduler.submit(f'https://slow.example/{i}.mp3', tracker, 'slow') for i in range(5)]
+
+    # Queued behind the slow host's downloads, but a free worker serves it
+    fast = scheduler.submit('https://fast.example/a.mp3', tracker, 'fast', hold=False)
+    assert fast.result(5) == 'fast'
+    assert tracker.peak['slow'] == 2
+    assert scheduler.stats()['queue_depth'] == 3
+
+    tracker.release.set()
+    assert [f.result(5) for f in slow] == ['slow'] * 5
+    assert tracker.peak['slow'] == 2
+
+
+def test_errors_propagate_and_are_counted():
+    scheduler = DownloadScheduler(max_workers=1, size_of=len)
+
+    def broken():
+        raise ConnectionError('reset')
+
+    failed = scheduler.submit('https://a.example/x', broken)
+    ok = scheduler.submit('https://a.example/y', lambda: b'12345')
+    assert ok.result(5) == b'12345'
+    try:
+        failed.result(5)
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError('expected the download error')
+
+    stats = scheduler.stats()
+    assert (stats['completed'], stats['failed']) == (1, 1)
+    assert stats['bytes_per_second'] == round(5 / scheduler.window_seconds)
+
+
+def test_per_host_rate_spaces_out_new_downloads():
+    scheduler = DownloadScheduler(max_workers=4, per_host_limit=1, per_host_rate=20)
+    started = []
+    futures = [
+        scheduler.submit('https://rate.example/a', lambda: started.append(time.monotonic()))
+        for _ in range(4)
+    ]
+    for future in futures:
+        future.result(5)
+
+    # A burst of one, then one new download every 1/20 s
+    gaps = [b - a for a, b in zip(started, started[1:])]
+    assert all(gap >= 0.04 for gap in gaps[1:])
@@ -0,0 +1,72 @@
+"""
+Tests for batching concurrent requests into multi-file STTT jobs
+"""
+
+import threading
+
+import pytest
+
+from job_batcher import JobBatcher
+
+
+class RecordingJobs:
+    """Stands in for TranslationService.run_job, recording each job's files."""
+
+    def __init__(self, fail=()):
+        self.jobs = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, audio_paths):
+        with self._lock:
+            self.jobs.append(list(audio_paths))
+        results = {}
+        for path in audio_paths:
+            results[path] = ValueError(f'{path} failed') if path in self.fail else {'transcript': path}
+        return results
+
+
+def test_concurrent_files_share_one_job():
+    jobs = RecordingJobs()
+    batcher = JobBatcher(jobs, window_seconds=0.2, max_files=8)
+    futures = [batcher.submit(f'/tmp/a{i}.mp3') for i in range(3)]
+
+    assert [f.result(5)['transcript'] for f in futures] == ['/tmp/a0.mp3', '/tmp/a1.mp3', '/tmp/a2.mp3']
+    assert jobs.jobs == [['/tmp/a0.mp3', '/tmp/a1.mp3', '/tmp/a2.mp3']]
+    assert batcher.stats()['avg_files_per_job'] == 3
+
+
+def test_full_batches_and_repeated_names_are_split():
+    jobs = RecordingJobs()
+    batcher = JobBatcher(jobs, window_seconds=0.2, max_files=2)
+    paths = ['/tmp/x/a.mp3', '/tmp/y/a.mp3', '/tmp/b.mp3', '/tmp/c.mp3']
+    futures = [batcher.submit(path) for path in paths]
+    for future in futures:
+        future.result(5)
+
+    # Upload names must be unique within a job
+    for job in jobs.jobs:
+        assert len(job) <= 2
+        assert len({path.rsplit('/', 1)[1] for path in job}) == len(job)
+    assert sorted(path for job in jobs.jobs for path in job) == sorted(paths)
+
+
+def test_failures_reach_only_their_own_callers():
+    batcher = JobBatcher(RecordingJobs(fail={'/tmp/bad.mp3'}), window_seconds=0.1, max_files=4)
+    good = batcher.submit('/tmp/good.mp3')
+    bad = batcher.submit('/tmp/bad.mp3')
+
+    assert good.result(5) == {'transcript': '/tmp/good.mp3'}
+    with pytest.raises(ValueError):
+        bad.result(5)
+
+
+def test_a_failed_job_fails_every_file_in_it():
+    def run_job(audio_paths):
+        raise ConnectionError('upload failed')
+
+    batcher = JobBatcher(run_job, window_seconds=0.1, max_files=4)
+    futures = [batcher.submit(f'/tmp/f{i}.mp3') for i in range(2)]
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(5)
@@ -0,0 +1,182 @@
+"""
+Tests for the persistent job table and the asynchronous /jobs API
+"""
+
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue, JobStore, QueueFullError
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs' / 'jobs.db'))
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_submitted_jobs_round_trip_through_the_store(store):
+    queue = JobQueue(store, max_workers=2)
+    release = threading.Event()
+
+    def work():
+        release.wait(5)
+        return {'status': 'success', 'speakers': []}
+
+    job_id = queue.submit(work, {'audio_url': 'https://audio.example/a.mp3'})
+    job = store.get(job_id)
+    assert job['status'] in ('queued', 'running')
+    assert job['request'] == {'audio_url': 'https://audio.example/a.mp3'}
+    assert queue.stats()['in_flight'] == 1
+
+    release.set()
+    wait_for(lambda: store.get(job_id)['status'] == 'completed')
+    job = store.get(job_id)
+    assert job['result'] == {'status': 'success', 'speakers': []}
+    assert job['created_at'] <= job['started_at'] <= job['finished_at']
+    wait_for(lambda: queue.stats()['in_flight'] == 0)
+
+    def fail():
+        raise RuntimeError("Download failed")
+
+    job_id = queue.submit(fail, {})
+    wait_for(lambda: store.get(job_id)['status'] == 'failed')
+    assert store.get(job_id)['error'] == "Download failed"
+    assert store.get('missing') is None
+
+
+def test_queue_rejects_jobs_beyond_max_pending(store):
+    queue = JobQueue(store, max_workers=1, max_pending=2)
+    release = threading.Event()
+    for _ in range(2):
+        queue.submit(lambda: release.wait(5), {})
+
+    with pytest.raises(QueueFullError):
+        queue.submit(lambda: None, {})
+    release.set()
+    wait_for(lambda: queue.stats()['in_flight'] == 0)
+    queue.submit(lambda: None, {})
+
+
+def test_restart_fails_jobs_of_dead_workers(store):
+    store.create('orphan', {})
+    store.create('running-orphan', {})
+    store.mark_running('running-orphan')
+    store.create('alive', {})
+    store.create('done', {})
+    store.mark_completed('done', {'status': 'success'})
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE jobs SET worker_pid = ? WHERE job_id != 'alive'", (dead_pid(),))
+
+    # The first submit after a restart fails the jobs its predecessor left behind
+    queue = JobQueue(store)
+    queue.submit(lambda: None, {})
+
+    for job_id in ('orphan', 'running-orphan'):
+        assert store.get(job_id)['status'] == 'failed'
+        assert store.get(job_id)['error'] == 'Job interrupted by worker restart'
+    assert store.get('alive')['status'] == 'queued'
+    assert store.get('done')['status'] == 'completed'
+    assert store.fail_orphaned() == 0
+
+
+def test_prune_deletes_only_old_finished_jobs(store):
+    for job_id in ('old-completed', 'old-failed', 'old-queued', 'new-completed'):
+        store.create(job_id, {})
+    store.mark_completed('old-completed', {})
+    store.mark_failed('old-failed', 'error')
+    store.mark_completed('new-completed', {})
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE jobs SET created_at = ? WHERE job_id LIKE 'old-%'", (time.time() - 7200,))
+
+    store.prune(3600)
+    assert store.get('old-completed') is None
+    assert store.get('old-failed') is None
+    assert store.get('old-queued') is not None
+    assert store.get('new-completed') is not None
+
+
+class RecordingService:
+    """Stands in for the API's translation service, blocking until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.prefetched = []
+        self.cancelled = []
+
+    def translate_from_url(self, audio_url):
+        self.release.wait(5)
+        return {'status': 'success', 'language_code': 'hi-IN', 'speakers': []}
+
+    def prefetch(self, audio_url):
+        self.prefetched.append(audio_url)
+        return True
+
+    def cancel_prefetch(self, audio_url):
+        self.cancelled.append(audio_url)
+
+
+@pytest.fixture
+def api_client(store, monkeypatch):
+    import api
+
+    service = RecordingService()
+    monkeypatch.setattr(api, 'job_queue', JobQueue(store, max_workers=1, max_pending=2))
+    monkeypatch.setattr(api, 'translation_service', service)
+    yield api.app.test_client(), service
+    service.release.set()
+
+
+def test_jobs_api_queues_and_reports_jobs(api_client):
+    client, service = api_client
+
+    assert client.post('/jobs', data='audio').status_code == 400
+    assert client.post('/jobs', json={}).status_code == 400
+    assert client.get('/jobs/missing').status_code == 404
+
+    response = client.post('/jobs', json={
+        'audio_url': 'https://audio.example/a.mp3', 'seller_buyer_meta_data': {'seller_identifier': 'S1'}
+    })
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert response.get_json()['status_url'] == f'/jobs/{job_id}'
+    assert client.get(f'/jobs/{job_id}').get_json()['job_status'] in ('queued', 'running')
+
+    service.release.set()
+    wait_for(lambda: client.get(f'/jobs/{job_id}').get_json()['job_status'] == 'completed')
+    data = client.get(f'/jobs/{job_id}').get_json()
+    assert data['result']['seller_buyer_meta_data'] == {'seller_identifier': 'S1'}
+    assert data['result']['language_code'] == 'hi-IN'
+
+
+def test_jobs_prefetch_only_when_backlogged(api_client):
+    client, service = api_client
+
+    # The only worker is free, so the first job starts at once
+    client.post('/jobs', json={'audio_url': 'https://audio.example/1.mp3'})
+    assert service.prefetched == []
+
+    # It is busy now: the next job waits, so its audio is prefetched
+    client.post('/jobs', json={'audio_url': 'https://audio.example/2.mp3'})
+    assert service.prefetched == ['https://audio.example/2.mp3']
+
+    # A job rejected by the full queue drops its prefetch
+    response = client.post('/jobs', json={'audio_url': 'https://audio.example/3.mp3'})
+    assert response.status_code == 503
+    assert service.cancelled == ['https://audio.example/3.mp3']
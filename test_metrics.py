@@ -0,0 +1,74 @@
+"""
+Tests for the Prometheus metrics registry and the /metrics endpoint
+"""
+
+import pytest
+
+from metrics import Registry
+
+
+def test_counters_and_gauges_render_with_labels():
+    registry = Registry()
+    requests = registry.counter('app_requests_total', 'Requests by route', ['route', 'status'])
+    in_flight = registry.gauge('app_in_flight', 'Requests in flight')
+
+    requests.inc(route='/translate', status='200')
+    requests.inc(2, route='/translate', status='200')
+    requests.inc(route='/say "hi"\n', status='500')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render() == (
+        '# HELP app_requests_total Requests by route\n'
+        '# TYPE app_requests_total counter\n'
+        'app_requests_total{route="/say \\"hi\\"\\n",status="500"} 1\n'
+        'app_requests_total{route="/translate",status="200"} 3\n'
+        '# HELP app_in_flight Requests in flight\n'
+        '# TYPE app_in_flight gauge\n'
+        'app_in_flight 1\n'
+    )
+
+    with pytest.raises(ValueError):
+        requests.inc(route='/translate')
+
+
+def test_histograms_render_cumulative_buckets_sum_and_count():
+    registry = Registry()
+    latency = registry.histogram('app_stage_seconds', 'Stage latency', ['stage'], buckets=(0.1, 1, 2.5))
+
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, stage='upload')
+
+    assert registry.render().splitlines() == [
+        '# HELP app_stage_seconds Stage latency',
+        '# TYPE app_stage_seconds histogram',
+        'app_stage_seconds_bucket{stage="upload",le="0.1"} 2',
+        'app_stage_seconds_bucket{stage="upload",le="1"} 3',
+        'app_stage_seconds_bucket{stage="upload",le="2.5"} 3',
+        'app_stage_seconds_bucket{stage="upload",le="+Inf"} 4',
+        'app_stage_seconds_sum{stage="upload"} 3.65',
+        'app_stage_seconds_count{stage="upload"} 4',
+    ]
+
+
+def test_registering_a_name_twice_returns_the_same_metric():
+    registry = Registry()
+    first = registry.counter('app_total', 'Total')
+    assert registry.counter('app_total', 'Total') is first
+
+
+def test_metrics_endpoint_serves_the_exposition_format():
+    import api
+
+    client = api.app.test_client()
+    client.get('/health')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    body = response.get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_count{route="/health",method="GET",status="200"}' in body
+    assert 'translation_circuit_breaker_state{state="closed"} ' in body
+    assert '# TYPE translation_stage_duration_seconds histogram' in body
@@ -0,0 +1,67 @@
+"""
+Tests for the per-thread SarvamAI client pool
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from sarvam_clients import SarvamClientPool
+
+
+def fake_client(api_subscription_key):
+    return SimpleNamespace(api_key=api_subscription_key, speech_to_text_translate_job=object())
+
+
+def test_each_thread_gets_its_own_client():
+    pool = SarvamClientPool('key', size=2, factory=fake_client)
+    pool.warm().join()
+
+    ready = threading.Barrier(2)
+
+    def take():
+        client = pool.get()
+        assert pool.get() is client
+        ready.wait(5)
+        return client
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.map(lambda _: take(), range(2))
+    assert first is not second
+
+
+def test_clients_return_to_the_pool_when_threads_exit():
+    pool = SarvamClientPool('key', size=2, factory=fake_client)
+    pool.warm().join()
+
+    # Short-lived executors, as translate_batch and chunked calls create per request
+    for _ in range(5):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _: pool.get(), range(4)))
+
+    stats = pool.stats()
+    assert stats['created'] == 2
+    assert stats['idle'] == 2
+    assert stats['returned'] >= 5
+
+
+def test_reset_drops_clients_returned_from_before_the_fork():
+    pool = SarvamClientPool('key', size=1, factory=fake_client)
+    pool.warm().join()
+
+    taken = threading.Event()
+    done = threading.Event()
+
+    def hold():
+        pool.get()
+        taken.set()
+        done.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    taken.wait(5)
+    pool._after_fork()
+    done.set()
+    thread.join()
+
+    assert pool.stats()['returned'] == 0
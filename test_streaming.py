@@ -0,0 +1,117 @@
+"""
+Tests for streaming /translate progress and speakers as NDJSON or SSE
+"""
+
+import json
+import time
+
+import pytest
+
+from admission import AdmissionController
+from circuit_breaker import CircuitOpenError
+from translation_service import AudioTooLargeError
+
+AUDIO_URL = 'https://audio.example/call.mp3'
+METADATA = {'seller_identifier': 'S1'}
+
+
+def translate_from_url(audio_url, progress=None):
+    progress('downloaded', bytes=1024)
+    progress('uploaded', job_id='job-1')
+    progress('job_running', job_id='job-1')
+    progress('job_finished', job_id='job-1')
+    return {
+        'status': 'success',
+        'language_code': 'hi-IN',
+        'preprocessing': {'trimmed_seconds': 1.5},
+        'speakers': [
+            {'speaker_id': 'speaker_1', 'text': 'Hello'},
+            {'speaker_id': 'speaker_2', 'text': 'Hi there'},
+        ],
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import api
+
+    monkeypatch.setattr(api, 'admission', AdmissionController(max_concurrent=1, max_queue=1))
+    return api.app.test_client()
+
+
+def stream(client, accept, body=None):
+    response = client.post('/translate', json=body or {'audio_url': AUDIO_URL, 'seller_buyer_meta_data': METADATA},
+                           headers={'Accept': accept})
+    assert response.status_code == 200
+    assert response.mimetype == accept
+    assert response.headers['Cache-Control'] == 'no-cache'
+    return response.get_data(as_text=True)
+
+
+def test_ndjson_streams_progress_result_and_speakers(client, monkeypatch):
+    import api
+
+    monkeypatch.setattr(api.translation_service, 'translate_from_url', translate_from_url)
+    events = [json.loads(line) for line in stream(client, 'application/x-ndjson').splitlines()]
+
+    assert events == [
+        {'event': 'accepted', 'audio_url': AUDIO_URL},
+        {'event': 'downloaded', 'bytes': 1024},
+        {'event': 'uploaded', 'job_id': 'job-1'},
+        {'event': 'job_running', 'job_id': 'job-1'},
+        {'event': 'job_finished', 'job_id': 'job-1'},
+        {'event': 'result', 'status': 'success', 'language_code': 'hi-IN',
+         'preprocessing': {'trimmed_seconds': 1.5}, 'seller_buyer_meta_data': METADATA},
+        {'event': 'speaker', 'index': 0, 'speaker_id': 'speaker_1', 'text': 'Hello'},
+        {'event': 'speaker', 'index': 1, 'speaker_id': 'speaker_2', 'text': 'Hi there'},
+        {'event': 'done', 'status': 'success', 'speaker_count': 2},
+    ]
+
+
+def test_sse_streams_the_same_events(client, monkeypatch):
+    import api
+
+    monkeypatch.setattr(api.translation_service, 'translate_from_url', translate_from_url)
+    chunks = stream(client, 'text/event-stream').split('\n\n')
+
+    assert chunks[-1] == ''
+    events = []
+    for chunk in chunks[:-1]:
+        name_line, data_line = chunk.split('\n')
+        data = json.loads(data_line[len('data: '):])
+        assert name_line == f"event: {data['event']}"
+        events.append(data['event'])
+    assert events == ['accepted', 'downloaded', 'uploaded', 'job_running', 'job_finished',
+                      'result', 'speaker', 'speaker', 'done']
+
+
+@pytest.mark.parametrize('error, expected', [
+    (RuntimeError("Job failed"), {'code': 500, 'message': "Job failed"}),
+    (AudioTooLargeError("Audio file is too large"), {'code': 413, 'message': "Audio file is too large"}),
+    (CircuitOpenError("SarvamAI is unavailable", retry_after=30),
+     {'code': 503, 'message': "SarvamAI is unavailable", 'retry_after': 30}),
+])
+def test_failures_end_the_stream_with_an_error_event(client, monkeypatch, error, expected):
+    import api
+
+    def failing_translate(audio_url, progress=None):
+        progress('downloaded', bytes=1024)
+        raise error
+
+    monkeypatch.setattr(api.translation_service, 'translate_from_url', failing_translate)
+    events = [json.loads(line) for line in stream(client, 'application/x-ndjson').splitlines()]
+
+    assert [event['event'] for event in events] == ['accepted', 'downloaded', 'error']
+    assert events[-1] == dict({'event': 'error', 'status': 'error'}, **expected)
+
+    # The worker frees its admission slot just after reporting the error
+    deadline = time.monotonic() + 5
+    while api.admission.stats()['active'] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert api.admission.stats()['active'] == 0
+
+
+def test_validation_errors_are_not_streamed(client):
+    response = client.post('/translate', json={}, headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 400
+    assert response.get_json() == {'status': 'error', 'message': 'Missing required field: audio_url'}
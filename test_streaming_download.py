@@ -0,0 +1,125 @@
+"""
+Tests for streaming audio downloads to disk under the size limit
+"""
+
+import tempfile
+
+import pytest
+
+from translation_service import STREAM_CHUNK_SIZE, AudioTooLargeError, TranslationService
+
+AUDIO_URL = 'https://audio.example/call.mp3'
+LIMIT = 4 * STREAM_CHUNK_SIZE
+
+
+class ChunkedBody:
+    """Response body handed out a few KiB per read, counting what was read."""
+
+    def __init__(self, body, read_size=16 * 1024):
+        self.body = body
+        self.read_size = read_size
+        self.position = 0
+        self.decode_content = False
+
+    def readinto(self, buffer):
+        chunk = self.body[self.position:self.position + min(len(buffer), self.read_size)]
+        buffer[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+
+class FakeResponse:
+    def __init__(self, body, headers):
+        self.status_code = 200
+        self.headers = headers
+        self.raw = ChunkedBody(body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeHttp:
+    """Stands in for HttpPool, serving one response."""
+
+    def __init__(self, body, send_length=True):
+        headers = {'ETag': '"v1"'}
+        if send_length:
+            headers['Content-Length'] = str(len(body))
+        self.response = FakeResponse(body, headers)
+
+    def get(self, url, endpoint=None, stream=False, headers=None):
+        assert stream
+        return self.response
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    return tmp_path
+
+
+def download(body, **http):
+    upstream = FakeHttp(body, **http)
+    service = TranslationService('test-key', http_pool=upstream, max_audio_bytes=LIMIT)
+    return service._download_audio(AUDIO_URL), upstream.response.raw
+
+
+def test_over_limit_content_length_is_rejected_before_reading(temp_dir):
+    upstream = FakeHttp(b'\1' * (LIMIT + 1))
+    service = TranslationService('test-key', http_pool=upstream, max_audio_bytes=LIMIT)
+
+    with pytest.raises(AudioTooLargeError):
+        service._download_audio(AUDIO_URL)
+    assert upstream.response.raw.position == 0
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_over_limit_chunked_body_aborts_mid_stream(temp_dir):
+    upstream = FakeHttp(b'\1' * (LIMIT * 10), send_length=False)
+    service = TranslationService('test-key', http_pool=upstream, max_audio_bytes=LIMIT)
+
+    with pytest.raises(AudioTooLargeError):
+        service._download_audio(AUDIO_URL)
+
+    # Stopped one chunk past the limit, and the partial file was removed
+    assert LIMIT < upstream.response.raw.position <= LIMIT + STREAM_CHUNK_SIZE
+    assert list(temp_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize('send_length', [True, False])
+def test_in_limit_body_is_written_in_full(temp_dir, send_length):
+    body = bytes(range(256)) * (LIMIT // 256)
+    (path, validators), raw = download(body, send_length=send_length)
+
+    with open(path, 'rb') as f:
+        assert f.read() == body
+    assert raw.decode_content
+    assert validators['etag'] == '"v1"'
+    assert validators['content_length'] == (str(len(body)) if send_length else None)
+    assert [p.name for p in temp_dir.iterdir()] == [path.rsplit('/', 1)[-1]]
+
+
+def test_streams_without_readinto_are_read_in_chunks(temp_dir):
+    class ReadOnly:
+        def __init__(self, body):
+            self.body = body
+            self.sizes = []
+
+        def read(self, size):
+            self.sizes.append(size)
+            chunk, self.body = self.body[:size], self.body[size:]
+            return chunk
+
+    service = TranslationService('test-key', max_audio_bytes=LIMIT)
+    source = ReadOnly(b'\2' * (2 * STREAM_CHUNK_SIZE + 10))
+    path = service.save_stream(source)
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'\2' * (2 * STREAM_CHUNK_SIZE + 10)
+    assert set(source.sizes) == {STREAM_CHUNK_SIZE}
@@ -0,0 +1,67 @@
+"""
+Tests for the LRU transcript cache
+"""
+
+import json
+import os
+
+from transcript_cache import LRUCache
+
+
+def size(value):
+    return len(json.dumps(value))
+
+
+def test_memory_evicts_least_recently_used():
+    value = {'transcript': 'x' * 50}
+    cache = LRUCache(max_bytes=size(value) * 3)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, value)
+
+    # Reading 'a' makes 'b' the oldest entry
+    assert cache.get('a') == value
+    cache.put('d', value)
+
+    assert cache.get('b') is None
+    assert all(cache.get(key) == value for key in ('a', 'c', 'd'))
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 3
+    assert stats['memory_bytes'] == size(value) * 3
+
+
+def test_values_over_the_budget_are_not_kept_in_memory():
+    cache = LRUCache(max_bytes=10)
+    cache.put('big', {'transcript': 'x' * 50})
+    assert cache.get('big') is None
+    assert cache.stats()['memory_bytes'] == 0
+
+
+def test_replacing_a_key_does_not_double_count():
+    cache = LRUCache(max_bytes=1000)
+    cache.put('a', {'v': 1})
+    cache.put('a', {'v': 22})
+    assert cache.stats()['memory_bytes'] == size({'v': 22})
+    assert cache.get('a') == {'v': 22}
+
+
+def test_disk_store_survives_restarts_and_evicts_oldest(tmp_path):
+    value = {'transcript': 'y' * 100}
+    cache_dir = str(tmp_path / 'cache')
+    cache = LRUCache(max_bytes=1, cache_dir=cache_dir, max_disk_bytes=size(value) * 3)
+    for index, key in enumerate(['aa1', 'bb2', 'cc3']):
+        cache.put(key, value)
+        path = os.path.join(cache_dir, key[:2], f'{key}.json')
+        os.utime(path, (1000 + index, 1000 + index))
+
+    # A new process reads from disk
+    restarted = LRUCache(max_bytes=10_000, cache_dir=cache_dir, max_disk_bytes=size(value) * 3)
+    assert restarted.get('aa1') == value
+    assert restarted.stats()['disk_hits'] == 1
+
+    # Over budget, the least recently used files go until the store is
+    # under 90% of it ('aa1' was just read, so it stays)
+    restarted.put('dd4', value)
+    remaining = sorted(name for _, _, names in os.walk(cache_dir) for name in names)
+    assert remaining == ['aa1.json', 'dd4.json']
+    assert restarted.stats()['disk_bytes'] == size(value) * 2
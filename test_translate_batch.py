@@ -0,0 +1,162 @@
+"""
+Tests for translating many audio URLs per request (/translate/batch)
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from benchmarks.fake_sarvam import default_payload
+from translation_service import TranslationService
+
+
+def audio_url(name):
+    return f'https://audio.example/{name}.mp3'
+
+
+class FakeDownloads:
+    """Stands in for TranslationService._download_audio, writing one small file per URL."""
+
+    def __init__(self, tmp_path, failing=()):
+        self.tmp_path = tmp_path
+        self.failing = set(failing)
+
+    def __call__(self, url, headers=None):
+        if url in self.failing:
+            raise IOError(f"404 Client Error for url: {url}")
+        path = self.tmp_path / url.rsplit('/', 1)[-1]
+        path.write_bytes(url.encode('utf-8'))
+        return str(path), {'etag': None, 'last_modified': None, 'content_length': None}
+
+
+class FakeJobs:
+    """Stands in for TranslationService.run_job, recording the files of each job."""
+
+    def __init__(self, rejected_files=(), failing_jobs_with=None):
+        self.rejected_files = set(rejected_files)
+        self.failing_jobs_with = failing_jobs_with
+        self.jobs = []
+        self._lock = threading.Lock()
+
+    def __call__(self, audio_paths, progress=None):
+        names = [os.path.basename(path) for path in audio_paths]
+        with self._lock:
+            self.jobs.append(names)
+        if self.failing_jobs_with in names:
+            raise RuntimeError("SarvamAI unavailable")
+        return {
+            path: Exception("Unsupported audio format") if name in self.rejected_files else default_payload(name, 60)
+            for path, name in zip(audio_paths, names)
+        }
+
+
+def make_service(tmp_path, monkeypatch, service=None, failing=(), **jobs):
+    service = service or TranslationService('test-key')
+    downloads = tmp_path / 'downloads'
+    downloads.mkdir()
+    fake_jobs = FakeJobs(**jobs)
+    monkeypatch.setattr(service, '_download_audio', FakeDownloads(downloads, failing))
+    monkeypatch.setattr(service, 'run_job', fake_jobs)
+    for attribute in ('transcript_cache', 'url_cache', 'preprocessor'):
+        monkeypatch.setattr(service, attribute, None)
+    return service, fake_jobs, downloads
+
+
+def test_every_item_gets_its_own_result_or_error(tmp_path, monkeypatch):
+    urls = [audio_url(i) for i in range(7)]
+    service, jobs, downloads = make_service(tmp_path, monkeypatch, failing=[urls[2]], rejected_files=['4.mp3'])
+
+    results = list(service.translate_batch(urls, max_files_per_job=3, download_workers=4))
+
+    # One result per URL, each matched to its own audio
+    assert sorted(index for index, _ in results) == list(range(7))
+    results = dict(results)
+    assert 'for url' in str(results[2])
+    assert str(results[4]) == "Unsupported audio format"
+    for index in (0, 1, 3, 5, 6):
+        assert results[index]['status'] == 'success'
+        assert f'of {index}.mp3' in results[index]['speakers'][0]['text']
+
+    # Downloaded files share jobs of up to three files, then are removed
+    assert sorted(name for job in jobs.jobs for name in job) == [f'{i}.mp3' for i in (0, 1, 3, 4, 5, 6)]
+    assert all(len(job) <= 3 for job in jobs.jobs)
+    assert os.listdir(downloads) == []
+
+
+def test_a_failed_job_only_fails_its_own_items(tmp_path, monkeypatch):
+    urls = [audio_url(i) for i in range(5)]
+    service, jobs, _ = make_service(tmp_path, monkeypatch, failing_jobs_with='0.mp3')
+
+    results = dict(service.translate_batch(urls, max_files_per_job=2, download_workers=1))
+
+    job_with_0 = next(job for job in jobs.jobs if '0.mp3' in job)
+    for index in range(5):
+        if f'{index}.mp3' in job_with_0:
+            assert str(results[index]) == "SarvamAI unavailable"
+        else:
+            assert results[index]['status'] == 'success'
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    import api
+
+    make_service(tmp_path, monkeypatch, service=api.translation_service,
+                 failing=[audio_url('missing')], rejected_files=['corrupt.mp3'])
+    return api.app.test_client()
+
+
+ITEMS = [
+    {'audio_url': audio_url('a'), 'seller_buyer_meta_data': {'seller_identifier': 'S1'}},
+    {'audio_url': audio_url('missing')},
+    {'seller_buyer_meta_data': {'seller_identifier': 'S2'}},
+    {'audio_url': audio_url('corrupt')},
+    {'audio_url': audio_url('b')},
+]
+
+
+def test_endpoint_validates_the_request(client, monkeypatch):
+    import api
+
+    assert client.post('/translate/batch', data='items').status_code == 400
+    for body in ({}, {'items': []}, {'items': 'a'}, {'items': ['a']}, []):
+        response = client.post('/translate/batch', json=body)
+        assert response.status_code == 400
+        assert response.get_json()['status'] == 'error'
+
+    monkeypatch.setattr(api, 'BULK_MAX_ITEMS', 2)
+    response = client.post('/translate/batch', json={'items': ITEMS[:3]})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Too many items: maximum is 2'
+
+
+def test_endpoint_returns_every_item_in_request_order(client):
+    response = client.post('/translate/batch', json={'items': ITEMS}, headers={'Accept': 'application/json'})
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert (data['succeeded'], data['failed']) == (2, 3)
+    results = data['results']
+    assert [entry['index'] for entry in results] == [0, 1, 2, 3, 4]
+    assert [entry['status'] for entry in results] == ['success', 'error', 'error', 'error', 'success']
+    assert [entry.get('code') for entry in results] == [None, 500, 400, 500, None]
+    assert results[0]['seller_buyer_meta_data'] == {'seller_identifier': 'S1'}
+    assert results[3]['message'] == "Unsupported audio format"
+    assert results[4]['audio_url'] == audio_url('b')
+
+
+def test_endpoint_streams_items_then_done(client):
+    response = client.post('/translate/batch', json={'items': ITEMS})
+    assert response.mimetype == 'application/x-ndjson'
+
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [event['event'] for event in events] == ['item'] * 5 + ['done']
+    assert sorted(event['index'] for event in events[:-1]) == [0, 1, 2, 3, 4]
+    assert events[-1] == {'event': 'done', 'status': 'success', 'succeeded': 2, 'failed': 3}
+
+    response = client.post('/translate/batch', json={'items': ITEMS[:1]}, headers={'Accept': 'text/event-stream'})
+    chunks = response.get_data(as_text=True).split('\n\n')
+    assert chunks[0].startswith('event: item\ndata: ')
+    assert chunks[1].startswith('event: done\ndata: ')
@@ -0,0 +1,78 @@
+"""
+Tests for spooling /translate-file uploads straight to the file the SDK uploads
+"""
+
+import io
+import os
+import tempfile
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from admission import AdmissionController
+from benchmarks import fake_sarvam
+from benchmarks.fake_sarvam import FakeSarvamAI
+from job_monitor import JobMonitor
+
+AUDIO = b'ID3' + bytes(range(256)) * 64
+
+
+@pytest.fixture
+def service(monkeypatch):
+    import api
+
+    service = api.translation_service
+    uploads = []
+    upload_files = fake_sarvam.FakeJob.upload_files
+
+    def recording_upload_files(job, file_paths, timeout=60):
+        # What the SDK would send: the paths it is given, and their bytes
+        for path in file_paths:
+            with open(path, 'rb') as f:
+                uploads.append((path, f.read()))
+        return upload_files(job, file_paths, timeout)
+
+    monkeypatch.setattr(fake_sarvam.FakeJob, 'upload_files', recording_upload_files)
+    monkeypatch.setattr(service, '_client', FakeSarvamAI(job_latency=0, queue_seconds=0))
+    monkeypatch.setattr(service, 'job_monitor',
+                        JobMonitor(service.get_job_status, min_interval=0.01, max_interval=0.05))
+    for attribute in ('transcript_cache', 'preprocessor', 'chunker', 'batcher'):
+        monkeypatch.setattr(service, attribute, None)
+    monkeypatch.setattr(api, 'admission', AdmissionController(max_concurrent=1, max_queue=1))
+    service.uploads = uploads
+    return service
+
+
+def test_multipart_upload_is_sent_from_its_spooled_file(service, monkeypatch):
+    import api
+
+    def no_second_copy(source, suffix='.mp3'):
+        raise AssertionError("the upload was copied to another temporary file")
+
+    monkeypatch.setattr(service, 'save_stream', no_second_copy)
+
+    response = api.app.test_client().post('/translate-file', data={
+        'audio_file': (io.BytesIO(AUDIO), 'call.wav'),
+        'seller_buyer_meta_data': '{"seller_identifier": "S1"}',
+    })
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['seller_buyer_meta_data'] == {'seller_identifier': 'S1'}
+
+    # The SDK uploaded the spooled temp file itself, with the original suffix
+    [(path, uploaded)] = service.uploads
+    assert uploaded == AUDIO
+    assert os.path.dirname(path) == tempfile.gettempdir()
+    assert path.endswith('.wav')
+
+    # and the file is gone once the request is closed
+    assert not os.path.exists(path)
+
+
+def test_streams_without_a_file_are_saved_once_and_removed(service):
+    upload = FileStorage(stream=io.BytesIO(AUDIO), filename='call.mp3')
+    response = service.translate_from_file(upload)
+    assert response['status'] == 'success'
+
+    [(path, uploaded)] = service.uploads
+    assert uploaded == AUDIO
+    assert not os.path.exists(path)
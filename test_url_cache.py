@@ -0,0 +1,149 @@
+"""
+Tests for revalidating cached audio URLs instead of downloading them again
+"""
+
+import io
+
+from transcript_cache import LRUCache
+from translation_service import TranslationService
+
+AUDIO_URL = 'https://audio.example/call.mp3'
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = io.BytesIO(body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise IOError(f"{self.status_code} Error")
+
+
+class FakeUpstream:
+    """Stands in for HttpPool, serving one recording with the given validators."""
+
+    def __init__(self, body, etag=None, last_modified=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+
+    def get(self, url, endpoint=None, stream=False, headers=None):
+        headers = dict(headers or {})
+        self.requests.append(('GET', headers))
+        if self.etag and headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+        if not self.etag and self.last_modified and headers.get('If-Modified-Since') == self.last_modified:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, self._headers())
+
+    def head(self, url, endpoint=None, allow_redirects=False):
+        self.requests.append(('HEAD', {}))
+        return FakeResponse(200, headers=self._headers())
+
+    def _headers(self):
+        headers = {'Content-Length': str(len(self.body))}
+        if self.etag:
+            headers['ETag'] = self.etag
+        if self.last_modified:
+            headers['Last-Modified'] = self.last_modified
+        return headers
+
+
+def make_service(upstream):
+    service = TranslationService('test-key', http_pool=upstream, url_cache=LRUCache())
+    service.jobs = []
+
+    def run_job(audio_paths, progress=None):
+        # The transcript is the audio itself, so changed audio reads differently
+        service.jobs.append(audio_paths)
+        with open(audio_paths[0], 'rb') as f:
+            text = f.read().decode('utf-8')
+        entries = [{'speaker_id': '0', 'transcript': text}]
+        return {audio_paths[0]: {'language_code': 'hi-IN', 'diarized_transcript': {'entries': entries}}}
+
+    service.run_job = run_job
+    return service
+
+
+def translate(service):
+    events = []
+    response = service.translate_from_url(AUDIO_URL, progress=lambda event, **fields: events.append(event))
+    return response['speakers'][0]['text'], events
+
+
+def test_not_modified_reuses_the_cached_response():
+    upstream = FakeUpstream(b'first take', etag='"v1"', last_modified='Wed, 01 Oct 2025 10:00:00 GMT')
+    service = make_service(upstream)
+
+    assert translate(service) == ('first take', ['downloaded'])
+    assert upstream.requests == [('GET', {})]
+
+    # Both validators are sent; the 304 skips the download and the job
+    assert translate(service) == ('first take', ['cached'])
+    assert upstream.requests[1] == ('GET', {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 01 Oct 2025 10:00:00 GMT'
+    })
+    assert len(service.jobs) == 1
+
+
+def test_last_modified_alone_is_sent_and_honoured():
+    upstream = FakeUpstream(b'first take', last_modified='Wed, 01 Oct 2025 10:00:00 GMT')
+    service = make_service(upstream)
+
+    translate(service)
+    assert translate(service) == ('first take', ['cached'])
+    assert upstream.requests[1] == ('GET', {'If-Modified-Since': 'Wed, 01 Oct 2025 10:00:00 GMT'})
+    assert len(service.jobs) == 1
+
+
+def test_changed_validator_replaces_the_cached_response():
+    upstream = FakeUpstream(b'first take', etag='"v1"')
+    service = make_service(upstream)
+    translate(service)
+
+    # New audio behind the same URL: the old ETag no longer matches
+    upstream.body, upstream.etag = b'second take', '"v2"'
+    assert translate(service) == ('second take', ['downloaded'])
+    assert upstream.requests[1] == ('GET', {'If-None-Match': '"v1"'})
+    assert len(service.jobs) == 2
+
+    # The new response and validator are what is cached now
+    assert translate(service) == ('second take', ['cached'])
+    assert upstream.requests[2] == ('GET', {'If-None-Match': '"v2"'})
+    assert len(service.jobs) == 2
+
+
+def test_content_length_alone_is_checked_with_head():
+    upstream = FakeUpstream(b'first take')
+    service = make_service(upstream)
+    translate(service)
+
+    # Same size: answered from the HEAD request, without a GET
+    assert translate(service) == ('first take', ['cached'])
+    assert upstream.requests == [('GET', {}), ('HEAD', {})]
+
+    # Different size: downloaded again, with no conditional headers
+    upstream.body = b'a longer second take'
+    assert translate(service) == ('a longer second take', ['downloaded'])
+    assert upstream.requests[2:] == [('HEAD', {}), ('GET', {})]
+    assert len(service.jobs) == 2
+
+
+def test_urls_without_validators_are_not_cached():
+    upstream = FakeUpstream(b'first take')
+    upstream._headers = lambda: {}
+    service = make_service(upstream)
+
+    translate(service)
+    translate(service)
+    assert upstream.requests == [('GET', {}), ('GET', {})]
+    assert len(service.jobs) == 2
@@ -1,24 +1,131 @@
-from sarvamai import SarvamAI
-import requests
 import os
 import tempfile
 import json
+import shutil
+import threading
+import hashlib
+import copy
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+
+from http_pool import HttpPool
+from job_batcher import JobBatcher
+from job_monitor import JobMonitor, estimate_audio_seconds
+from audio_chunking import merge_chunk_results
+from metrics import DOWNLOADED_BYTES, HEDGED_JOBS, PROCESSED_AUDIO_SECONDS, stage_timer
+from sarvam_clients import SarvamClientPool
+
+logger = logging.getLogger(__name__)
+
+# Chunk size used when streaming audio to disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class AudioTooLargeError(Exception):
+    """Raised when an audio file exceeds the configured size limit."""
 
 
 class TranslationService:
     """Service class for handling audio translation using SarvamAI API."""
     
-    def __init__(self, api_key):
+    # STTT job configuration
+    MODEL = "saaras:v2.5"
+    WITH_DIARIZATION = True
+    NUM_SPEAKERS = 2
+    PROMPT = "Official meeting"
+    
+    # Prefetched downloads not claimed within this time are discarded
+    PREFETCH_TTL_SECONDS = 3600
+    
+    def __init__(self, api_key, batch_window=0, batch_max_files=1, max_audio_bytes=None,
+                 http_pool=None, transcript_cache=None, url_cache=None, job_monitor=None,
+                 preprocessor=None, chunker=None, download_scheduler=None, max_prefetch=16,
+                 client=None, client_pool=None, circuit_breaker=None, hedge_quantile=None,
+                 hedge_budget=0.1):
         """Initialize the translation service with API key.
         
         Args:
             api_key (str): SarvamAI API subscription key
+            batch_window (float): Seconds to collect concurrent requests into
+                one multi-file job (0 disables batching)
+            batch_max_files (int): Maximum number of files per batched job
+            max_audio_bytes (int): Largest audio file accepted, in bytes
+                (None for no limit)
+            http_pool (HttpPool): Shared HTTP connection pool for downloads
+            transcript_cache (LRUCache): Cache of raw results keyed by audio
+                hash (None disables caching)
+            url_cache (LRUCache): Cache of formatted responses and HTTP
+                validators keyed by audio URL (None disables caching)
+            job_monitor (JobMonitor): Shared poller for outstanding jobs
+            preprocessor (AudioPreprocessor): Silence trimming and transcoding
+                stage run before upload (None disables it)
+            chunker (LongCallChunker): Splits long recordings into parallel
+                chunk jobs (None disables it)
+            download_scheduler (DownloadScheduler): Runs audio downloads with
+                per-host concurrency and rate limits (None downloads on the
+                calling thread)
+            max_prefetch (int): Maximum number of prefetched downloads held
+                for later requests
+            client: SarvamAI client shared by all threads instead of the
+                pool's per-thread clients (e.g. the benchmark stand-in)
+            client_pool (SarvamClientPool): Source of per-thread SarvamAI
+                clients (defaults to an unwarmed pool for api_key)
+            circuit_breaker (CircuitBreaker): Fails jobs fast while SarvamAI
+                is unhealthy (None disables it)
+            hedge_quantile (float): Start a duplicate job when a job runs
+                longer than this quantile of recent jobs, e.g. 0.95 (None
+                disables hedging)
+            hedge_budget (float): Largest fraction of jobs that may be hedged
         """
-        self.client = SarvamAI(api_subscription_key=api_key)
+        self._client = client
+        self.client_pool = client_pool or SarvamClientPool(api_key)
+        self.http = http_pool or HttpPool(timeouts={'audio_download': 30})
+        self.transcript_cache = transcript_cache
+        self.url_cache = url_cache
+        self.job_monitor = job_monitor or JobMonitor(self.get_job_status)
+        self.preprocessor = preprocessor
+        self.chunker = chunker
+        self.download_scheduler = download_scheduler
+        self.max_prefetch = max_prefetch
+        self.max_audio_bytes = max_audio_bytes
+        self._buffers = threading.local()
+        self._prefetched = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        self.circuit_breaker = circuit_breaker
+        self.hedge_quantile = hedge_quantile
+        self.hedge_budget = hedge_budget
+        self._hedge_lock = threading.Lock()
+        self._hedge_counts = {'jobs': 0, 'hedged': 0, 'hedge_won': 0, 'primary_won': 0, 'hedge_failed': 0}
+        
+        self.batcher = None
+        if batch_window > 0 and batch_max_files > 1:
+            self.batcher = JobBatcher(
+                self.run_job,
+                window_seconds=batch_window,
+                max_files=batch_max_files
+            )
+    
+    @property
+    def client(self):
+        """SarvamAI client for the calling thread."""
+        if self._client is not None:
+            return self._client
+        return self.client_pool.get()
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
     
     def download_audio(self, audio_url):
         """Download audio file from URL and save to temporary file.
         
+        The response body is streamed to disk in fixed-size chunks, so memory
+        use does not grow with the length of the recording.
+        
         Args:
             audio_url (str): URL of the audio file to download
             
@@ -27,22 +134,213 @@ class TranslationService:
             
         Raises:
             requests.RequestException: If download fails
+            AudioTooLargeError: If the file exceeds max_audio_bytes
+        """
+        temp_file, _ = self._download(audio_url)
+        return temp_file
+    
+    def prefetch(self, audio_url):
+        """Start downloading audio that a later request will translate.
+        
+        Used for queued work, so the download overlaps the STTT processing
+        of earlier requests. The next translate_from_url call for the same
+        URL picks up the downloaded file instead of fetching it again.
+        
+        Args:
+            audio_url (str): URL of the audio file
+            
+        Returns:
+            bool: True if a prefetch was started
         """
-        response = requests.get(audio_url, timeout=30)
-        response.raise_for_status()
+        if self.download_scheduler is None:
+            return False
         
-        # Save to temporary file
-        temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        temp_audio.write(response.content)
-        temp_audio.close()
+        # Cached URLs are revalidated with a cheap conditional request instead
+        if self.url_cache is not None and self.url_cache.get(_url_key(audio_url)) is not None:
+            return False
+        
+        with self._prefetch_lock:
+            self._expire_prefetched()
+            if audio_url in self._prefetched or len(self._prefetched) >= self.max_prefetch:
+                return False
+            future = self.download_scheduler.submit(audio_url, self._download_audio, audio_url)
+            self._prefetched[audio_url] = (future, time.monotonic())
+        return True
+    
+    def prefetch_stats(self):
+        """Return the number of prefetched downloads waiting to be used."""
+        with self._prefetch_lock:
+            return {
+                'held': len(self._prefetched),
+                'max_prefetch': self.max_prefetch
+            }
+    
+    def cancel_prefetch(self, audio_url):
+        """Drop a prefetch whose request will not run, removing its file once downloaded."""
+        future = self._take_prefetched(audio_url)
+        if future is not None:
+            future.add_done_callback(_discard_download)
+    
+    def _take_prefetched(self, audio_url):
+        with self._prefetch_lock:
+            entry = self._prefetched.pop(audio_url, None)
+        return entry[0] if entry else None
+    
+    def _join_prefetched(self, audio_url):
+        # Wait for a prefetch of this URL, queued or still downloading, rather
+        # than fetching the audio a second time. Returns None if there is none
+        # or it failed, in which case the caller downloads as usual.
+        future = self._take_prefetched(audio_url)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"Prefetch of {audio_url} failed, downloading again: {e}")
+            return None
+    
+    def _expire_prefetched(self):
+        now = time.monotonic()
+        while self._prefetched:
+            url, (future, created) = next(iter(self._prefetched.items()))
+            if now - created < self.PREFETCH_TTL_SECONDS:
+                break
+            del self._prefetched[url]
+            future.add_done_callback(_discard_download)
+    
+    def _download(self, audio_url, headers=None):
+        # Run the download through the scheduler when one is configured
+        if self.download_scheduler is None:
+            return self._download_audio(audio_url, headers=headers)
+        return self.download_scheduler.submit(audio_url, self._download_audio, audio_url, headers=headers).result()
+    
+    @staticmethod
+    def downloaded_bytes(download):
+        """Size of a file returned by _download_audio, for scheduler throughput."""
+        temp_file, _ = download
+        return os.path.getsize(temp_file) if temp_file else 0
+    
+    def _download_audio(self, audio_url, headers=None):
+        # Returns (temp file path, validators); the path is None on 304 Not Modified
+        with stage_timer('download'):
+            download = self._stream_download(audio_url, headers)
+        if download[0] is not None:
+            DOWNLOADED_BYTES.inc(os.path.getsize(download[0]))
+        return download
+    
+    def _stream_download(self, audio_url, headers):
+        with self.http.get(audio_url, endpoint='audio_download', stream=True, headers=headers) as response:
+            if response.status_code == 304:
+                return None, None
+            response.raise_for_status()
+            
+            # Reject oversized files before reading the body when the size is known
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit():
+                self._check_size(int(content_length))
+            
+            validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_length': content_length
+            }
+            
+            response.raw.decode_content = True
+            return self.save_stream(response.raw), validators
+    
+    def _revalidate_url(self, audio_url, entry):
+        """Check whether a cached URL still serves the same audio.
+        
+        Returns:
+            tuple: (is_unchanged, conditional headers for the download)
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        
+        # Strong validators are checked by the conditional GET itself
+        if headers:
+            return False, headers
+        
+        # Only the size is known; compare it with a HEAD request
+        try:
+            response = self.http.head(audio_url, endpoint='audio_download', allow_redirects=True)
+        except Exception:
+            return False, None
+        
+        content_length = response.headers.get('Content-Length')
+        unchanged = response.status_code == 200 and content_length == entry.get('content_length')
+        return unchanged, None
+    
+    def save_stream(self, source, suffix=".mp3"):
+        """Stream a readable binary file object to a temporary file.
+        
+        Args:
+            source: File-like object opened for binary reading
+            suffix (str): Suffix for the temporary file name
+            
+        Returns:
+            str: Path to the temporary file
+            
+        Raises:
+            AudioTooLargeError: If the stream exceeds max_audio_bytes
+        """
+        buffer = self._get_buffer()
+        view = memoryview(buffer)
+        readinto = getattr(source, 'readinto', None)
+        total_bytes = 0
+        
+        temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+        try:
+            with temp_audio:
+                while True:
+                    if readinto is not None:
+                        size = readinto(buffer)
+                        chunk = view[:size] if size else None
+                    else:
+                        chunk = source.read(STREAM_CHUNK_SIZE)
+                        size = len(chunk)
+                    
+                    if not size:
+                        break
+                    
+                    total_bytes += size
+                    self._check_size(total_bytes)
+                    temp_audio.write(chunk)
+        except BaseException:
+            os.unlink(temp_audio.name)
+            raise
         
         return temp_audio.name
     
-    def process_audio(self, audio_path):
+    def _get_buffer(self):
+        # One reusable chunk buffer per thread
+        buffer = getattr(self._buffers, 'buffer', None)
+        if buffer is None:
+            buffer = bytearray(STREAM_CHUNK_SIZE)
+            self._buffers.buffer = buffer
+        return buffer
+    
+    def _check_size(self, size):
+        if self.max_audio_bytes and size > self.max_audio_bytes:
+            raise AudioTooLargeError(
+                f"Audio file exceeds maximum size of {self.max_audio_bytes} bytes"
+            )
+    
+    def process_audio(self, audio_path, progress=None):
         """Process audio file using SarvamAI speech-to-text-translate service.
         
+        Results are looked up in the transcript cache first, so a recording
+        that was already processed skips the STTT job. When batching is enabled
+        the file is queued and submitted together with other concurrent
+        requests as one multi-file job.
+        
         Args:
             audio_path (str): Path to the audio file
+            progress (callable): Optional progress callback, see
+                translate_from_url
             
         Returns:
             dict: Translation results containing transcript and diarization
@@ -50,48 +348,348 @@ class TranslationService:
         Raises:
             Exception: If processing fails
         """
-        # Create and configure batch STTT job
-        job = self.client.speech_to_text_translate_job.create_job(
-            model="saaras:v2.5",
-            with_diarization=True,
-            num_speakers=2,
-            prompt="Official meeting"
-        )
+        cache_key, cached = self._cached_result(audio_path)
+        if cached is not None:
+            _notify(progress, 'transcript_cached')
+            return cached
         
-        # Upload and process files
-        job.upload_files(file_paths=[audio_path])
-        job.start()
+        if self.batcher is not None:
+            _notify(progress, 'batched')
+            result = self.batcher.submit(audio_path).result()
+        else:
+            result = self.run_job([audio_path], progress=progress)[audio_path]
+            if isinstance(result, Exception):
+                raise result
+        
+        if cache_key is not None:
+            self.transcript_cache.put(cache_key, result)
+        
+        return result
+    
+    def _cached_result(self, audio_path):
+        # Returns (cache key, cached result); both are None when caching is off
+        if self.transcript_cache is None:
+            return None, None
+        cache_key = self.audio_cache_key(audio_path)
+        return cache_key, self.transcript_cache.get(cache_key)
+    
+    def process_long_audio(self, audio_path, progress=None):
+        """Process audio, splitting long recordings into parallel chunk jobs.
+        
+        Recordings longer than the chunker's threshold are cut at silences
+        into overlapping chunks, each chunk is processed concurrently, and the
+        diarized entries are merged back with offset-corrected times and
+        consistent speaker IDs. Shorter recordings go straight to
+        process_audio.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            progress (callable): Optional progress callback, see
+                translate_from_url
+            
+        Returns:
+            dict: Translation results containing transcript and diarization
+            
+        Raises:
+            Exception: If processing fails
+        """
+        chunks = None
+        if self.chunker is not None:
+            try:
+                with stage_timer('chunk_split'):
+                    chunks = self.chunker.split(audio_path)
+            except Exception as e:
+                logger.warning(f"Audio chunking failed, processing as one file: {e}")
+        
+        if not chunks:
+            return self.process_audio(audio_path, progress=progress)
+        
+        _notify(progress, 'chunked', chunks=len(chunks))
+        try:
+            with ThreadPoolExecutor(max_workers=self.chunker.parallelism) as executor:
+                chunk_results = list(executor.map(
+                    lambda path: self.process_audio(path, progress=progress),
+                    [c['path'] for c in chunks]
+                ))
+        finally:
+            for chunk in chunks:
+                _remove_file(chunk['path'])
+        
+        return merge_chunk_results(chunks, chunk_results)
+    
+    def audio_cache_key(self, audio_path):
+        """Build the transcript cache key for an audio file.
+        
+        The key covers the audio bytes and every job parameter that affects
+        the result, so changing the model or diarization settings never
+        returns a stale transcript.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            'model': self.MODEL,
+            'with_diarization': self.WITH_DIARIZATION,
+            'num_speakers': self.NUM_SPEAKERS,
+            'prompt': self.PROMPT
+        }, sort_keys=True).encode('utf-8'))
+        
+        buffer = self._get_buffer()
+        view = memoryview(buffer)
+        with open(audio_path, 'rb') as audio_file:
+            while True:
+                size = audio_file.readinto(buffer)
+                if not size:
+                    break
+                digest.update(view[:size])
+        
+        return digest.hexdigest()
+    
+    def run_job(self, audio_paths, progress=None):
+        """Run a single STTT job over one or more audio files.
+        
+        Args:
+            audio_paths (list): Paths to the audio files, with unique file names
+            progress (callable): Optional progress callback, see
+                translate_from_url
+            
+        Returns:
+            dict: Maps each audio path to its result data, or to an Exception
+                if that file failed
+            
+        Raises:
+            CircuitOpenError: If SarvamAI is failing and the circuit is open
+            Exception: If the job itself fails
+        """
+        guard = self.circuit_breaker.guard() if self.circuit_breaker is not None else nullcontext()
+        with guard as call:
+            results, job_state = self._run_job(audio_paths, progress)
+            
+            # Files SarvamAI rejects (corrupt or unsupported audio) come back
+            # as values and leave the breaker alone. A job that ended in the
+            # failed state is an upstream failure, even though it is also
+            # reported per file rather than raised.
+            if call is not None and job_state.lower() == 'failed':
+                call.record_failure(Exception(f"STTT job ended in state {job_state}"))
+            return results
+    
+    def _run_job(self, audio_paths, progress):
+        # Returns the per-file results and the job's final state
+        job = self._start_job(audio_paths)
+        _notify(progress, 'uploaded', job_id=job.job_id)
         
         # Wait for completion
-        job.wait_until_complete()
+        audio_seconds = [estimate_audio_seconds(path) for path in audio_paths]
+        with stage_timer('wait'):
+            job, status = self._wait_for_job(job, audio_paths, max(audio_seconds), progress)
+        _notify(progress, 'job_finished', job_id=job.job_id)
+        PROCESSED_AUDIO_SECONDS.inc(sum(audio_seconds))
         
         # Check file-level results
-        file_results = job.get_file_results()
+        with stage_timer('file_results'):
+            file_results = job.get_file_results()
+        paths_by_name = {os.path.basename(path): path for path in audio_paths}
+        results = {}
         
-        if len(file_results['successful']) == 0:
-            error_msg = "Audio processing failed"
-            if file_results['failed']:
-                error_msg = file_results['failed'][0].get('error_message', error_msg)
-            raise Exception(error_msg)
+        for failed in file_results['failed']:
+            path = paths_by_name.get(failed['file_name'])
+            if path:
+                results[path] = Exception(failed.get('error_message') or "Audio processing failed")
         
-        # Download outputs to temporary directory
-        output_dir = tempfile.mkdtemp()
-        job.download_outputs(output_dir=output_dir)
+        if file_results['successful']:
+            try:
+                with stage_timer('fetch_outputs'):
+                    outputs = self._fetch_outputs(job, file_results['successful'])
+            except Exception as e:
+                logger.warning(f"In-memory output fetch failed for job {job.job_id}, using disk: {e}")
+                with stage_timer('download_outputs'):
+                    outputs = self._download_outputs_to_disk(job, file_results['successful'])
+            
+            for file_name, result_data in outputs.items():
+                path = paths_by_name.get(file_name)
+                if path:
+                    results[path] = result_data
+        
+        for path in audio_paths:
+            results.setdefault(path, Exception("Audio processing failed"))
+        
+        return results, status.job_state
+    
+    def _start_job(self, audio_paths):
+        # Create and configure batch STTT job
+        with stage_timer('create_job'):
+            job = self.client.speech_to_text_translate_job.create_job(
+                model=self.MODEL,
+                with_diarization=self.WITH_DIARIZATION,
+                num_speakers=self.NUM_SPEAKERS,
+                prompt=self.PROMPT
+            )
+        
+        # Upload and process files
+        with stage_timer('upload'):
+            job.upload_files(file_paths=audio_paths)
+        with stage_timer('start_job'):
+            job.start()
+        return job
+    
+    def _wait_for_job(self, job, audio_paths, audio_seconds, progress):
+        """Wait for a started job, hedging with a duplicate if it runs long.
+        
+        When hedging is enabled and the job is still running after the
+        hedge quantile of recent job durations, the same files are submitted
+        as a second job and whichever finishes first is used. The other job
+        is no longer polled.
+        
+        Returns:
+            tuple: The job whose results should be read, and its final
+                job status
+        """
+        primary = self.job_monitor.watch(
+            job.job_id,
+            audio_seconds=audio_seconds,
+            on_running=lambda: _notify(progress, 'job_running', job_id=job.job_id)
+        )
+        
+        hedge_after = None
+        if self.hedge_quantile is not None:
+            hedge_after = self.job_monitor.quantile_seconds(audio_seconds, self.hedge_quantile)
+        with self._hedge_lock:
+            self._hedge_counts['jobs'] += 1
+        
+        if hedge_after is None:
+            return job, primary.result()
+        
+        try:
+            return job, primary.result(timeout=hedge_after)
+        except FutureTimeoutError:
+            # The job's own TimeoutError is the same class on Python 3.11+
+            if primary.done():
+                raise
+        
+        if not self._take_hedge():
+            return job, primary.result()
+        
+        try:
+            hedge_job = self._start_job(audio_paths)
+        except Exception as e:
+            logger.warning(f"Hedge job for {job.job_id} could not be started: {e}")
+            with self._hedge_lock:
+                self._hedge_counts['hedge_failed'] += 1
+            return job, primary.result()
+        _notify(progress, 'hedged', job_id=job.job_id, hedge_job_id=hedge_job.job_id)
+        
+        jobs = {primary: job, self.job_monitor.watch(hedge_job.job_id, audio_seconds=audio_seconds): hedge_job}
+        pending = set(jobs)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                
+                winner = jobs[future]
+                for other in pending:
+                    self.job_monitor.cancel(jobs[other].job_id)
+                outcome = 'primary_won' if winner is job else 'hedge_won'
+                with self._hedge_lock:
+                    self._hedge_counts[outcome] += 1
+                HEDGED_JOBS.inc(winner='primary' if winner is job else 'hedge')
+                return winner, future.result()
+        
+        raise error
+    
+    def _take_hedge(self):
+        # Hedging doubles the load on SarvamAI, so only a small share of jobs may do it
+        if self.circuit_breaker is not None and self.circuit_breaker.state != self.circuit_breaker.CLOSED:
+            return False
+        with self._hedge_lock:
+            if self._hedge_counts['hedged'] + 1 > self.hedge_budget * self._hedge_counts['jobs']:
+                return False
+            self._hedge_counts['hedged'] += 1
+        return True
+    
+    def hedge_stats(self):
+        """Return counts of hedged jobs and which copy finished first."""
+        with self._hedge_lock:
+            counts = dict(self._hedge_counts)
+        counts['hedge_quantile'] = self.hedge_quantile
+        counts['hedge_budget'] = self.hedge_budget
+        return counts
+    
+    def _fetch_outputs(self, job, successful_files):
+        """Fetch job output JSON straight into memory.
         
-        # Read the result JSON
-        file_name = file_results['successful'][0]['file_name']
-        json_path = os.path.join(output_dir, f"{file_name}.json")
+        Args:
+            job: SarvamAI job object
+            successful_files (list): Successful entries from get_file_results()
+            
+        Returns:
+            dict: Maps each input file name to its parsed result data
+        """
+        output_files = {f['output_file']: f['file_name'] for f in successful_files if f.get('output_file')}
+        if len(output_files) != len(successful_files):
+            raise ValueError("Output file name missing from job results")
         
-        with open(json_path, 'r', encoding='utf-8') as json_file:
-            result_data = json.load(json_file)
+        download_links = self.client.speech_to_text_translate_job.get_download_links(
+            job_id=job.job_id,
+            files=list(output_files)
+        )
         
-        # Cleanup
-        os.unlink(json_path)
-        os.rmdir(output_dir)
+        outputs = {}
+        for output_file, file_name in output_files.items():
+            url = download_links.download_urls[output_file].file_url
+            response = self.http.get(url, endpoint='output_download')
+            response.raise_for_status()
+            outputs[file_name] = json.loads(response.content)
         
-        return result_data
+        return outputs
     
-    def format_response(self, result_data):
+    def _download_outputs_to_disk(self, job, successful_files):
+        """Download job outputs through a temporary directory (SDK path).
+        
+        Args:
+            job: SarvamAI job object
+            successful_files (list): Successful entries from get_file_results()
+            
+        Returns:
+            dict: Maps each input file name to its parsed result data
+        """
+        outputs = {}
+        
+        # Download outputs to temporary directory
+        output_dir = tempfile.mkdtemp()
+        try:
+            job.download_outputs(output_dir=output_dir)
+            
+            # Read the result JSON for each file
+            for successful in successful_files:
+                json_path = os.path.join(output_dir, f"{successful['file_name']}.json")
+                with open(json_path, 'r', encoding='utf-8') as json_file:
+                    outputs[successful['file_name']] = json.load(json_file)
+        finally:
+            # Cleanup
+            shutil.rmtree(output_dir, ignore_errors=True)
+        
+        return outputs
+    
+    def get_job_status(self, job_id):
+        """Fetch the current status of a SarvamAI job.
+        
+        Args:
+            job_id (str): SarvamAI job ID
+            
+        Returns:
+            JobStatusResponse: Current job status
+        """
+        return self.client.speech_to_text_translate_job.get_status(job_id)
+    
+    @staticmethod
+    def format_response(result_data):
         """Format the translation result into a clean API response.
         
         Args:
@@ -102,12 +700,13 @@ class TranslationService:
         """
         speakers = []
         
-        if 'diarized_transcript' in result_data and 'entries' in result_data['diarized_transcript']:
-            for entry in result_data['diarized_transcript']['entries']:
-                speakers.append({
-                    'speaker_id': entry.get('speaker_id', 'Unknown'),
-                    'text': entry.get('transcript', '')
-                })
+        with stage_timer('format_response'):
+            if 'diarized_transcript' in result_data and 'entries' in result_data['diarized_transcript']:
+                for entry in result_data['diarized_transcript']['entries']:
+                    speakers.append({
+                        'speaker_id': entry.get('speaker_id', 'Unknown'),
+                        'text': entry.get('transcript', '')
+                    })
         
         return {
             'status': 'success',
@@ -115,11 +714,69 @@ class TranslationService:
             'speakers': speakers
         }
     
-    def translate_from_url(self, audio_url):
+    def preprocess_audio(self, audio_path):
+        """Run the optional pre-processing stage on a downloaded file.
+        
+        Args:
+            audio_path (str): Path to the original audio file
+            
+        Returns:
+            tuple: (path to upload, stats dict or None). The path is the
+                original file when pre-processing is disabled or fails.
+        """
+        if self.preprocessor is None:
+            return audio_path, None
+        
+        try:
+            with stage_timer('preprocess'):
+                return self.preprocessor.process(audio_path)
+        except Exception as e:
+            logger.warning(f"Audio pre-processing failed, uploading original file: {e}")
+            return audio_path, None
+    
+    def translate_local_file(self, audio_path, progress=None):
+        """Pre-process, translate and format a local audio file.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            progress (callable): Optional progress callback, see
+                translate_from_url
+            
+        Returns:
+            dict: Formatted translation response, with pre-processing stats
+                under 'preprocessing' when that stage ran
+        """
+        processed_path, preprocessing = self.preprocess_audio(audio_path)
+        try:
+            # Process audio
+            result_data = self.process_long_audio(processed_path, progress=progress)
+        finally:
+            if processed_path != audio_path:
+                _remove_file(processed_path)
+        
+        # Format response
+        response = self.format_response(result_data)
+        if preprocessing:
+            response['preprocessing'] = preprocessing
+        return response
+    
+    def translate_from_url(self, audio_url, progress=None):
         """Complete translation workflow from URL to formatted response.
         
+        When the URL was processed before, the upstream is revalidated with a
+        conditional GET (ETag/Last-Modified) or a HEAD request
+        (Content-Length) and the cached response is returned if the audio is
+        unchanged, skipping both the download and the STTT job.
+        
+        The optional progress callback is called as progress(event, **fields)
+        from worker threads as the request advances: 'cached', 'downloaded'
+        (bytes), 'uploaded' (job_id), 'job_running' (job_id), 'job_finished'
+        (job_id), plus 'transcript_cached', 'batched' and 'chunked' (chunks)
+        when those paths are taken.
+        
         Args:
             audio_url (str): URL of the audio file
+            progress (callable): Optional progress callback
             
         Returns:
             dict: Formatted translation response
@@ -127,28 +784,182 @@ class TranslationService:
         Raises:
             Exception: If any step fails
         """
-        temp_file = None
+        # Download audio unless the cached response is still valid
+        response, temp_file, validators = self._fetch_url(audio_url, progress=progress)
+        if response is not None:
+            return response
+        
         try:
-            # Download audio
-            temp_file = self.download_audio(audio_url)
+            # Pre-process, process and format audio
+            response = self.translate_local_file(temp_file, progress=progress)
+            self._remember_url(audio_url, validators, response)
+            return copy.deepcopy(response)
+        
+        finally:
+            # Cleanup temporary file
+            _remove_file(temp_file)
+    
+    def _fetch_url(self, audio_url, progress=None):
+        """Answer a URL from the URL cache or download its audio.
+        
+        Returns:
+            tuple: (cached response, None, None) when the cached response is
+                still valid, otherwise (None, temp file path, validators)
+        """
+        prefetched = self._join_prefetched(audio_url)
+        if prefetched is not None:
+            temp_file, validators = prefetched
+            _notify(progress, 'downloaded', bytes=os.path.getsize(temp_file))
+            return None, temp_file, validators
+        
+        entry = self.url_cache.get(_url_key(audio_url)) if self.url_cache is not None else None
+        headers = None
+        
+        if entry is not None:
+            unchanged, headers = self._revalidate_url(audio_url, entry)
+            if unchanged:
+                _notify(progress, 'cached')
+                return copy.deepcopy(entry['response']), None, None
+        
+        temp_file, validators = self._download(audio_url, headers=headers)
+        
+        if temp_file is None:
+            # 304 Not Modified
+            _notify(progress, 'cached')
+            return copy.deepcopy(entry['response']), None, None
+        
+        _notify(progress, 'downloaded', bytes=os.path.getsize(temp_file))
+        return None, temp_file, validators
+    
+    def _remember_url(self, audio_url, validators, response):
+        if self.url_cache is not None and any(validators.values()):
+            self.url_cache.put(
+                _url_key(audio_url),
+                dict(validators, audio_url=audio_url, response=response)
+            )
+    
+    def translate_batch(self, audio_urls, max_files_per_job=20, download_workers=8, max_concurrent_jobs=4):
+        """Translate many audio URLs using as few STTT jobs as possible.
+        
+        Audio is downloaded and pre-processed concurrently. URL and
+        transcript cache hits are answered straight away; the remaining files
+        are grouped into multi-file jobs, and each job is submitted as soon
+        as it is full so downloads overlap processing. A failure only
+        affects its own item (or, if a whole job fails, the items in that
+        job). Long-call chunking is not applied to batch items.
+        
+        Args:
+            audio_urls (list): URLs of the audio files
+            max_files_per_job (int): Maximum number of files per STTT job
+            download_workers (int): Concurrent downloads
+            max_concurrent_jobs (int): Maximum number of STTT jobs in flight
             
-            # Process audio
-            result_data = self.process_audio(temp_file)
+        Yields:
+            tuple: (index into audio_urls, formatted response or Exception),
+                in completion order
+        """
+        downloads = ThreadPoolExecutor(max_workers=max(1, min(download_workers, len(audio_urls))))
+        jobs = ThreadPoolExecutor(max_workers=max_concurrent_jobs)
+        prepared = {downloads.submit(self._prepare_batch_item, url): index for index, url in enumerate(audio_urls)}
+        submitted = {}
+        ready = []
+        
+        try:
+            pending = set(prepared)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    if future in prepared:
+                        index = prepared[future]
+                        try:
+                            item = future.result()
+                        except Exception as e:
+                            yield index, e
+                            continue
+                        if 'response' in item:
+                            yield index, item['response']
+                            continue
+                        ready.append((index, item))
+                    else:
+                        batch = submitted.pop(future)
+                        results = future.result()
+                        for index, item in batch:
+                            yield index, self._finish_batch_item(item, results[item['path']])
+                
+                # Submit full jobs at once and the remainder when downloads are done
+                downloading = any(future in prepared for future in pending)
+                while len(ready) >= max_files_per_job or (ready and not downloading):
+                    batch, ready = ready[:max_files_per_job], ready[max_files_per_job:]
+                    future = jobs.submit(self._run_batch_job, [item['path'] for _, item in batch])
+                    submitted[future] = batch
+                    pending.add(future)
+        
+        finally:
+            downloads.shutdown(wait=True, cancel_futures=True)
+            jobs.shutdown(wait=True, cancel_futures=True)
             
-            # Format response
-            return self.format_response(result_data)
+            # Remove files of items that were never finished (e.g. client disconnected)
+            for future in prepared:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    for path in future.result().get('files', []):
+                        _remove_file(path)
+    
+    def _prepare_batch_item(self, audio_url):
+        # Download, pre-process and check the caches for one batch item
+        response, temp_file, validators = self._fetch_url(audio_url)
+        if response is not None:
+            return {'response': response}
         
+        item = {'audio_url': audio_url, 'validators': validators, 'files': [temp_file]}
+        try:
+            processed_path, preprocessing = self.preprocess_audio(temp_file)
+            if processed_path != temp_file:
+                item['files'].append(processed_path)
+            item.update(path=processed_path, preprocessing=preprocessing)
+            
+            cache_key, cached = self._cached_result(processed_path)
+            if cached is not None:
+                return {'response': self._finish_batch_item(item, cached)}
+            item['cache_key'] = cache_key
+        except BaseException:
+            for path in item['files']:
+                _remove_file(path)
+            raise
+        
+        return item
+    
+    def _run_batch_job(self, audio_paths):
+        try:
+            return self.run_job(audio_paths)
+        except Exception as e:
+            return {path: e for path in audio_paths}
+    
+    def _finish_batch_item(self, item, result_data):
+        # Format one batch item's result, fill the caches and remove its files
+        try:
+            if isinstance(result_data, Exception):
+                return result_data
+            
+            if item.get('cache_key') is not None:
+                self.transcript_cache.put(item['cache_key'], result_data)
+            
+            response = self.format_response(result_data)
+            if item.get('preprocessing'):
+                response['preprocessing'] = item['preprocessing']
+            self._remember_url(item['audio_url'], item['validators'], response)
+            return copy.deepcopy(response)
         finally:
-            # Cleanup temporary file
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except Exception:
-                    pass  # Ignore cleanup errors
+            for path in item['files']:
+                _remove_file(path)
     
     def translate_from_file(self, audio_file):
         """Complete translation workflow from uploaded file to formatted response.
         
+        If the upload was already spooled to a named file on disk (see
+        AudioUploadRequest in api.py), that file is translated in place
+        instead of being copied to another temporary file.
+        
         Args:
             audio_file: Flask FileStorage object (uploaded file)
             
@@ -156,26 +967,57 @@ class TranslationService:
             dict: Formatted translation response
             
         Raises:
+            AudioTooLargeError: If the file exceeds max_audio_bytes
             Exception: If any step fails
         """
+        spooled_path = _spooled_path(audio_file.stream)
+        if spooled_path is not None:
+            audio_file.stream.flush()
+            self._check_size(os.path.getsize(spooled_path))
+            return self.translate_local_file(spooled_path)
+        
         temp_file = None
         try:
-            # Save uploaded file to temporary location
-            temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-            audio_file.save(temp_audio.name)
-            temp_audio.close()
-            temp_file = temp_audio.name
+            # Stream uploaded file to temporary location
+            temp_file = self.save_stream(audio_file.stream)
             
-            # Process audio
-            result_data = self.process_audio(temp_file)
-            
-            # Format response
-            return self.format_response(result_data)
+            # Pre-process, process and format audio
+            return self.translate_local_file(temp_file)
         
         finally:
             # Cleanup temporary file
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except Exception:
-                    pass  # Ignore cleanup errors
+            if temp_file:
+                _remove_file(temp_file)
+
+
+def _url_key(audio_url):
+    return hashlib.sha256(audio_url.encode('utf-8')).hexdigest()
+
+
+def _spooled_path(stream):
+    # Path of a stream backed by a named file on disk, or None
+    name = getattr(stream, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name
+    return None
+
+
+def _discard_download(future):
+    # Remove the file of a prefetched download that was never used
+    if not future.cancelled() and future.exception() is None:
+        temp_file, _ = future.result()
+        if temp_file:
+            _remove_file(temp_file)
+
+
+def _notify(progress, event, **fields):
+    if progress is not None:
+        progress(event, **fields)
+
+
+def _remove_file(path):
+    if os.path.exists(path):
+        try:
+            os.unlink(path)
+        except Exception:
+            pass  # Ignore cleanup errors